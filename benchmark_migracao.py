@@ -0,0 +1,550 @@
+"""Benchmark reprodutível dos motores de migração.
+
+Gera tabelas sintéticas (largura, linhas, mistura de tipos e densidade de NULL configuráveis),
+executa cada motor contra um PostgreSQL local e imprime um JSON com linhas/s, MB/s, pico de RSS
+e tempo por fase, para comparar execuções antes/depois de uma mudança.
+
+As origens que não são PostgreSQL usam substitutos locais em SQLite (sem rede nem Oracle/MySQL):
+    geral_pg        migrador_geral.run_migration, PostgreSQL → PostgreSQL (COPY/INSERT)
+    geral_oracle    migrador_geral.copiar_intervalo_oracle com origem "Oracle" em SQLite
+    em_massa        migrador_em_massa.migrar_tabela com origem "MySQL" em SQLite
+    oracle_script   migrador_oracle_postgres.migrar_tabela com origem "Oracle" em SQLite
+
+Cada motor roda em um processo próprio, para que o pico de RSS e o estado global não se misturem.
+
+Uso:
+    python benchmark_migracao.py --pg-host localhost --pg-db bench --pg-user postgres \\
+        --linhas 100000 --largura 12 --tipos int,numeric,text,bytea,timestamp --nulos 0.1 \\
+        --saida resultado.json [--comparar resultado_anterior.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+MOTORES = ('geral_pg', 'geral_oracle', 'em_massa', 'oracle_script')
+
+# Tipo lógico → tipo declarado em cada banco (o SQLite guarda o nome declarado do dialeto substituído)
+TIPOS = {
+    'int':       {'pg': 'bigint',        'oracle': 'NUMBER(19)',   'mysql': 'bigint(20)'},
+    'numeric':   {'pg': 'numeric(18,4)', 'oracle': 'NUMBER(18,4)', 'mysql': 'decimal(18,4)'},
+    'text':      {'pg': 'text',          'oracle': 'CLOB',         'mysql': 'longtext'},
+    'bytea':     {'pg': 'bytea',         'oracle': 'BLOB',         'mysql': 'longblob'},
+    'timestamp': {'pg': 'timestamp',     'oracle': 'TIMESTAMP',    'mysql': 'datetime'},
+}
+
+SCHEMA_ORIGEM = 'bench_origem'
+SCHEMA_DESTINO = 'bench_destino'
+# migrador_em_massa grava sempre em chatbot.<tabela>
+SCHEMA_EM_MASSA = 'chatbot'
+LOTE_GERACAO = 5000
+
+sqlite3.register_converter('TIMESTAMP', lambda valor: datetime.fromisoformat(valor.decode()))
+sqlite3.register_converter('datetime', lambda valor: datetime.fromisoformat(valor.decode()))
+sqlite3.register_adapter(Decimal, str)
+
+# ---------------------------------------------------------------------------
+# Dados sintéticos
+# ---------------------------------------------------------------------------
+
+def gerar_colunas(largura: int, tipos: list) -> list:
+    """[(nome, tipo lógico)]: id bigint + `largura` colunas alternando os tipos pedidos"""
+    return [('id', 'int')] + [(f"c{i:02d}_{tipos[i % len(tipos)]}", tipos[i % len(tipos)]) for i in range(largura)]
+
+def gerar_linhas(config: dict, colunas: list):
+    """Gera as linhas em lotes, sempre iguais para a mesma semente; devolve também os bytes de carga útil"""
+    rng = random.Random(config['semente'])
+    # Texto fatiado de uma base fixa: rápido e com aspas/barras para exercitar o escape
+    base = ''.join(rng.choice("abcdefghij klmnopqrstuvwxyz'\\ÁÇÕ0123456789") for _ in range(65536))
+    inicio_datas = datetime(2000, 1, 1)
+
+    def valor(tipo: str):
+        if tipo == 'int':
+            return rng.randrange(-2 ** 40, 2 ** 40)
+        if tipo == 'numeric':
+            return Decimal(rng.randrange(-10 ** 12, 10 ** 12)) / 10000
+        if tipo == 'text':
+            tamanho = rng.randrange(config['texto_bytes'] // 2, config['texto_bytes'] * 3 // 2 + 1)
+            inicio = rng.randrange(0, len(base) - tamanho)
+            return base[inicio:inicio + tamanho]
+        if tipo == 'bytea':
+            return rng.randbytes(rng.randrange(config['binario_bytes'] // 2, config['binario_bytes'] * 3 // 2 + 1))
+        return inicio_datas + timedelta(seconds=rng.randrange(0, 20 * 365 * 86400))
+
+    lote = []
+    for id_linha in range(1, config['linhas'] + 1):
+        linha = [id_linha] + [
+            None if rng.random() < config['nulos'] else valor(tipo) for _, tipo in colunas[1:]
+        ]
+        lote.append(tuple(linha))
+        if len(lote) == LOTE_GERACAO:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+def bytes_linha(linha: tuple) -> int:
+    total = 0
+    for valor in linha:
+        if isinstance(valor, str):
+            total += len(valor.encode('utf-8'))
+        elif isinstance(valor, bytes):
+            total += len(valor)
+        elif valor is not None:
+            total += 8
+    return total
+
+def ddl_postgres(schema: str, tabela: str, colunas: list) -> str:
+    definicoes = ', '.join(f'"{nome}" {TIPOS[tipo]["pg"]}' for nome, tipo in colunas)
+    return f'CREATE TABLE {schema}.{tabela} ({definicoes}, PRIMARY KEY ("id"))'
+
+def preparar_origens(config: dict, pasta: str) -> dict:
+    """Carrega os mesmos dados no PostgreSQL de origem e nos SQLite com dialeto Oracle e MySQL"""
+    colunas = gerar_colunas(config['largura'], config['tipos'])
+    tabela = config['tabela']
+
+    conn = psycopg2.connect(**config['pg'])
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA_ORIGEM} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {SCHEMA_ORIGEM}")
+    cursor.execute(ddl_postgres(SCHEMA_ORIGEM, tabela, colunas))
+
+    sqlites = {}
+    for dialeto in ('oracle', 'mysql'):
+        caminho = os.path.join(pasta, f"origem_{dialeto}.db")
+        sqlites[dialeto] = caminho
+        lite = sqlite3.connect(caminho)
+        nomes = [nome.upper() if dialeto == 'oracle' else nome for nome, _ in colunas]
+        definicoes = ', '.join(f'"{nome}" {TIPOS[tipo][dialeto]}' for nome, (_, tipo) in zip(nomes, colunas))
+        nome_tabela = tabela.upper() if dialeto == 'oracle' else tabela
+        lite.execute(f'CREATE TABLE "{nome_tabela}" ({definicoes})')
+        lite.commit()
+        lite.close()
+
+    carga_bytes = 0
+    placeholders = ', '.join(['?'] * len(colunas))
+    conexoes_lite = {d: sqlite3.connect(c) for d, c in sqlites.items()}
+    for lote in gerar_linhas(config, colunas):
+        carga_bytes += sum(bytes_linha(linha) for linha in lote)
+        execute_values(cursor, f"INSERT INTO {SCHEMA_ORIGEM}.{tabela} VALUES %s", lote, page_size=1000)
+        for dialeto, lite in conexoes_lite.items():
+            nome_tabela = tabela.upper() if dialeto == 'oracle' else tabela
+            lite.executemany(f'INSERT INTO "{nome_tabela}" VALUES ({placeholders})', lote)
+    for lite in conexoes_lite.values():
+        lite.commit()
+        lite.close()
+    cursor.execute(f"ANALYZE {SCHEMA_ORIGEM}.{tabela}")
+    conn.commit()
+    conn.close()
+
+    return {'colunas': colunas, 'sqlite': sqlites, 'carga_bytes': carga_bytes}
+
+def recriar_destino(config: dict, colunas: list, schema: str, criar_tabela: bool):
+    conn = psycopg2.connect(**config['pg'])
+    conn.autocommit = True
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {schema}")
+    if criar_tabela:
+        cursor.execute(ddl_postgres(schema, config['tabela'], colunas))
+    conn.close()
+
+def contar_destino(config: dict, schema: str) -> int:
+    conn = psycopg2.connect(**config['pg'])
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT count(*) FROM {schema}.{config['tabela']}")
+    total = cursor.fetchone()[0]
+    conn.close()
+    return total
+
+# ---------------------------------------------------------------------------
+# Substitutos locais das origens Oracle e MySQL
+# ---------------------------------------------------------------------------
+
+class CursorSQLite:
+    """Cursor DB-API sobre SQLite que responde às consultas de catálogo que os motores fazem
+    (SHOW COLUMNS do MySQL, all_tab_columns do Oracle) e aceita os atributos do oracledb"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._cursor = conn.cursor()
+        self._linhas = None
+        self.description = None
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.outputtypehandler = None
+
+    def execute(self, sql: str, parametros=None, **binds):
+        self._linhas = None
+        mostrar = re.match(r'\s*SHOW\s+COLUMNS\s+FROM\s+`?(\w+)`?', sql, re.IGNORECASE)
+        if mostrar:
+            info = self._conn.execute(f'PRAGMA table_info("{mostrar.group(1)}")').fetchall()
+            self._linhas = [(nome, tipo, 'YES', '', None, '') for _, nome, tipo, _, _, _ in info]
+            self.description = [(c, None, None, None, None, None, None) for c in ('Field', 'Type', 'Null', 'Key', 'Default', 'Extra')]
+            return self
+        if 'all_tab_columns' in sql.lower():
+            parametros = {**(parametros or {}), **binds}
+            tabela = parametros.get('tab') or parametros.get('table_name')
+            info = self._conn.execute(f'PRAGMA table_info("{tabela.upper()}")').fetchall()
+            self._linhas = []
+            for _, nome, tipo, _, _, _ in info:
+                base, _, resto = tipo.partition('(')
+                medidas = [int(m) for m in resto.rstrip(')').split(',') if m.strip()]
+                precisao = medidas[0] if medidas else None
+                escala = medidas[1] if len(medidas) > 1 else (0 if medidas else None)
+                self._linhas.append((nome, base, 4000 if base == 'CLOB' else 22, precisao, escala))
+            self.description = [(c, None, None, None, None, None, None) for c in
+                                ('COLUMN_NAME', 'DATA_TYPE', 'DATA_LENGTH', 'DATA_PRECISION', 'DATA_SCALE')]
+            return self
+
+        # "OWNER.TABELA" do Oracle: o schema é anexado ao SQLite com ATTACH
+        self._cursor.execute(sql, parametros if parametros is not None else binds)
+        self.description = self._cursor.description
+        return self
+
+    def fetchmany(self, tamanho: int = None):
+        tamanho = tamanho or self.arraysize
+        if self._linhas is not None:
+            lote, self._linhas = self._linhas[:tamanho], self._linhas[tamanho:]
+            return lote
+        return self._cursor.fetchmany(tamanho)
+
+    def fetchall(self):
+        if self._linhas is not None:
+            linhas, self._linhas = self._linhas, []
+            return linhas
+        return self._cursor.fetchall()
+
+    def fetchone(self):
+        linhas = self.fetchmany(1)
+        return linhas[0] if linhas else None
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        self._cursor.close()
+
+class ConexaoSQLite:
+    """Conexão de origem "Oracle"/"MySQL" sobre o arquivo SQLite gerado (schema Oracle via ATTACH)"""
+
+    def __init__(self, caminho: str, schema: str = None):
+        self._conn = sqlite3.connect(caminho, detect_types=sqlite3.PARSE_DECLTYPES)
+        if schema:
+            self._conn.execute(f'ATTACH DATABASE ? AS "{schema.upper()}"', (caminho,))
+
+    def cursor(self, *args, **kwargs):
+        return CursorSQLite(self._conn)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+class CronometroFases:
+    """Acumula o tempo gasto dentro das chamadas ao banco de cada lado (origem = leitura,
+    destino = escrita/commit); o restante do tempo de parede é o Python do motor (conversão)"""
+
+    def __init__(self):
+        self.fases = {'leitura': 0.0, 'escrita': 0.0, 'commit': 0.0}
+
+    def envolver(self, conn, fase: str):
+        cronometro = self
+
+        class CursorCronometrado:
+            def __init__(self, cursor):
+                self._cursor = cursor
+
+            def __getattr__(self, nome):
+                atributo = getattr(self._cursor, nome)
+                if nome not in ('execute', 'executemany', 'fetchone', 'fetchmany', 'fetchall',
+                                'copy_expert', 'copy_from'):
+                    return atributo
+
+                def medido(*args, **kwargs):
+                    inicio = time.perf_counter()
+                    try:
+                        return atributo(*args, **kwargs)
+                    finally:
+                        cronometro.fases[fase] += time.perf_counter() - inicio
+                return medido
+
+            def __setattr__(self, nome, valor):
+                if nome == '_cursor':
+                    object.__setattr__(self, nome, valor)
+                else:
+                    setattr(self._cursor, nome, valor)
+
+            def __iter__(self):
+                return iter(self.fetchone, None)
+
+        class ConexaoCronometrada:
+            def __getattr__(self, nome):
+                return getattr(conn, nome)
+
+            def __setattr__(self, nome, valor):
+                setattr(conn, nome, valor)
+
+            def cursor(self, *args, **kwargs):
+                return CursorCronometrado(conn.cursor(*args, **kwargs))
+
+            def commit(self):
+                inicio = time.perf_counter()
+                try:
+                    return conn.commit()
+                finally:
+                    cronometro.fases['commit'] += time.perf_counter() - inicio
+
+        return ConexaoCronometrada()
+
+# ---------------------------------------------------------------------------
+# Motores (executados no processo filho)
+# ---------------------------------------------------------------------------
+
+def fases_migrador_geral(migrador_geral) -> dict:
+    fases = {}
+    for metrica in migrador_geral.migration_status['metricas'].values():
+        for fase, segundos in metrica['fases'].items():
+            fases[fase] = fases.get(fase, 0.0) + segundos
+    return fases
+
+def executar_geral_pg(config: dict, origens: dict) -> dict:
+    import migrador_geral
+
+    pg = config['pg']
+    parametros = {'host': pg['host'], 'port': pg['port'], 'dbname': pg['dbname'],
+                  'user': pg['user'], 'password': pg['password']}
+    migrador_geral.run_migration(
+        'postgres_to_postgres',
+        {**parametros, 'schema': SCHEMA_ORIGEM},
+        {**parametros, 'schema': SCHEMA_DESTINO},
+        [f"{SCHEMA_ORIGEM}.{config['tabela']}"],
+        {'workers': 1, 'retomar': False, 'sincronizar_sequencias': False, **config['opcoes_geral']}
+    )
+    migrador_geral.fechar_todos_pools()
+    return fases_migrador_geral(migrador_geral)
+
+def executar_geral_oracle(config: dict, origens: dict) -> dict:
+    import migrador_geral
+
+    colunas = [nome for nome, _ in origens['colunas']]
+    origem = ConexaoSQLite(origens['sqlite']['oracle'], 'BENCH')
+    destino = psycopg2.connect(**config['pg'])
+    destino.autocommit = False
+    opcoes = {**migrador_geral.OPCOES_MIGRACAO_PADRAO, **config['opcoes_geral']}
+
+    migrador_geral.job_atual.tabela = config['tabela']
+    migrador_geral.copiar_intervalo_oracle(
+        origem, destino, f"BENCH.{config['tabela'].upper()}", f"{SCHEMA_DESTINO}.{config['tabela']}",
+        ', '.join(f'"{c}"' for c in colunas), ', '.join(f'"{c.upper()}"' for c in colunas),
+        len(colunas), None, opcoes
+    )
+    with migrador_geral.medir_fase('commit'):
+        destino.commit()
+    destino.close()
+    origem.close()
+    return fases_migrador_geral(migrador_geral)
+
+def executar_em_massa(config: dict, origens: dict) -> dict:
+    import migrador_em_massa
+
+    cronometro = CronometroFases()
+    migrador_em_massa.pymysql.connect = lambda **_: cronometro.envolver(
+        ConexaoSQLite(origens['sqlite']['mysql']), 'leitura'
+    )
+    migrador_em_massa.psycopg2.connect = lambda **_: cronometro.envolver(
+        psycopg2.connect(**config['pg']), 'escrita'
+    )
+    migrador_em_massa.migrar_tabela(config['tabela'])
+    return cronometro.fases
+
+def executar_oracle_script(config: dict, origens: dict) -> dict:
+    import oracledb
+    oracledb.init_oracle_client = lambda **_: None  # sem Instant Client no benchmark
+    import migrador_oracle_postgres
+
+    cronometro = CronometroFases()
+    migrador_oracle_postgres.oracledb.connect = lambda **_: cronometro.envolver(
+        ConexaoSQLite(origens['sqlite']['oracle'], 'BENCH'), 'leitura'
+    )
+    migrador_oracle_postgres.psycopg2.connect = lambda **_: cronometro.envolver(
+        psycopg2.connect(**config['pg']), 'escrita'
+    )
+    migrador_oracle_postgres.migrar_tabela(config['tabela'], 'BENCH', SCHEMA_DESTINO)
+    return cronometro.fases
+
+EXECUTORES = {
+    'geral_pg': executar_geral_pg,
+    'geral_oracle': executar_geral_oracle,
+    'em_massa': executar_em_massa,
+    'oracle_script': executar_oracle_script,
+}
+
+def executar_motor(motor: str, config: dict, origens: dict) -> dict:
+    """Processo filho: roda um motor e devolve tempo de parede, fases e pico de RSS"""
+    inicio = time.perf_counter()
+    fases = EXECUTORES[motor](config, origens)
+    segundos = time.perf_counter() - inicio
+    if motor in ('em_massa', 'oracle_script'):
+        fases['conversao'] = max(0.0, segundos - sum(fases.values()))
+    return {
+        'segundos': segundos,
+        'fases': {fase: round(valor, 4) for fase, valor in fases.items()},
+        # Linux: ru_maxrss em KB
+        'pico_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+# ---------------------------------------------------------------------------
+# Orquestração
+# ---------------------------------------------------------------------------
+
+def rodar(config: dict) -> dict:
+    pasta = tempfile.mkdtemp(prefix='bench_migracao_')
+    print(f"🧪 Gerando {config['linhas']} linhas x {config['largura'] + 1} colunas...", file=sys.stderr)
+    origens = preparar_origens(config, pasta)
+    megabytes = origens['carga_bytes'] / (1024 * 1024)
+
+    resultados = []
+    for motor in config['motores']:
+        schema = SCHEMA_EM_MASSA if motor == 'em_massa' else SCHEMA_DESTINO
+        # run_migration cria a tabela de destino; os outros motores esperam que ela exista
+        recriar_destino(config, origens['colunas'], schema, criar_tabela=motor != 'geral_pg')
+        print(f"⏱️  {motor}...", file=sys.stderr)
+
+        ambiente = {**os.environ,
+                    'MIGRADOR_CHECKPOINT_DB': os.path.join(pasta, 'checkpoints.db'),
+                    'MIGRADOR_LOG_ARQUIVO': os.path.join(pasta, 'logs.jsonl'),
+                    'MIGRADOR_PERFIL_DIR': os.path.join(pasta, 'perfis')}
+        # Configuração (com a senha do PostgreSQL) pelo stdin: argv fica visível para outros usuários no ps
+        processo = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--motor', motor],
+            input=json.dumps({**config, 'origens': origens}),
+            capture_output=True, text=True, env=ambiente,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        resultado = {'motor': motor}
+        try:
+            medicao = json.loads(processo.stdout.strip().splitlines()[-1])
+        except (ValueError, IndexError):
+            resultado['erro'] = (processo.stderr.strip().splitlines() or ['sem saída'])[-1]
+            resultados.append(resultado)
+            continue
+
+        linhas = contar_destino(config, schema)
+        resultado.update({
+            'linhas': linhas,
+            'completo': linhas == config['linhas'],
+            'segundos': round(medicao['segundos'], 3),
+            'linhas_por_s': round(linhas / medicao['segundos'], 1),
+            'mb_por_s': round(megabytes * linhas / max(config['linhas'], 1) / medicao['segundos'], 3),
+            'pico_rss_mb': round(medicao['pico_rss_mb'], 1),
+            'fases': medicao['fases'],
+        })
+        resultados.append(resultado)
+
+    return {
+        'config': {k: v for k, v in config.items() if k != 'pg'},
+        'carga_mb': round(megabytes, 2),
+        'ambiente': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+            'data': datetime.now().isoformat(timespec='seconds'),
+        },
+        'resultados': resultados,
+    }
+
+def comparar(atual: dict, caminho_base: str, tolerancia: float) -> bool:
+    """Anota a variação de linhas/s em relação a um resultado anterior; False se algum motor regrediu"""
+    with open(caminho_base, encoding='utf-8') as f:
+        base = {r['motor']: r for r in json.load(f)['resultados'] if 'linhas_por_s' in r}
+
+    ok = True
+    for resultado in atual['resultados']:
+        anterior = base.get(resultado['motor'])
+        if not anterior or 'linhas_por_s' not in resultado:
+            continue
+        variacao = (resultado['linhas_por_s'] - anterior['linhas_por_s']) / anterior['linhas_por_s'] * 100
+        resultado['variacao_linhas_por_s_pct'] = round(variacao, 1)
+        if variacao < -tolerancia:
+            resultado['regressao'] = True
+            ok = False
+    return ok
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark dos motores de migração")
+    parser.add_argument('--pg-host', default=os.environ.get('PG_HOST', 'localhost'))
+    parser.add_argument('--pg-port', type=int, default=int(os.environ.get('PG_PORT', 5432)))
+    parser.add_argument('--pg-db', default=os.environ.get('PG_DBNAME', 'bench'))
+    parser.add_argument('--pg-user', default=os.environ.get('PG_USER', 'postgres'))
+    parser.add_argument('--pg-password', default=os.environ.get('PG_PASSWORD', ''))
+    parser.add_argument('--tabela', default='bench_sintetica')
+    parser.add_argument('--linhas', type=int, default=100000)
+    parser.add_argument('--largura', type=int, default=10, help="colunas além do id")
+    parser.add_argument('--tipos', default='int,numeric,text,bytea,timestamp',
+                        help=f"mistura de tipos ({', '.join(TIPOS)})")
+    parser.add_argument('--nulos', type=float, default=0.1, help="fração de valores NULL")
+    parser.add_argument('--texto-bytes', type=int, default=200, help="tamanho médio dos textos")
+    parser.add_argument('--binario-bytes', type=int, default=256, help="tamanho médio dos binários")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--motores', default=','.join(MOTORES))
+    parser.add_argument('--modo-carga', choices=('copy', 'insert'), default='copy',
+                        help="modo de carga do migrador_geral no PostgreSQL → PostgreSQL")
+    parser.add_argument('--saida', help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para comparar")
+    parser.add_argument('--tolerancia', type=float, default=10.0,
+                        help="queda de linhas/s (%%) aceita antes de acusar regressão")
+    # Uso interno: execução de um motor no processo filho (configuração JSON no stdin)
+    parser.add_argument('--motor', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.motor:
+        config = json.load(sys.stdin)
+        print(json.dumps(executar_motor(args.motor, config, config['origens'])))
+        return 0
+
+    tipos = [t.strip() for t in args.tipos.split(',') if t.strip()]
+    motores = [m.strip() for m in args.motores.split(',') if m.strip()]
+    invalidos = [t for t in tipos if t not in TIPOS] + [m for m in motores if m not in MOTORES]
+    if invalidos:
+        parser.error(f"valores desconhecidos: {', '.join(invalidos)}")
+
+    config = {
+        'pg': {'host': args.pg_host, 'port': args.pg_port, 'dbname': args.pg_db,
+               'user': args.pg_user, 'password': args.pg_password},
+        'tabela': args.tabela, 'linhas': args.linhas, 'largura': args.largura, 'tipos': tipos,
+        'nulos': args.nulos, 'texto_bytes': args.texto_bytes, 'binario_bytes': args.binario_bytes,
+        'semente': args.semente, 'motores': motores,
+        'opcoes_geral': {'modo_carga': args.modo_carga},
+    }
+    resultado = rodar(config)
+
+    ok = comparar(resultado, args.comparar, args.tolerancia) if args.comparar else True
+    saida = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(saida + '\n')
+        print(f"📝 Resultado salvo em {args.saida}", file=sys.stderr)
+    else:
+        print(saida)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,90 +1,369 @@
-
 import pymysql
+import pymysql.cursors
 import psycopg2
+from psycopg2.extras import execute_values
+import io
+import os
+import sys
+import time
+from functools import partial
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from perfil_cli import executar_com_perfil, opcao_perfil
+
+# Conexões
+MYSQL_CONFIG = {'host': '', 'db': '', 'user': '', 'password': '', 'port': 3306}
+PG_CONFIG = {'host': '', 'dbname': '', 'user': '', 'password': ''}
+SCHEMA_PG = 'chatbot'
+
+# Carga no PostgreSQL: 'copy' (COPY FROM STDIN) ou 'insert' (execute_values com parâmetros)
+MODO_CARGA = os.environ.get('MIGRADOR_MODO_CARGA', 'copy')
+# Linhas lidas do MySQL (SSCursor) e gravadas por vez
+LOTE_LINHAS = 5000
+# Commit periódico: a transação não cresce com a tabela inteira
+LINHAS_POR_COMMIT = 50000
+# Processos do driver paralelo (cada um com seu par de conexões reaproveitado entre tabelas)
+PROCESSOS = int(os.environ.get('MIGRADOR_PROCESSOS', 4))
+# Esvaziar chatbot.<tabela> antes da carga (--truncar ou MIGRADOR_TRUNCAR=1); por padrão acrescenta ao que já existe
+TRUNCAR_DESTINO = os.environ.get('MIGRADOR_TRUNCAR', '') == '1'
+
+# Mapeamento de tipos MySQL para PostgreSQL (tipo base do SHOW COLUMNS, sem tamanho)
+MYSQL_TYPE_MAPPING = {
+    # Tipos inteiros
+    'TINYINT': 'SMALLINT',
+    'SMALLINT': 'SMALLINT',
+    'MEDIUMINT': 'INTEGER',
+    'INT': 'INTEGER',
+    'INTEGER': 'INTEGER',
+    'BIGINT': 'BIGINT',
+    'YEAR': 'SMALLINT',
+    'BIT': 'BIT VARYING',
+    
+    # Tipos numéricos
+    'DECIMAL': 'NUMERIC',
+    'NUMERIC': 'NUMERIC',
+    'FLOAT': 'REAL',
+    'DOUBLE': 'DOUBLE PRECISION',
+    'REAL': 'DOUBLE PRECISION',
+    
+    # Tipos caractere
+    'CHAR': 'CHAR',
+    'VARCHAR': 'VARCHAR',
+    'TINYTEXT': 'TEXT',
+    'TEXT': 'TEXT',
+    'MEDIUMTEXT': 'TEXT',
+    'LONGTEXT': 'TEXT',
+    'ENUM': 'TEXT',
+    'SET': 'TEXT',
+    
+    # Tipos data/hora
+    'DATE': 'DATE',
+    'DATETIME': 'TIMESTAMP',
+    'TIMESTAMP': 'TIMESTAMP',
+    'TIME': 'INTERVAL',  # TIME do MySQL vai de -838 a 838 horas
+    
+    # Tipos binários
+    'BINARY': 'BYTEA',
+    'VARBINARY': 'BYTEA',
+    'TINYBLOB': 'BYTEA',
+    'BLOB': 'BYTEA',
+    'MEDIUMBLOB': 'BYTEA',
+    'LONGBLOB': 'BYTEA',
+    
+    # Tipos especiais
+    'JSON': 'JSONB',
+    'GEOMETRY': 'BYTEA',
+}
+
+def tipo_postgres(tipo_mysql):
+    """Tipo PostgreSQL de uma coluna a partir do tipo do SHOW COLUMNS (ex.: 'int(10) unsigned')"""
+    tipo = tipo_mysql.lower()
+    base = tipo.split('(')[0].split()[0].upper()
+    if 'unsigned' in tipo:
+        # Sem inteiros sem sinal no PostgreSQL: subir um tamanho
+        if base in ('INT', 'INTEGER', 'MEDIUMINT'):
+            return 'BIGINT'
+        if base == 'BIGINT':
+            return 'NUMERIC(20)'
+    return MYSQL_TYPE_MAPPING.get(base, 'TEXT')
+
+def para_bytes(valor):
+    return bytes(valor) if isinstance(valor, (bytes, bytearray)) else str(valor).encode('utf-8')
+
+def para_data(valor):
+    # Datas zeradas ('0000-00-00') chegam como texto: viram NULL
+    if not valor or (isinstance(valor, str) and valor.startswith('0000')):
+        return None
+    return valor
 
-def migrar_tabela(tabela):
-    """Migra uma tabela do MySQL para PostgreSQL"""
+def para_intervalo(valor):
+    # pymysql devolve TIME como timedelta
+    if hasattr(valor, 'total_seconds'):
+        segundos = int(valor.total_seconds())
+        sinal = '-' if segundos < 0 else ''
+        segundos = abs(segundos)
+        return f"{sinal}{segundos // 3600}:{segundos % 3600 // 60:02d}:{segundos % 60:02d}"
+    return str(valor)
+
+def para_bits(valor, largura=0):
+    # Zeros à esquerda mantidos: BIT(n) no PostgreSQL exige exatamente n bits
+    if isinstance(valor, (bytes, bytearray)):
+        return format(int.from_bytes(valor, 'big'), f'0{largura or 8 * len(valor)}b')
+    return format(int(valor), f'0{largura}b')
+
+# Conversor por tipo PostgreSQL de destino; tipos ausentes seguem sem conversão
+CONVERSORES_POR_TIPO = {
+    'BYTEA': para_bytes,
+    # Literal sem tipo: serve tanto para smallint quanto para boolean no destino
+    'SMALLINT': str,
+    'DATE': para_data,
+    'TIMESTAMP': para_data,
+    'INTERVAL': para_intervalo,
+    'BIT VARYING': para_bits,
+    'NUMERIC(20)': str,
+}
+
+def compilar_conversores(colunas_info):
+    """Traduz os metadados do SHOW COLUMNS, uma vez por tabela, em uma tupla com o conversor
+    de cada coluna (None quando o valor do pymysql já serve para o PostgreSQL)"""
+    return tuple(conversor_coluna(col[1]) for col in colunas_info)
+
+def conversor_coluna(tipo_mysql):
+    tipo_pg = tipo_postgres(tipo_mysql)
+    if tipo_pg == 'BIT VARYING' and '(' in tipo_mysql:
+        # BIT(n): largura do SHOW COLUMNS para completar com zeros à esquerda
+        return partial(para_bits, largura=int(tipo_mysql.split('(')[1].split(')')[0]))
+    return CONVERSORES_POR_TIPO.get(tipo_pg)
+
+def converter_lote(registros, conversores):
+    """Aplica os conversores só nas colunas que precisam; sem nenhum, o lote segue intacto"""
+    colunas = [(i, conversor) for i, conversor in enumerate(conversores) if conversor is not None]
+    if not colunas:
+        return registros
+    
+    convertidos = []
+    for reg in registros:
+        linha = list(reg)
+        for i, conversor in colunas:
+            valor = linha[i]
+            if valor is not None:
+                linha[i] = conversor(valor)
+        convertidos.append(linha)
+    return convertidos
+
+def formatar_copy(valor):
+    """Campo no formato texto do COPY (\\N para NULL, bytea em hex, controles escapados)"""
+    if valor is None:
+        return '\\N'
+    if isinstance(valor, (bytes, bytearray, memoryview)):
+        return '\\\\x' + bytes(valor).hex()
+    texto = str(valor)
+    return texto.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+def gravar_lote(pg_cursor, tabela_pg, lote):
+    """Grava um lote de linhas já convertidas com COPY ou com INSERT parametrizado em lote"""
+    if MODO_CARGA == 'copy':
+        buffer = io.StringIO()
+        for linha in lote:
+            buffer.write('\t'.join(formatar_copy(valor) for valor in linha))
+            buffer.write('\n')
+        buffer.seek(0)
+        pg_cursor.copy_expert(f"COPY {tabela_pg} FROM STDIN", buffer)
+    else:
+        execute_values(pg_cursor, f"INSERT INTO {tabela_pg} VALUES %s", lote, page_size=len(lote))
+
+def migrar_tabela(tabela, mysql_conn=None, pg_conn=None, truncar=TRUNCAR_DESTINO):
+    """Migra uma tabela do MySQL para PostgreSQL em fluxo: lê em lotes, grava em lotes e faz commits periódicos.
+    Com truncar=True esvazia o destino antes (na mesma transação do primeiro lote); senão acrescenta.
+    Com conexões recebidas (driver paralelo) elas são reaproveitadas e não são fechadas aqui.
+    Devolve o resumo da tabela: registros confirmados, segundos e erro (None quando deu certo)."""
+    conexoes_proprias = mysql_conn is None or pg_conn is None
+    mysql_cursor = None
+    pg_cursor = None
+    inicio = time.perf_counter()
+    registros_migrados = 0
+    erro = None
     try:
 
-        mysql_conn = pymysql.connect(
-            host='', db='',
-            user='', password='', port=3306
-        )
-        pg_conn = psycopg2.connect(
-            host='', dbname='',
-            user='', password=''
-        )
+        if conexoes_proprias:
+            mysql_conn = pymysql.connect(**MYSQL_CONFIG)
+            pg_conn = psycopg2.connect(**PG_CONFIG)
         
-        mysql_cursor = mysql_conn.cursor()
         pg_cursor = pg_conn.cursor()
         
 
+        mysql_cursor = mysql_conn.cursor()
         mysql_cursor.execute(f"SHOW COLUMNS FROM {tabela}")
         colunas_info = mysql_cursor.fetchall()
-        tipos_colunas = [col[1] for col in colunas_info]
-        nomes_colunas = [col[0] for col in colunas_info]
+        conversores = compilar_conversores(colunas_info)
+        mysql_cursor.close()
         
-       
+        # SSCursor: o MySQL envia as linhas conforme são lidas, sem carregar a tabela na memória
+        mysql_cursor = mysql_conn.cursor(pymysql.cursors.SSCursor)
         mysql_cursor.execute(f"SELECT * FROM {tabela}")
-        dados = mysql_cursor.fetchall()
         
-        print(f"📋 Migrando {tabela}: {len(dados)} registros")
+        tabela_pg = f"{SCHEMA_PG}.{tabela}"
+        print(f"📋 Migrando {tabela} ({'COPY' if MODO_CARGA == 'copy' else 'INSERT em lotes'})")
         
+        if truncar:
+            print(f"⚠️  Esvaziando {tabela_pg} antes da carga (TRUNCATE)")
+            pg_cursor.execute(f"TRUNCATE TABLE {tabela_pg}")
         
-        for reg in dados:
-            valores = []
-            for i, valor in enumerate(reg):
-                tipo_mysql = tipos_colunas[i].lower()
-                nome_coluna = nomes_colunas[i].lower()
-                
-                if valor is None:
-                    valores.append('NULL')
-                elif 'blob' in tipo_mysql or 'binary' in tipo_mysql:
-                    # BLOB/BINARY para BYTEA
-                    if isinstance(valor, bytes):
-                        valores.append(f"'\\x{valor.hex()}'")
-                    else:
-                        valor_bytes = "'"+(valor)+"'"
-                elif 'tinyint' in tipo_mysql:
-                   
-                    valores.append(f"'{str(valor)}'")
-                elif ('int(' in tipo_mysql or 
-                      'integer' in tipo_mysql or 
-                      'smallint' in tipo_mysql or 
-                      'bigint' in tipo_mysql):
-                   
-                    valores.append(str(valor))
-                elif ('datetime' in tipo_mysql or 
-                      'timestamp' in tipo_mysql or 
-                      'date' in tipo_mysql or 
-                      'time' in tipo_mysql):
-                    
-                    if valor:
-                        valores.append(f"'{valor}'")
-                    else:
-                        valores.append('NULL')
-                elif isinstance(valor, str):
-                    
-                    valor_escaped = valor.replace("'", "''")
-                    valores.append(f"'{valor_escaped}'")
-                else:
-               
-                    valores.append(f"'{str(valor)}'")
+        lidos = 0
+        desde_commit = 0
+        while True:
+            registros = mysql_cursor.fetchmany(LOTE_LINHAS)
+            if not registros:
+                break
+            
+            lote = converter_lote(registros, conversores)
+            gravar_lote(pg_cursor, tabela_pg, lote)
             
-           
-            query = f"INSERT INTO chatbot.{tabela} VALUES ({','.join(valores)})"
-            pg_cursor.execute(query)
+            lidos += len(lote)
+            desde_commit += len(lote)
+            if desde_commit >= LINHAS_POR_COMMIT:
+                pg_conn.commit()
+                registros_migrados = lidos
+                desde_commit = 0
+                print(f"📊 {registros_migrados} registros migrados...")
         
         pg_conn.commit()
-        print(f"✅ {tabela} migrada com sucesso!")
+        registros_migrados = lidos
+        print(f"✅ {tabela} migrada com sucesso! ({registros_migrados} registros)")
         
     except Exception as e:
+        erro = str(e)
         print(f"❌ Erro em {tabela}: {e}")
+        if registros_migrados:
+            # Os commits periódicos deixam no destino o que foi confirmado antes da falha
+            limpeza = "a próxima execução com --truncar recomeça do zero" if not truncar else "rode de novo para recomeçar"
+            erro = f"carga parcial ({registros_migrados} registros confirmados; {limpeza}): {e}"
+            print(f"⚠️  {tabela} ficou com carga parcial de {registros_migrados} registros no destino")
+        if pg_conn:
+            try:
+                pg_conn.rollback()
+            except psycopg2.Error:
+                pass
+    finally:
+        if mysql_cursor:
+            try:
+                mysql_cursor.close()
+            except Exception:
+                pass  # SSCursor interrompido no meio do resultado
+        if pg_cursor:
+            pg_cursor.close()
+        if conexoes_proprias:
+            if mysql_conn:
+                mysql_conn.close()
+            if pg_conn:
+                pg_conn.close()
+    
+    return {'tabela': tabela, 'registros': registros_migrados,
+            'segundos': round(time.perf_counter() - inicio, 2), 'erro': erro}
+
+# Conexões do processo do driver paralelo (abertas no initializer, reaproveitadas entre tabelas)
+conexoes_worker = {}
+
+def iniciar_worker(perfil_top=None, truncar=TRUNCAR_DESTINO):
+    conexoes_worker['mysql'] = pymysql.connect(**MYSQL_CONFIG)
+    conexoes_worker['pg'] = psycopg2.connect(**PG_CONFIG)
+    conexoes_worker['perfil_top'] = perfil_top
+    conexoes_worker['truncar'] = truncar
+    # Processos do pool não executam atexit: o Finalize fecha as conexões na saída do worker
+    multiprocessing.util.Finalize(None, fechar_conexoes_worker, exitpriority=10)
+
+def fechar_conexoes_worker():
+    for chave in ('mysql', 'pg'):
+        conn = conexoes_worker.pop(chave, None)
+        if conn:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+def migrar_tabela_worker(tabela):
+    """Executa migrar_tabela no processo do pool, reabrindo as conexões que tenham caído"""
+    mysql_conn = conexoes_worker['mysql']
+    try:
+        mysql_conn.ping(reconnect=True)
+    except Exception:
+        mysql_conn = conexoes_worker['mysql'] = pymysql.connect(**MYSQL_CONFIG)
+    if conexoes_worker['pg'].closed:
+        conexoes_worker['pg'] = psycopg2.connect(**PG_CONFIG)
+    
+    if conexoes_worker['perfil_top']:
+        return executar_com_perfil(tabela, conexoes_worker['perfil_top'], migrar_tabela,
+                                   tabela, mysql_conn, conexoes_worker['pg'], conexoes_worker['truncar'])
+    return migrar_tabela(tabela, mysql_conn, conexoes_worker['pg'], conexoes_worker['truncar'])
+
+def tamanhos_tabelas(tabelas=None):
+    """{tabela: bytes (dados + índices)} do information_schema; sem lista, todas as tabelas do banco"""
+    mysql_conn = pymysql.connect(**MYSQL_CONFIG)
+    try:
+        cursor = mysql_conn.cursor()
+        cursor.execute("""
+            SELECT table_name, COALESCE(data_length, 0) + COALESCE(index_length, 0)
+            FROM information_schema.tables
+            WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE'
+        """)
+        tamanhos = {nome: tamanho for nome, tamanho in cursor.fetchall()}
+        cursor.close()
     finally:
-        mysql_cursor.close()
-        pg_cursor.close()
         mysql_conn.close()
-        pg_conn.close()
+    
+    if tabelas is None:
+        return tamanhos
+    return {tabela: tamanhos.get(tabela, 0) for tabela in tabelas}
+
+def migrar_em_paralelo(tabelas=None, processos=PROCESSOS, perfil_top=None, truncar=TRUNCAR_DESTINO):
+    """Migra as tabelas em um pool de processos, maiores primeiro, e imprime o resumo.
+    Sem lista, descobre as tabelas do banco MySQL pelo information_schema."""
+    tamanhos = tamanhos_tabelas(tabelas)
+    # Maiores primeiro: a mais demorada não fica para o fim, com os outros processos ociosos
+    ordem = sorted(tamanhos, key=tamanhos.get, reverse=True)
+    if not ordem:
+        print("ℹ️  Nenhuma tabela para migrar.")
+        return []
+    
+    print(f"📦 {len(ordem)} tabela(s) em {min(processos, len(ordem))} processo(s)")
+    inicio = time.perf_counter()
+    resultados = []
+    with ProcessPoolExecutor(max_workers=min(processos, len(ordem)), initializer=iniciar_worker,
+                             initargs=(perfil_top, truncar)) as executor:
+        futuros = {executor.submit(migrar_tabela_worker, tabela): tabela for tabela in ordem}
+        for futuro in as_completed(futuros):
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                resultado = {'tabela': futuros[futuro], 'registros': 0, 'segundos': 0, 'erro': str(e)}
+            resultados.append(resultado)
+            print(f"   [{len(resultados)}/{len(ordem)}] {resultado['tabela']}: "
+                  f"{'❌ ' + resultado['erro'] if resultado['erro'] else '✅'}")
+    
+    imprimir_resumo(resultados, time.perf_counter() - inicio)
+    return resultados
+
+def imprimir_resumo(resultados, segundos_total):
+    print("─" * 50)
+    print(f"{'tabela':<40} {'registros':>12} {'segundos':>10}  status")
+    for resultado in sorted(resultados, key=lambda r: r['segundos'], reverse=True):
+        print(f"{resultado['tabela']:<40} {resultado['registros']:>12} {resultado['segundos']:>10.2f}  "
+              f"{'ERRO' if resultado['erro'] else 'OK'}")
+    
+    falhas = [r for r in resultados if r['erro']]
+    registros = sum(r['registros'] for r in resultados)
+    print("─" * 50)
+    print(f"📈 {len(resultados) - len(falhas)} ok, {len(falhas)} com erro, {registros} registros "
+          f"em {segundos_total:.1f}s ({registros / max(segundos_total, 1e-6):.0f} registros/s)")
+    for falha in falhas:
+        print(f"   ❌ {falha['tabela']}: {falha['erro']}")
+
+def opcao_processos():
+    """--processos N na linha de comando → N (padrão PROCESSOS)"""
+    if '--processos' not in sys.argv:
+        return PROCESSOS
+    posicao = sys.argv.index('--processos') + 1
+    return int(sys.argv[posicao]) if posicao < len(sys.argv) and sys.argv[posicao].isdigit() else PROCESSOS
 
 
 TABELAS = [
@@ -97,8 +376,9 @@ if __name__ == "__main__":
 
     print("─" * 50)
     
-    for tabela in TABELAS:
-        migrar_tabela(tabela)
+    # Lista vazia: todas as tabelas do banco MySQL configurado
+    tabelas = [tabela.strip() for tabela in TABELAS if tabela.strip()] or None
+    migrar_em_paralelo(tabelas, opcao_processos(), opcao_perfil(), '--truncar' in sys.argv or TRUNCAR_DESTINO)
 
 
        
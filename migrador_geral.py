@@ -1,17 +1,33 @@
-import psycopg2
 from psycopg2 import sql, pool
+from psycopg2.extras import execute_values
 import oracledb
 from oracledb import create_pool
 import re
+import json
+import atexit
+import hashlib
+import sqlite3
+import cProfile
+import pstats
 from flask import Flask, request, render_template_string, redirect, url_for
 import threading
+import queue
 import time
+from contextlib import contextmanager
+import uuid
+import copy
 import os
 import sys
 import logging
+from collections import deque
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
 from typing import Dict, List, Tuple, Optional
 
-oracledb.init_oracle_client(lib_dir='C:\\instantclient_23_8')
+# Instant Client (modo thick); ignorado quando o diretório não existe
+ORACLE_LIB_DIR_PADRAO = 'C:\\instantclient_23_8'
+cliente_oracle_inicializado = False
 
 app = Flask(__name__)
 
@@ -19,11 +35,16 @@ app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Variáveis globais para armazenar o estado da migração
+# Estado da migração fora de um job (CLI --delta e mensagens das rotas);
+# cada /migrate tem o seu, com a mesma estrutura (ver criar_job)
 migration_status = {
     'in_progress': False,
     'completed': False,
-    'logs': [],
+    'execucao': 0,          # muda a cada migração; o cliente recomeça o cursor de logs quando muda
+    'logs': None,           # BufferLogs (criado junto com a classe, mais abaixo)
+    'journal': None,        # CheckpointJournal da execução em andamento
+    'metricas': {},         # tabela → tempos por fase, linhas e bytes (expostos em /metrics)
+    'perfil': {},           # resumo dos hotspots quando a opção 'perfil' está ligada
     'tables_created': 0,
     'tables_failed': 0,
     'tables_data_migrated': 0,
@@ -31,13 +52,98 @@ migration_status = {
     'total_tables': 0
 }
 
-# Pools de conexão
-connection_pools = {
-    'postgresql_source': None,
-    'postgresql_dest': None,
-    'oracle_source': None
+# Protege os contadores de migration_status e dos jobs atualizados pelos workers
+status_lock = threading.Lock()
+
+# Opções padrão do motor de migração
+OPCOES_MIGRACAO_PADRAO = {
+    'modo_carga': 'copy',       # 'copy' (COPY TO/FROM STDIN) ou 'insert' (INSERT em lotes)
+    'formato_copy': 'binary',   # 'binary' ou 'text'
+    'workers': 4,               # tabelas migradas em paralelo
+    'chunks_paralelos': 4,      # conexões simultâneas por tabela grande (1 desativa)
+    'linhas_por_chunk': 2000000,  # tabelas acima disso são divididas em chunks
+    'num_chunks': 0,            # número fixo de chunks (0 = calcular por linhas_por_chunk)
+    'itersize': 10000,          # linhas por ida ao servidor no cursor nomeado do PostgreSQL
+    'oracle_arraysize': 5000,   # arraysize/prefetchrows do cursor Oracle
+    'retomar': False,           # continuar a partir do diário de checkpoints
+    'linhas_por_checkpoint': 500000,  # segmento com commit/checkpoint em tabelas com PK inteira (0 desativa)
+    'modo_sincronizacao': 'completa',  # 'completa' (TRUNCATE + carga) ou 'incremental' (delta com upsert)
+    'coluna_watermark': '',     # updated_at, ORA_ROWSCN...; vazio usa a PK inteira
+    'contagem_exata': False,    # COUNT(*) antes da carga em vez da estimativa do catálogo
+    'lote_min': 100,            # limites (em linhas) do lote adaptativo do caminho INSERT
+    'lote_max': 50000,
+    'lote_bytes': 4 * 1024 * 1024,  # tamanho alvo de cada lote em memória
+    'ddl_em_lote': True,        # criar todas as tabelas antes da carga, com um único commit
+    'ddl_dry_run': False,       # apenas devolver o script DDL, sem migrar
+    'indices_pos_carga': False,  # PK/UNIQUE/CHECK/índices/FKs criados depois da carga
+    'maintenance_work_mem': '1GB',  # por sessão, durante a criação dos índices
+    'tabelas_staging': [],      # tabelas carregadas em staging UNLOGGED + troca por rename
+    'sincronizar_sequencias': True,  # setval das sequências para max(coluna)/valor da origem após a carga
+    'perfil': False,            # cProfile por tabela e por thread, salvo em PERFIL_DIR
+    'perfil_top': 20,           # funções no resumo de hotspots do job
 }
 
+MAX_WORKERS = 32
+MAX_CHUNKS = 256
+
+# Buffer entre COPY TO STDOUT (origem) e COPY FROM STDIN (destino)
+COPY_BLOCO_BYTES = 256 * 1024
+COPY_MAX_BLOCOS = 32
+COPY_PROGRESSO_BYTES = 64 * 1024 * 1024
+
+# Tabelas por round-trip ao aplicar o DDL em lote
+DDL_TABELAS_POR_LOTE = 200
+
+# Sequências acertadas (setval) por round-trip após a carga
+SEQUENCIAS_POR_LOTE = 500
+
+# Lotes em trânsito entre a thread leitora e a escritora no caminho INSERT
+PIPELINE_MAX_LOTES = 4
+
+# Lote inicial (antes de medir o tamanho das linhas) e amostra usada na medição
+LOTE_INICIAL = 1000
+LOTE_AMOSTRA_LINHAS = 32
+
+# Intervalo de linhas entre os logs de progresso
+INTERVALO_LOG_REGISTROS = 5000
+
+# Diário de checkpoints (SQLite local) usado para retomar migrações
+CHECKPOINT_DB = os.environ.get('MIGRADOR_CHECKPOINT_DB', 'migracao_checkpoints.db')
+
+# Logs da migração: últimas entradas em memória, as mais antigas vão para arquivos rotativos em disco
+LOG_BUFFER_ENTRADAS = int(os.environ.get('MIGRADOR_LOG_BUFFER', 5000))
+LOG_ARQUIVO = os.environ.get('MIGRADOR_LOG_ARQUIVO', 'migracao_logs.jsonl')
+LOG_ARQUIVO_MAX_BYTES = 10 * 1024 * 1024
+LOG_ARQUIVO_BACKUPS = 5
+
+# Perfis cProfile (opção 'perfil'): um diretório por job com .prof por tabela, por thread e o total
+PERFIL_DIR = os.environ.get('MIGRADOR_PERFIL_DIR', 'perfis')
+
+# Fases cronometradas por tabela; '*' agrupa o que é feito para todas de uma vez (catálogo e DDL em lote)
+FASES_METRICAS = ('catalogo', 'ddl', 'leitura', 'conversao', 'escrita', 'commit')
+
+# Jobs de migração: cada /migrate vira um job com estado, contadores e logs próprios
+MAX_JOBS_SIMULTANEOS = int(os.environ.get('MIGRADOR_MAX_JOBS', 2))
+MAX_JOBS_HISTORICO = 50     # jobs encerrados mantidos para consulta em /jobs
+jobs = {}
+jobs_lock = threading.Lock()
+jobs_semaforo = threading.BoundedSemaphore(MAX_JOBS_SIMULTANEOS)
+# Job da thread atual; as threads criadas com nova_thread herdam o job de quem as criou
+job_atual = threading.local()
+
+# Pools de conexão de longa duração, indexados pelo fingerprint da conexão
+# (listagem, teste, DDL e dados reutilizam o mesmo pool entre requisições)
+connection_pools = {}
+pools_lock = threading.Lock()
+# Conexões emprestadas → entrada do pool de origem (para a devolução)
+conexoes_emprestadas = {}
+# Pools substituídos por um maior, fechados quando a última conexão voltar
+pools_aposentados = []
+
+POOL_TAMANHO_PADRAO = 4
+POOL_OCIOSO_SEGUNDOS = 300
+ORACLE_PING_SEGUNDOS = 60
+
 # HTML templates (mantidos intactos)
 INDEX_HTML = '''
 <!DOCTYPE html>
@@ -175,12 +281,14 @@ TABLES_HTML = '''
         h1 { color: #333; }
         .table-list { margin: 20px 0; }
         .table-item { margin: 5px 0; }
+        .staging-label { margin-left: 15px; color: #666; font-size: 0.9em; }
         button { 
             background-color: #4CAF50; color: white; padding: 10px 15px; 
             border: none; border-radius: 4px; cursor: pointer; margin-top: 20px;
         }
         button:hover { background-color: #45a049; }
         .select-all { margin-bottom: 10px; }
+        .form-group { margin-bottom: 15px; }
     </style>
 </head>
 <body>
@@ -200,6 +308,105 @@ TABLES_HTML = '''
         <input type="hidden" name="dest_password" value="{{ dest_password }}">
         <input type="hidden" name="dest_schema" value="{{ dest_schema }}">
         
+        <div class="form-group">
+            <label for="copy_format">Modo de carga (PostgreSQL → PostgreSQL):</label>
+            <select id="copy_format" name="copy_format">
+                <option value="binary">COPY binário</option>
+                <option value="text">COPY texto</option>
+                <option value="insert">INSERT em lotes</option>
+            </select>
+        </div>
+        
+        <div class="form-group">
+            <label for="modo_sincronizacao">Sincronização:</label>
+            <select id="modo_sincronizacao" name="modo_sincronizacao">
+                <option value="completa">Carga completa (TRUNCATE + carga)</option>
+                <option value="incremental">Incremental (somente alterações, com upsert)</option>
+            </select>
+        </div>
+        
+        <div class="form-group">
+            <label for="coluna_watermark">Coluna de watermark (ex: updated_at, ORA_ROWSCN; vazio = PK inteira):</label>
+            <input type="text" id="coluna_watermark" name="coluna_watermark">
+        </div>
+        
+        <div class="form-group">
+            <label for="workers">Tabelas em paralelo:</label>
+            <input type="number" id="workers" name="workers" value="4" min="1" max="32">
+        </div>
+        
+        <div class="form-group">
+            <label for="chunks_paralelos">Chunks em paralelo por tabela grande:</label>
+            <input type="number" id="chunks_paralelos" name="chunks_paralelos" value="4" min="1" max="32">
+        </div>
+        
+        <div class="form-group">
+            <label for="linhas_por_chunk">Linhas por chunk:</label>
+            <input type="number" id="linhas_por_chunk" name="linhas_por_chunk" value="2000000" min="1">
+        </div>
+        
+        <div class="form-group">
+            <label for="num_chunks">Número de chunks (0 = automático):</label>
+            <input type="number" id="num_chunks" name="num_chunks" value="0" min="0" max="256">
+        </div>
+        
+        <div class="form-group">
+            <label for="linhas_por_checkpoint">Linhas por checkpoint (0 desativa):</label>
+            <input type="number" id="linhas_por_checkpoint" name="linhas_por_checkpoint" value="500000" min="0">
+        </div>
+        
+        <div class="form-group">
+            <label for="lote_min">Lote mínimo (linhas, modo INSERT):</label>
+            <input type="number" id="lote_min" name="lote_min" value="100" min="1">
+        </div>
+        
+        <div class="form-group">
+            <label for="lote_max">Lote máximo (linhas, modo INSERT):</label>
+            <input type="number" id="lote_max" name="lote_max" value="50000" min="1">
+        </div>
+        
+        <div class="form-group">
+            <input type="checkbox" id="ddl_em_lote" name="ddl_em_lote" checked>
+            <label for="ddl_em_lote">Criar todas as tabelas antes da carga (DDL em uma transação)</label>
+        </div>
+        
+        <div class="form-group">
+            <input type="checkbox" id="indices_pos_carga" name="indices_pos_carga">
+            <label for="indices_pos_carga">Criar PK, índices e FKs após a carga (em paralelo)</label>
+        </div>
+        
+        <div class="form-group">
+            <label for="maintenance_work_mem">maintenance_work_mem para os índices:</label>
+            <input type="text" id="maintenance_work_mem" name="maintenance_work_mem" value="1GB">
+        </div>
+        
+        <div class="form-group">
+            <input type="checkbox" id="sincronizar_sequencias" name="sincronizar_sequencias" checked>
+            <label for="sincronizar_sequencias">Sincronizar sequências após a carga (max(PK) / valor da origem)</label>
+        </div>
+        
+        <div class="form-group">
+            <input type="checkbox" id="perfil" name="perfil">
+            <label for="perfil">Perfilar a migração (cProfile por tabela/thread)</label>
+            <input type="number" id="perfil_top" name="perfil_top" value="20" min="1" style="width: 80px;">
+            <label for="perfil_top">funções no resumo</label>
+        </div>
+        
+        <div class="form-group">
+            <input type="checkbox" id="ddl_dry_run" name="ddl_dry_run">
+            <label for="ddl_dry_run">Dry-run: apenas gerar o script SQL do DDL</label>
+        </div>
+        
+        <div class="form-group">
+            <input type="checkbox" id="contagem_exata" name="contagem_exata">
+            <label for="contagem_exata">Contagem exata de registros (COUNT(*), varre a tabela inteira)</label>
+        </div>
+        
+        <div class="form-group">
+            <input type="checkbox" id="retomar" name="retomar">
+            <label for="retomar">Retomar migração anterior (pular tabelas concluídas)</label>
+        </div>
+        
         <div class="select-all">
             <input type="checkbox" id="select_all" onclick="toggleSelectAll()">
             <label for="select_all">Selecionar Todas</label>
@@ -210,6 +417,8 @@ TABLES_HTML = '''
             <div class="table-item">
                 <input type="checkbox" id="table_{{ loop.index }}" name="selected_tables" value="{{ table[0] }}.{{ table[1] }}">
                 <label for="table_{{ loop.index }}">{{ table[0] }}.{{ table[1] }}</label>
+                <input type="checkbox" id="staging_{{ loop.index }}" name="tabelas_staging" value="{{ table[0] }}.{{ table[1] }}">
+                <label for="staging_{{ loop.index }}" class="staging-label">staging UNLOGGED</label>
             </div>
             {% endfor %}
         </div>
@@ -252,19 +461,44 @@ RESULTS_HTML = '''
         }
     </style>
     <script>
+        // Cursor de logs: o servidor devolve só as entradas a partir de "since"
+        let execucao = {{ execucao }};
+        let proximoLog = {{ proximo_log }};
+        // Entradas mantidas na página; as mais antigas ficam em /jobs/<id>/logs/page
+        const MAX_LOGS_PAGINA = 2000;
+        
         function refreshLogs() {
-            fetch('/migration_logs')
+            fetch('/jobs/{{ job_id }}/logs?since=' + proximoLog + '&execucao=' + execucao)
                 .then(response => response.json())
                 .then(data => {
                     const logContainer = document.getElementById('log-container');
-                    logContainer.innerHTML = '';
+                    if (data.reset) {
+                        logContainer.innerHTML = '';
+                    }
+                    if (data.truncated) {
+                        const aviso = document.createElement('div');
+                        aviso.className = 'log-entry info';
+                        aviso.textContent = '… entradas anteriores em /jobs/{{ job_id }}/logs/page';
+                        logContainer.appendChild(aviso);
+                    }
                     
+                    const rolarParaFim = logContainer.scrollTop + logContainer.clientHeight >= logContainer.scrollHeight - 5;
+                    const fragmento = document.createDocumentFragment();
                     data.logs.forEach(log => {
                         const logEntry = document.createElement('div');
                         logEntry.className = 'log-entry ' + log.type;
                         logEntry.textContent = log.message;
-                        logContainer.appendChild(logEntry);
+                        fragmento.appendChild(logEntry);
                     });
+                    logContainer.appendChild(fragmento);
+                    while (logContainer.childElementCount > MAX_LOGS_PAGINA) {
+                        logContainer.removeChild(logContainer.firstChild);
+                    }
+                    if (rolarParaFim) {
+                        logContainer.scrollTop = logContainer.scrollHeight;
+                    }
+                    execucao = data.execucao;
+                    proximoLog = data.next;
                     
                     document.getElementById('tables-created').textContent = data.tables_created;
                     document.getElementById('tables-failed').textContent = data.tables_failed;
@@ -357,10 +591,10 @@ class DatabaseManager:
     
     @staticmethod
     def create_postgresql_connection_pool(host: str, dbname: str, user: str, password: str, 
-                                        port: int = 5432, min_conn: int = 1, max_conn: int = 10) -> Optional[pool.SimpleConnectionPool]:
+                                        port: int = 5432, min_conn: int = 1, max_conn: int = 10) -> Optional[pool.ThreadedConnectionPool]:
         """Cria pool de conexões PostgreSQL"""
         try:
-            return pool.SimpleConnectionPool(
+            return pool.ThreadedConnectionPool(
                 min_conn, max_conn,
                 host=host, database=dbname, user=user, password=password,
                 port=port, connect_timeout=10, sslmode='prefer'
@@ -374,42 +608,38 @@ class DatabaseManager:
                                     min_conn: int = 1, max_conn: int = 10) -> Optional[any]:
         """Cria pool de conexões Oracle"""
         try:
-            # Configurar cliente Oracle se lib_dir for fornecido
-            if lib_dir and os.path.exists(lib_dir):
-                try:
-                    oracledb.init_oracle_client(lib_dir=lib_dir)
-                    add_log(f"✅ Cliente Oracle inicializado: {lib_dir}")
-                except Exception as e:
-                    add_log(f"⚠️  Não foi possível inicializar cliente Oracle: {e}")
+            inicializar_cliente_oracle(lib_dir)
             
             return create_pool(
                 user=user, password=password, dsn=dsn,
-                min=min_conn, max=max_conn, increment=1
+                min=min_conn, max=max_conn, increment=1,
+                # ping no acquire após ociosidade e encerramento de sessões ociosas
+                ping_interval=ORACLE_PING_SEGUNDOS, timeout=POOL_OCIOSO_SEGUNDOS
             )
         except Exception as e:
             add_log(f"❌ Erro ao criar pool Oracle: {e}", 'error')
             return None
     
     @staticmethod
-    def get_postgresql_connection(connection_pool: pool.SimpleConnectionPool, timeout: int = 30):
-        """Obtém conexão do pool PostgreSQL com timeout"""
+    def get_postgresql_connection(connection_pool: pool.ThreadedConnectionPool):
+        """Obtém conexão do pool PostgreSQL"""
         try:
-            return connection_pool.getconn(timeout=timeout)
+            return connection_pool.getconn()
         except Exception as e:
             add_log(f"❌ Erro ao obter conexão PostgreSQL: {e}", 'error')
             return None
     
     @staticmethod
-    def get_oracle_connection(connection_pool, timeout: int = 30):
-        """Obtém conexão do pool Oracle com timeout"""
+    def get_oracle_connection(connection_pool):
+        """Obtém conexão do pool Oracle"""
         try:
-            return connection_pool.acquire(timeout=timeout)
+            return connection_pool.acquire()
         except Exception as e:
             add_log(f"❌ Erro ao obter conexão Oracle: {e}", 'error')
             return None
     
     @staticmethod
-    def release_postgresql_connection(connection_pool: pool.SimpleConnectionPool, connection):
+    def release_postgresql_connection(connection_pool: pool.ThreadedConnectionPool, connection):
         """Libera conexão PostgreSQL de volta para o pool"""
         try:
             if connection and not connection.closed:
@@ -426,81 +656,752 @@ class DatabaseManager:
         except Exception as e:
             add_log(f"⚠️  Erro ao liberar conexão Oracle: {e}")
 
+class CheckpointJournal:
+    """Diário local do progresso por tabela e por chunk para retomar migrações interrompidas"""
+    
+    def __init__(self, caminho: str, migracao_id: str, escopo: Tuple = ()):
+        # Watermarks valem para o par origem/destino; checkpoints de carga são do escopo (conjunto de tabelas),
+        # assim jobs simultâneos no mesmo par não apagam o progresso uns dos outros
+        self.migracao_id = migracao_id
+        self.checkpoint_id = hashlib.sha1('|'.join((migracao_id, *escopo)).encode('utf-8')).hexdigest()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS checkpoint_tabelas (
+                migracao_id TEXT NOT NULL,
+                tabela TEXT NOT NULL,
+                status TEXT NOT NULL,
+                ultima_chave INTEGER,
+                registros INTEGER NOT NULL DEFAULT 0,
+                plano_chunks TEXT,
+                atualizado_em TEXT NOT NULL,
+                PRIMARY KEY (migracao_id, tabela)
+            );
+            CREATE TABLE IF NOT EXISTS checkpoint_chunks (
+                migracao_id TEXT NOT NULL,
+                tabela TEXT NOT NULL,
+                indice INTEGER NOT NULL,
+                registros INTEGER NOT NULL,
+                atualizado_em TEXT NOT NULL,
+                PRIMARY KEY (migracao_id, tabela, indice)
+            );
+            CREATE TABLE IF NOT EXISTS watermarks (
+                migracao_id TEXT NOT NULL,
+                tabela TEXT NOT NULL,
+                coluna TEXT NOT NULL,
+                tipo TEXT NOT NULL,
+                valor TEXT NOT NULL,
+                atualizado_em TEXT NOT NULL,
+                PRIMARY KEY (migracao_id, tabela)
+            );
+        """)
+        self._conn.commit()
+    
+    @staticmethod
+    def gerar_id(migration_type: str, source_params: Dict, dest_params: Dict) -> str:
+        """Identifica a migração pela origem e destino para poder retomá-la"""
+        chave = '|'.join(str(v) for v in (
+            migration_type, source_params.get('host'), source_params.get('dbname'), source_params.get('tns'),
+            dest_params.get('host'), dest_params.get('dbname'), dest_params.get('schema')
+        ))
+        return hashlib.sha1(chave.encode('utf-8')).hexdigest()
+    
+    def _executar(self, comando: str, parametros: Tuple = ()):
+        with self._lock:
+            self._conn.execute(comando, parametros)
+            self._conn.commit()
+    
+    def reiniciar(self):
+        """Descarta o progresso registrado deste escopo (os watermarks ficam)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoint_tabelas WHERE migracao_id = ?", (self.checkpoint_id,))
+            self._conn.execute("DELETE FROM checkpoint_chunks WHERE migracao_id = ?", (self.checkpoint_id,))
+            self._conn.commit()
+    
+    def obter_tabela(self, tabela: str) -> Optional[Dict]:
+        """Retorna o checkpoint registrado para a tabela"""
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT status, ultima_chave, registros, plano_chunks
+                FROM checkpoint_tabelas WHERE migracao_id = ? AND tabela = ?
+            """, (self.checkpoint_id, tabela)).fetchone()
+        if not row:
+            return None
+        return {
+            'status': row[0],
+            'ultima_chave': row[1],
+            'registros': row[2],
+            'plano_chunks': json.loads(row[3]) if row[3] else None
+        }
+    
+    def iniciar_tabela(self, tabela: str, plano_chunks: List[Dict] = None):
+        """Registra o início (ou reinício do zero) da carga de uma tabela"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM checkpoint_chunks WHERE migracao_id = ? AND tabela = ?",
+                (self.checkpoint_id, tabela)
+            )
+            self._conn.execute("""
+                INSERT OR REPLACE INTO checkpoint_tabelas
+                    (migracao_id, tabela, status, ultima_chave, registros, plano_chunks, atualizado_em)
+                VALUES (?, ?, 'em_andamento', NULL, 0, ?, datetime('now'))
+            """, (self.checkpoint_id, tabela, json.dumps(plano_chunks) if plano_chunks else None))
+            self._conn.commit()
+    
+    def registrar_progresso(self, tabela: str, ultima_chave: int, registros: int):
+        """Registra a última chave confirmada no destino"""
+        self._executar("""
+            UPDATE checkpoint_tabelas SET ultima_chave = ?, registros = ?, atualizado_em = datetime('now')
+            WHERE migracao_id = ? AND tabela = ?
+        """, (ultima_chave, registros, self.checkpoint_id, tabela))
+    
+    def concluir_tabela(self, tabela: str):
+        """Marca a tabela como totalmente migrada"""
+        self._executar("""
+            INSERT INTO checkpoint_tabelas (migracao_id, tabela, status, registros, atualizado_em)
+            VALUES (?, ?, 'concluida', 0, datetime('now'))
+            ON CONFLICT (migracao_id, tabela) DO UPDATE SET status = 'concluida', atualizado_em = datetime('now')
+        """, (self.checkpoint_id, tabela))
+    
+    def chunks_concluidos(self, tabela: str) -> Dict[int, int]:
+        """Retorna {indice: registros} dos chunks já confirmados"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT indice, registros FROM checkpoint_chunks WHERE migracao_id = ? AND tabela = ?",
+                (self.checkpoint_id, tabela)
+            ).fetchall()
+        return dict(rows)
+    
+    def concluir_chunk(self, tabela: str, indice: int, registros: int):
+        """Marca um chunk como confirmado no destino"""
+        self._executar("""
+            INSERT OR REPLACE INTO checkpoint_chunks (migracao_id, tabela, indice, registros, atualizado_em)
+            VALUES (?, ?, ?, ?, datetime('now'))
+        """, (self.checkpoint_id, tabela, indice, registros))
+    
+    def obter_watermark(self, tabela: str) -> Optional[Tuple]:
+        """Retorna (coluna, valor) do último watermark sincronizado"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT coluna, tipo, valor FROM watermarks WHERE migracao_id = ? AND tabela = ?",
+                (self.migracao_id, tabela)
+            ).fetchone()
+        if not row:
+            return None
+        coluna, tipo, valor = row
+        if tipo == 'int':
+            return coluna, int(valor)
+        if tipo == 'numeric':
+            return coluna, Decimal(valor)
+        if tipo == 'timestamp':
+            return coluna, datetime.fromisoformat(valor)
+        if tipo == 'date':
+            return coluna, date.fromisoformat(valor)
+        return coluna, valor
+    
+    def salvar_watermark(self, tabela: str, coluna: str, valor):
+        """Persiste o watermark da tabela para a próxima sincronização"""
+        if isinstance(valor, bool) or not isinstance(valor, (int, Decimal, datetime, date)):
+            tipo, texto = 'texto', str(valor)
+        elif isinstance(valor, int) or (isinstance(valor, Decimal) and valor == valor.to_integral_value()):
+            tipo, texto = 'int', str(int(valor))
+        elif isinstance(valor, Decimal):
+            tipo, texto = 'numeric', str(valor)
+        elif isinstance(valor, datetime):
+            tipo, texto = 'timestamp', valor.isoformat()
+        else:
+            tipo, texto = 'date', valor.isoformat()
+        
+        self._executar("""
+            INSERT OR REPLACE INTO watermarks (migracao_id, tabela, coluna, tipo, valor, atualizado_em)
+            VALUES (?, ?, ?, ?, ?, datetime('now'))
+        """, (self.migracao_id, tabela, coluna, tipo, texto))
+    
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
+
+class BufferLogs:
+    """Buffer circular dos logs da execução atual: guarda as últimas `capacidade` entradas
+    em memória e grava as que saem do buffer em arquivos JSONL rotativos (arquivo, .1, .2...).
+    Cada entrada recebe um id sequencial na execução, usado como cursor e para paginação."""
+    
+    def __init__(self, capacidade: int, arquivo: str, max_bytes: int, backups: int):
+        self.arquivo = arquivo
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.execucao = 0
+        self._entradas = deque(maxlen=max(capacidade, 1))
+        self._proximo_id = 0
+        self._lock = threading.Lock()
+        self._spill = None
+    
+    def reiniciar(self, execucao: int, limpar: bool = True):
+        """Começa uma nova execução; o que já foi para o disco continua lá (marcado com a execução).
+        limpar=False mantém as entradas já registradas (e a sequência de ids) na nova execução"""
+        with self._lock:
+            self.execucao = execucao
+            if limpar:
+                self._entradas.clear()
+                self._proximo_id = 0
+    
+    def append(self, entrada: Dict):
+        with self._lock:
+            if len(self._entradas) == self._entradas.maxlen:
+                self._gravar_spill(self._entradas[0])
+            self._entradas.append({**entrada, 'id': self._proximo_id})
+            self._proximo_id += 1
+    
+    @property
+    def total(self) -> int:
+        return self._proximo_id
+    
+    def recentes(self) -> List[Dict]:
+        with self._lock:
+            return list(self._entradas)
+    
+    def desde(self, inicio: int) -> Tuple[List[Dict], int, bool]:
+        """(entradas a partir do id `inicio`, próximo cursor, True se parte delas já saiu da memória)"""
+        with self._lock:
+            primeiro = self._entradas[0]['id'] if self._entradas else self._proximo_id
+            truncado = inicio < primeiro
+            entradas = list(islice(self._entradas, max(inicio - primeiro, 0), None))
+            return entradas, self._proximo_id, truncado
+    
+    def pagina(self, numero: int, tamanho: int) -> List[Dict]:
+        """Entradas com id em [numero * tamanho, (numero + 1) * tamanho), da memória ou do disco"""
+        inicio, fim = numero * tamanho, (numero + 1) * tamanho
+        with self._lock:
+            primeiro = self._entradas[0]['id'] if self._entradas else self._proximo_id
+            memoria = [e for e in islice(self._entradas, max(inicio - primeiro, 0), None) if e['id'] < fim]
+            if inicio >= primeiro:
+                return memoria
+            if self._spill:
+                self._spill.flush()
+            execucao = self.execucao
+            arquivos = [f"{self.arquivo}.{i}" for i in range(self.backups, 0, -1)] + [self.arquivo]
+        
+        # Trecho antigo: varrer os arquivos do mais antigo para o mais recente
+        disco = []
+        for caminho in arquivos:
+            if not os.path.exists(caminho):
+                continue
+            with open(caminho, encoding='utf-8') as f:
+                for linha in f:
+                    try:
+                        entrada = json.loads(linha)
+                    except ValueError:
+                        continue
+                    if entrada.get('execucao') == execucao and inicio <= entrada['id'] < min(fim, primeiro):
+                        disco.append({k: v for k, v in entrada.items() if k != 'execucao'})
+        return disco + memoria
+    
+    def descartar(self):
+        """Fecha e remove os arquivos de spill (job descartado do histórico)"""
+        with self._lock:
+            if self._spill:
+                self._spill.close()
+                self._spill = None
+            for caminho in [self.arquivo] + [f"{self.arquivo}.{i}" for i in range(1, self.backups + 1)]:
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+    
+    def _gravar_spill(self, entrada: Dict):
+        try:
+            if self._spill is None:
+                self._spill = open(self.arquivo, 'a', encoding='utf-8')
+            if self._spill.tell() >= self.max_bytes:
+                self._rotacionar()
+            self._spill.write(json.dumps({**entrada, 'execucao': self.execucao}, ensure_ascii=False) + '\n')
+        except OSError as e:
+            # Sem disco o log antigo é descartado, mas a migração continua
+            logger.warning(f"Não foi possível gravar o log em {self.arquivo}: {e}")
+    
+    def _rotacionar(self):
+        self._spill.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.arquivo}.{i}"):
+                os.replace(f"{self.arquivo}.{i}", f"{self.arquivo}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.arquivo, f"{self.arquivo}.1")
+        self._spill = open(self.arquivo, 'w', encoding='utf-8')
+
+migration_status['logs'] = BufferLogs(LOG_BUFFER_ENTRADAS, LOG_ARQUIVO, LOG_ARQUIVO_MAX_BYTES, LOG_ARQUIVO_BACKUPS)
+
+def status_atual() -> Dict:
+    """Estado do job da thread atual (ou o migration_status global fora de um job)"""
+    return getattr(job_atual, 'status', migration_status)
+
+def journal_atual() -> Optional['CheckpointJournal']:
+    return status_atual()['journal']
+
+def nova_thread(target, perfilado: bool = True, **kwargs) -> threading.Thread:
+    """threading.Thread que herda o job (e a tabela em andamento) da thread criadora:
+    logs, contadores e métricas vão para o mesmo job. perfilado=False para alvos que chamam
+    perfilar() por conta própria (um cProfile por thread; aninhar substitui ou falha)"""
+    status = status_atual()
+    tabela = getattr(job_atual, 'tabela', None)
+    perfil = getattr(job_atual, 'perfil', None)
+    
+    def executar(*args, **kw):
+        job_atual.status = status
+        job_atual.tabela = tabela
+        job_atual.perfil = perfil
+        if not perfilado:
+            return target(*args, **kw)
+        with perfilar(tabela or '*'):
+            return target(*args, **kw)
+    
+    return threading.Thread(target=executar, **kwargs)
+
+def criar_job(migration_type: str, selected_tables: List[str], schema_destino: str) -> Dict:
+    """Registra um job novo (estado 'aguardando') e descarta os encerrados mais antigos além do histórico"""
+    job_id = uuid.uuid4().hex[:12]
+    raiz, extensao = os.path.splitext(LOG_ARQUIVO)
+    job = {
+        'in_progress': False, 'completed': False, 'execucao': 0,
+        'tables_created': 0, 'tables_failed': 0, 'tables_data_migrated': 0, 'tables_data_failed': 0,
+        'total_tables': len(selected_tables),
+        'logs': BufferLogs(LOG_BUFFER_ENTRADAS, f"{raiz}_{job_id}{extensao}", LOG_ARQUIVO_MAX_BYTES, LOG_ARQUIVO_BACKUPS),
+        'journal': None,
+        'metricas': {},
+        'perfil': {},
+        'id': job_id,
+        'estado': 'aguardando',
+        'migration_type': migration_type,
+        'schema_destino': schema_destino,
+        'criado_em': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'iniciado_em': None,
+        'encerrado_em': None,
+    }
+    with jobs_lock:
+        jobs[job_id] = job
+        encerrados = [j for j in jobs.values() if j['estado'] == 'concluido']
+        for antigo in encerrados[:max(0, len(encerrados) - MAX_JOBS_HISTORICO)]:
+            del jobs[antigo['id']]
+            antigo['logs'].descartar()
+    return job
+
+def executar_job(job: Dict, *args):
+    """Corpo da thread do job: espera uma vaga (MAX_JOBS_SIMULTANEOS) e executa run_migration"""
+    job_atual.status = job
+    if not jobs_semaforo.acquire(blocking=False):
+        add_log(f"⏳ Aguardando vaga: {MAX_JOBS_SIMULTANEOS} migração(ões) já em andamento")
+        jobs_semaforo.acquire()
+    try:
+        job['estado'] = 'executando'
+        job['iniciado_em'] = time.strftime("%Y-%m-%d %H:%M:%S")
+        run_migration(*args)
+    finally:
+        job['estado'] = 'concluido'
+        job['encerrado_em'] = time.strftime("%Y-%m-%d %H:%M:%S")
+        jobs_semaforo.release()
+
+def resumo_job(job: Dict) -> Dict:
+    """Campos públicos do job (sem logs e journal), copiados sob status_lock: os workers continuam
+    atualizando metricas enquanto a resposta é serializada"""
+    with status_lock:
+        return {chave: copy.deepcopy(valor) for chave, valor in job.items() if chave not in ('logs', 'journal')}
+
+class ColetorPerfil:
+    """Agrega os perfis cProfile de um job por tabela e por thread (worker, leitora, chunk)"""
+    
+    def __init__(self, diretorio: str, top: int):
+        self.diretorio = diretorio
+        self.top = top
+        self.por_tabela = {}
+        self.por_thread = {}
+        self.total = None
+        self._lock = threading.Lock()
+        self._avisado = False
+    
+    def adicionar(self, tabela: str, thread_nome: str, perfil: cProfile.Profile):
+        with self._lock:
+            for grupo, chave in ((self.por_tabela, tabela), (self.por_thread, thread_nome)):
+                if chave in grupo:
+                    grupo[chave].add(perfil)
+                else:
+                    grupo[chave] = pstats.Stats(perfil)
+            if self.total is None:
+                self.total = pstats.Stats(perfil)
+            else:
+                self.total.add(perfil)
+    
+    def perfil_indisponivel(self, erro: Exception):
+        # Python 3.12+: o cProfile usa sys.monitoring e só um perfil pode estar ativo por vez
+        with self._lock:
+            avisar, self._avisado = not self._avisado, True
+        if avisar:
+            add_log(f"⚠️  Perfil parcial: threads simultâneas não puderam ser perfiladas ({erro})")
+    
+    def salvar(self) -> Optional[str]:
+        """Grava <tabela>.prof, thread-<nome>.prof e total.prof; devolve o diretório"""
+        with self._lock:
+            if not self.por_tabela:
+                return None
+            os.makedirs(self.diretorio, exist_ok=True)
+            for prefixo, grupo in (('', self.por_tabela), ('thread-', self.por_thread)):
+                for nome, stats in grupo.items():
+                    arquivo = re.sub(r'[^\w.-]', '_', f"{prefixo}{nome}")
+                    stats.dump_stats(os.path.join(self.diretorio, f"{arquivo}.prof"))
+            self.total.dump_stats(os.path.join(self.diretorio, 'total.prof'))
+        return self.diretorio
+    
+    @staticmethod
+    def hotspots(stats: pstats.Stats, top: int) -> List[Dict]:
+        """As `top` funções com maior tempo próprio"""
+        linhas = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        return [
+            {'funcao': f"{os.path.basename(arquivo)}:{linha}({nome})", 'chamadas': chamadas,
+             'tempo_proprio': round(tempo_proprio, 4), 'tempo_acumulado': round(tempo_acumulado, 4)}
+            for (arquivo, linha, nome), (_, chamadas, tempo_proprio, tempo_acumulado, _) in linhas
+        ]
+    
+    def resumo(self) -> Dict:
+        with self._lock:
+            if not self.por_tabela:
+                return {}
+            return {
+                'diretorio': self.diretorio,
+                'top': self.hotspots(self.total, self.top),
+                'tabelas': {tabela: self.hotspots(stats, 5) for tabela, stats in self.por_tabela.items()},
+            }
+
+@contextmanager
+def perfilar(tabela: str):
+    """Perfila o bloco na thread atual quando o job tem um ColetorPerfil (sem custo quando não tem)"""
+    coletor = getattr(job_atual, 'perfil', None)
+    if coletor is None:
+        yield
+        return
+    
+    perfil = cProfile.Profile()
+    try:
+        perfil.enable()
+    except ValueError as e:
+        coletor.perfil_indisponivel(e)
+        yield
+        return
+    try:
+        yield
+    finally:
+        perfil.disable()
+        coletor.adicionar(tabela, threading.current_thread().name, perfil)
+
+def registrar_metrica(fase: str = None, segundos: float = 0.0, linhas: int = 0, bytes_: float = 0,
+                      tabela: str = None):
+    """Acumula tempo de uma fase e volume transferido na tabela em andamento da thread (job_atual.tabela)"""
+    status = status_atual()
+    tabela = tabela or getattr(job_atual, 'tabela', None) or '*'
+    with status_lock:
+        metrica = status['metricas'].get(tabela)
+        if metrica is None:
+            metrica = status['metricas'][tabela] = {
+                'fases': dict.fromkeys(FASES_METRICAS, 0.0), 'linhas': 0, 'bytes': 0,
+                'inicio': time.time(), 'fim': None
+            }
+        if fase:
+            metrica['fases'][fase] += segundos
+        metrica['linhas'] += linhas
+        metrica['bytes'] += bytes_
+
+def encerrar_metrica(tabela: str):
+    with status_lock:
+        metrica = status_atual()['metricas'].get(tabela)
+        if metrica:
+            metrica['fim'] = time.time()
+
+@contextmanager
+def medir_fase(fase: str, tabela: str = None):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar_metrica(fase, time.perf_counter() - inicio, tabela=tabela)
+
+def medido(fase: str, funcao):
+    """Envolve `funcao` para que cada chamada conte no tempo da fase"""
+    def executar(*args):
+        with medir_fase(fase):
+            return funcao(*args)
+    return executar
+
 def add_log(message: str, type: str = 'info'):
     """Adiciona uma mensagem de log"""
     timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
     log_entry = {'message': f"[{timestamp}] {message}", 'type': type}
-    migration_status['logs'].append(log_entry)
+    status_atual()['logs'].append(log_entry)
     logger.log(
         logging.INFO if type == 'info' else logging.ERROR if type == 'error' else logging.WARNING,
         message
     )
 
+def incrementar_status(*chaves: str):
+    """Incrementa contadores do job atual de forma segura entre threads"""
+    status = status_atual()
+    with status_lock:
+        for chave in chaves:
+            status[chave] += 1
+
+def formatar_dsn_oracle(tns: str) -> str:
+    """Completa o DSN Oracle com a porta padrão quando necessário"""
+    dsn = tns
+    if ':' not in dsn and '/' in dsn:
+        parts = dsn.split('/')
+        dsn = f"{parts[0]}:1521/{parts[1]}"
+    return dsn
+
+def inicializar_cliente_oracle(lib_dir: str = None):
+    """Ativa o modo thick do Oracle uma única vez por processo, se o Instant Client existir"""
+    global cliente_oracle_inicializado
+    if cliente_oracle_inicializado or not lib_dir or not os.path.exists(lib_dir):
+        return
+    try:
+        oracledb.init_oracle_client(lib_dir=lib_dir)
+        add_log(f"✅ Cliente Oracle inicializado: {lib_dir}")
+    except Exception as e:
+        add_log(f"⚠️  Não foi possível inicializar cliente Oracle: {e}")
+    cliente_oracle_inicializado = True
+
+inicializar_cliente_oracle(ORACLE_LIB_DIR_PADRAO)
+
+def fingerprint_conexao(tipo: str, params: Dict) -> str:
+    """Identifica um destino de conexão (inclui a senha para não reaproveitar credenciais antigas)"""
+    if tipo == 'oracle':
+        partes = [tipo, params['user'], params['password'], formatar_dsn_oracle(params['tns'])]
+    else:
+        partes = [tipo, params['host'], str(params.get('port', 5432)), params['dbname'],
+                  params['user'], params['password']]
+    return hashlib.sha1('|'.join(partes).encode('utf-8')).hexdigest()
+
+def _criar_entrada_pool(tipo: str, params: Dict, tamanho: int) -> Optional[Dict]:
+    if tipo == 'oracle':
+        connection_pool = DatabaseManager.create_oracle_connection_pool(
+            params['user'], params['password'], formatar_dsn_oracle(params['tns']),
+            params.get('lib_dir'), min_conn=1, max_conn=tamanho
+        )
+    else:
+        connection_pool = DatabaseManager.create_postgresql_connection_pool(
+            params['host'], params['dbname'], params['user'], params['password'],
+            port=params.get('port', 5432), min_conn=1, max_conn=tamanho
+        )
+    if connection_pool is None:
+        return None
+    return {'tipo': tipo, 'pool': connection_pool, 'tamanho': tamanho,
+            'em_uso': 0, 'reservado': 0, 'ultimo_uso': time.monotonic()}
+
+def _fechar_entrada_pool(entrada: Dict):
+    try:
+        if entrada['tipo'] == 'oracle':
+            entrada['pool'].close(force=True)
+        else:
+            entrada['pool'].closeall()
+    except Exception as e:
+        add_log(f"⚠️  Erro ao fechar pool {entrada['tipo']}: {e}")
+
+def obter_pool(tipo: str, params: Dict, tamanho: int = POOL_TAMANHO_PADRAO, reservar: bool = False) -> Optional[str]:
+    """Garante um pool com `tamanho` conexões livres além das já reservadas ou emprestadas (jobs simultâneos
+    compartilham o pool do mesmo destino) e devolve seu fingerprint. reservar=True soma `tamanho` às reservas
+    até liberar_reserva_pool"""
+    despejar_pools_ociosos()
+    chave = fingerprint_conexao(tipo, params)
+    
+    with pools_lock:
+        entrada = connection_pools.get(chave)
+        ocupado = max(entrada['reservado'], entrada['em_uso']) if entrada else 0
+        reserva = tamanho if reservar else 0
+        if entrada and entrada['tamanho'] >= ocupado + tamanho:
+            entrada['reservado'] += reserva
+            return chave
+        
+        nova_entrada = _criar_entrada_pool(tipo, params, max(ocupado + tamanho, POOL_TAMANHO_PADRAO))
+        if nova_entrada is None:
+            return None
+        nova_entrada['reservado'] = (entrada['reservado'] if entrada else 0) + reserva
+        
+        if entrada:
+            # Pool pequeno demais: as conexões emprestadas voltam para ele e ele fecha depois
+            if entrada['em_uso']:
+                pools_aposentados.append(entrada)
+            else:
+                _fechar_entrada_pool(entrada)
+        connection_pools[chave] = nova_entrada
+        return chave
+
+def conexao_saudavel(tipo: str, conn) -> bool:
+    """Verifica a conexão no checkout (conexões derrubadas pelo servidor ou pela rede)"""
+    try:
+        if tipo == 'oracle':
+            conn.ping()
+            return True
+        if conn.closed:
+            return False
+        if conn.autocommit:
+            conn.autocommit = False
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.close()
+        conn.rollback()
+        return True
+    except Exception:
+        return False
+
+def obter_conexao(chave: str):
+    """Empresta uma conexão saudável do pool identificado pelo fingerprint"""
+    with pools_lock:
+        entrada = connection_pools.get(chave)
+    if entrada is None:
+        return None
+    
+    for _ in range(2):
+        if entrada['tipo'] == 'oracle':
+            conn = DatabaseManager.get_oracle_connection(entrada['pool'])
+        else:
+            conn = DatabaseManager.get_postgresql_connection(entrada['pool'])
+        if conn is None:
+            return None
+        
+        if conexao_saudavel(entrada['tipo'], conn):
+            with pools_lock:
+                entrada['em_uso'] += 1
+                entrada['ultimo_uso'] = time.monotonic()
+                conexoes_emprestadas[id(conn)] = entrada
+            return conn
+        
+        # Descartar a conexão quebrada e tentar outra
+        try:
+            if entrada['tipo'] == 'oracle':
+                entrada['pool'].drop(conn)
+            else:
+                entrada['pool'].putconn(conn, close=True)
+        except Exception:
+            pass
+    
+    add_log("❌ Nenhuma conexão saudável disponível no pool", 'error')
+    return None
+
+def liberar_conexao(conn):
+    """Devolve ao pool uma conexão obtida com obter_conexao"""
+    if conn is None:
+        return
+    with pools_lock:
+        entrada = conexoes_emprestadas.pop(id(conn), None)
+        if entrada is None:
+            return
+        entrada['em_uso'] -= 1
+        entrada['ultimo_uso'] = time.monotonic()
+        fechar_aposentado = entrada in pools_aposentados and entrada['em_uso'] == 0
+        if fechar_aposentado:
+            pools_aposentados.remove(entrada)
+    
+    if entrada['tipo'] == 'oracle':
+        DatabaseManager.release_oracle_connection(entrada['pool'], conn)
+    else:
+        DatabaseManager.release_postgresql_connection(entrada['pool'], conn)
+    if fechar_aposentado:
+        _fechar_entrada_pool(entrada)
+
+def liberar_reserva_pool(chave: Optional[str], tamanho: int):
+    """Desfaz a reserva feita por obter_pool(..., reservar=True)"""
+    if chave is None:
+        return
+    with pools_lock:
+        entrada = connection_pools.get(chave)
+        if entrada:
+            entrada['reservado'] = max(0, entrada['reservado'] - tamanho)
+            entrada['ultimo_uso'] = time.monotonic()
+
+def despejar_pools_ociosos(ocioso_segundos: int = POOL_OCIOSO_SEGUNDOS):
+    """Fecha pools sem conexões emprestadas nem reservadas há mais de `ocioso_segundos`"""
+    agora = time.monotonic()
+    with pools_lock:
+        ociosos = [
+            chave for chave, entrada in connection_pools.items()
+            if entrada['em_uso'] == 0 and entrada['reservado'] == 0
+            and agora - entrada['ultimo_uso'] > ocioso_segundos
+        ]
+        entradas = [connection_pools.pop(chave) for chave in ociosos]
+    for entrada in entradas:
+        _fechar_entrada_pool(entrada)
+
+def fechar_todos_pools():
+    """Fecha todos os pools (encerramento do processo)"""
+    with pools_lock:
+        entradas = list(connection_pools.values()) + pools_aposentados
+        connection_pools.clear()
+        pools_aposentados.clear()
+    for entrada in entradas:
+        _fechar_entrada_pool(entrada)
+
+atexit.register(fechar_todos_pools)
+
+def tipo_origem(migration_type: str) -> str:
+    return 'postgresql' if migration_type == 'postgres_to_postgres' else 'oracle'
+
+def criar_pools_migracao(migration_type: str, source_params: Dict, dest_params: Dict,
+                         tamanho: int, opcoes: Dict) -> bool:
+    """Garante e reserva `tamanho` conexões nos pools de origem e destino da migração e registra seus
+    fingerprints nas opções (liberar_pools_migracao desfaz a reserva)"""
+    opcoes['pool_reserva'] = tamanho
+    opcoes['pool_origem'] = obter_pool(tipo_origem(migration_type), source_params, tamanho, reservar=True)
+    opcoes['pool_destino'] = obter_pool('postgresql', dest_params, tamanho, reservar=True)
+    return opcoes['pool_origem'] is not None and opcoes['pool_destino'] is not None
+
+def liberar_pools_migracao(opcoes: Dict):
+    """Devolve as reservas feitas por criar_pools_migracao"""
+    liberar_reserva_pool(opcoes.pop('pool_origem', None), opcoes.get('pool_reserva', 0))
+    liberar_reserva_pool(opcoes.pop('pool_destino', None), opcoes.pop('pool_reserva', 0))
+
+def obter_par_conexoes(opcoes: Dict) -> Optional[Tuple]:
+    """Obtém um par (origem, destino) dos pools da migração"""
+    source_conn = obter_conexao(opcoes['pool_origem'])
+    if source_conn is None:
+        return None
+    
+    dest_conn = obter_conexao(opcoes['pool_destino'])
+    if dest_conn is None:
+        liberar_conexao(source_conn)
+        return None
+    
+    return source_conn, dest_conn
+
+def liberar_par_conexoes(source_conn, dest_conn):
+    """Devolve um par de conexões aos pools da migração"""
+    liberar_conexao(source_conn)
+    liberar_conexao(dest_conn)
+
 def testar_conexoes(source_config: Dict, dest_config: Dict, migration_type: str) -> bool:
-    """Testa todas as conexões antes de iniciar a migração"""
+    """Testa todas as conexões antes de iniciar a migração (o checkout já faz o health check)"""
     add_log("🔍 Testando conexões com os bancos de dados...")
     
     success = True
     
-    # Testar PostgreSQL destino
-    try:
-        test_conn = psycopg2.connect(
-            host=dest_config['host'], database=dest_config['dbname'],
-            user=dest_config['user'], password=dest_config['password'],
-            port=dest_config.get('port', 5432), connect_timeout=10
-        )
-        test_conn.close()
-        add_log("✅ Conexão PostgreSQL destino: OK")
-    except Exception as e:
-        add_log(f"❌ Conexão PostgreSQL destino falhou: {e}", 'error')
-        success = False
-    
-    # Testar origem baseado no tipo de migração
+    testes = [('PostgreSQL destino', 'postgresql', dest_config)]
     if migration_type == 'postgres_to_postgres':
-        try:
-            test_conn = psycopg2.connect(
-                host=source_config['host'], database=source_config['dbname'],
-                user=source_config['user'], password=source_config['password'],
-                port=source_config.get('port', 5432), connect_timeout=10
-            )
-            test_conn.close()
-            add_log("✅ Conexão PostgreSQL origem: OK")
-        except Exception as e:
-            add_log(f"❌ Conexão PostgreSQL origem falhou: {e}", 'error')
-            success = False
+        testes.append(('PostgreSQL origem', 'postgresql', source_config))
     else:  # oracle_to_postgres
-        try:
-            # Tentar modo thin primeiro
-            if source_config.get('lib_dir') and os.path.exists(source_config['lib_dir']):
-                try:
-                    oracledb.init_oracle_client(lib_dir=source_config['lib_dir'])
-                except:
-                    pass
-            
-            dsn = source_config['tns']
-            if ':' not in dsn and '/' in dsn:
-                parts = dsn.split('/')
-                dsn = f"{parts[0]}:1521/{parts[1]}"
-            
-            test_conn = oracledb.connect(
-                user=source_config['user'], password=source_config['password'], dsn=dsn
-            )
-            test_conn.close()
-            add_log("✅ Conexão Oracle origem: OK")
-        except Exception as e:
-            add_log(f"❌ Conexão Oracle origem falhou: {e}", 'error')
+        testes.append(('Oracle origem', 'oracle', source_config))
+    
+    for descricao, tipo, config in testes:
+        chave = obter_pool(tipo, config, 1)
+        test_conn = obter_conexao(chave) if chave else None
+        if test_conn is None:
+            add_log(f"❌ Conexão {descricao} falhou", 'error')
             success = False
+            continue
+        liberar_conexao(test_conn)
+        add_log(f"✅ Conexão {descricao}: OK")
     
     return success
 
 def listar_tabelas_postgres(host: str, dbname: str, user: str, password: str, schema: str = None) -> List[Tuple]:
-    """Lista todas as tabelas disponíveis no PostgreSQL com conexão robusta"""
+    """Lista todas as tabelas disponíveis no PostgreSQL com conexão do pool"""
     conn = None
     try:
-        conn = psycopg2.connect(
-            host=host, dbname=dbname, user=user, password=password,
-            port=5432, connect_timeout=10, sslmode='prefer'
-        )
+        chave = obter_pool('postgresql', {'host': host, 'dbname': dbname, 'user': user, 'password': password})
+        conn = obter_conexao(chave) if chave else None
+        if conn is None:
+            return []
         cursor = conn.cursor()
         
         if schema:
@@ -520,33 +1421,23 @@ def listar_tabelas_postgres(host: str, dbname: str, user: str, password: str, sc
         
         tabelas = cursor.fetchall()
         cursor.close()
+        conn.rollback()
         return tabelas
         
     except Exception as e:
         add_log(f"❌ Erro ao listar tabelas PostgreSQL: {e}", 'error')
         return []
     finally:
-        if conn:
-            conn.close()
+        liberar_conexao(conn)
 
 def listar_tabelas_oracle(user: str, password: str, tns: str, lib_dir: str = None, schema: str = None) -> List[Tuple]:
-    """Lista todas as tabelas disponíveis no Oracle com conexão robusta"""
+    """Lista todas as tabelas disponíveis no Oracle com conexão do pool"""
     conn = None
     try:
-        # Configurar cliente Oracle se necessário
-        if lib_dir and os.path.exists(lib_dir):
-            try:
-                oracledb.init_oracle_client(lib_dir=lib_dir)
-            except Exception as e:
-                add_log(f"⚠️  Não foi possível inicializar cliente Oracle: {e}")
-        
-        # Formatar DSN se necessário
-        dsn = tns
-        if ':' not in dsn and '/' in dsn:
-            parts = dsn.split('/')
-            dsn = f"{parts[0]}:1521/{parts[1]}"
-        
-        conn = oracledb.connect(user=user, password=password, dsn=dsn)
+        chave = obter_pool('oracle', {'user': user, 'password': password, 'tns': tns, 'lib_dir': lib_dir})
+        conn = obter_conexao(chave) if chave else None
+        if conn is None:
+            return []
         cursor = conn.cursor()
         
         if schema:
@@ -572,8 +1463,7 @@ def listar_tabelas_oracle(user: str, password: str, tns: str, lib_dir: str = Non
         add_log(f"❌ Erro ao listar tabelas Oracle: {str(e)}", 'error')
         return []
     finally:
-        if conn:
-            conn.close()
+        liberar_conexao(conn)
 
 def listar_tabelas_banco(migration_type: str, host: str, dbname: str, user: str, password: str, 
                         schema: str = None, oracle_tns: str = None, oracle_lib_dir: str = None) -> List[Tuple]:
@@ -586,71 +1476,295 @@ def listar_tabelas_banco(migration_type: str, host: str, dbname: str, user: str,
         add_log(f"❌ Tipo de migração inválido: {migration_type}", 'error')
         return []
 
+def sequencia_do_default(default_value, migration_type: str) -> Optional[str]:
+    """Nome da sequência usada por um DEFAULT (nextval('s'::regclass) ou, no Oracle, "OWNER"."S".NEXTVAL)"""
+    if not default_value:
+        return None
+    if migration_type == 'postgres_to_postgres':
+        match = re.search(r"nextval\('([^']+)'::regclass\)", str(default_value))
+        return match.group(1) if match else None
+    match = re.search(r'(?:"?([\w$#]+)"?\.)?"?([\w$#]+)"?\.NEXTVAL', str(default_value), re.IGNORECASE)
+    if not match:
+        return None
+    return f"{match.group(1)}.{match.group(2)}" if match.group(1) else match.group(2)
+
+def sequencia_destino(sequencia: str, schema_destino: str, migration_type: str) -> str:
+    """Sequência equivalente no destino: mesmo nome (minúsculo se vier do Oracle) no schema de destino"""
+    nome = sequencia.split('.')[-1].strip('"')
+    if migration_type == 'oracle_to_postgres':
+        nome = nome.lower()
+    return f'{schema_destino}."{nome}"'
+
+class SnapshotEsquema:
+    """Modelo em memória do catálogo da origem (colunas, chaves primárias, sequências e restrições)
+    das tabelas selecionadas, carregado com poucas consultas por conjunto em vez de várias por tabela"""
+    
+    # NOT NULL do Oracle aparece em all_constraints como CHECK gerado automaticamente
+    _CHECK_NOT_NULL = re.compile(r'^\s*"?[\w$#]+"?\s+IS\s+NOT\s+NULL\s*$', re.IGNORECASE)
+    
+    def __init__(self, migration_type: str):
+        self.migration_type = migration_type
+        # 'schema.tabela' → {'colunas': [...], 'chaves_primarias': [...], 'restricoes': [...], 'indices': [...]}
+        self.tabelas = {}
+    
+    def _chave(self, schema: str, tabela: str) -> str:
+        chave = f"{schema}.{tabela}"
+        return chave if self.migration_type == 'postgres_to_postgres' else chave.upper()
+    
+    def tabela(self, schema: str, tabela: str) -> Optional[Dict]:
+        return self.tabelas.get(self._chave(schema, tabela))
+    
+    def chaves_primarias(self, schema: str, tabela: str) -> List[str]:
+        info = self.tabela(schema, tabela)
+        return list(info['chaves_primarias']) if info else []
+    
+    def sequencias(self, schema: str, tabela: str) -> List[Tuple[str, str]]:
+        """(coluna, sequência) das colunas com DEFAULT nextval(...) ou, no Oracle, DEFAULT seq.NEXTVAL"""
+        info = self.tabela(schema, tabela)
+        sequencias = []
+        for coluna in (info['colunas'] if info else []):
+            sequencia = sequencia_do_default(coluna['default'], self.migration_type)
+            if sequencia:
+                sequencias.append((coluna['nome'], sequencia))
+        return sequencias
+    
+    @classmethod
+    def carregar(cls, selected_tables: List[str], source_conn, migration_type: str) -> 'SnapshotEsquema':
+        """Lê o catálogo de todas as tabelas selecionadas de uma vez"""
+        snapshot = cls(migration_type)
+        for table_full_name in selected_tables:
+            schema, tabela = table_full_name.split('.', 1)
+            snapshot.tabelas.setdefault(snapshot._chave(schema, tabela), None)
+        
+        cursor = source_conn.cursor()
+        try:
+            if migration_type == 'postgres_to_postgres':
+                snapshot._carregar_postgres(cursor)
+            else:
+                cursor.arraysize = 5000
+                snapshot._carregar_oracle(cursor)
+        finally:
+            cursor.close()
+        
+        # Tabelas selecionadas que não existem na origem ficam fora do modelo
+        snapshot.tabelas = {chave: info for chave, info in snapshot.tabelas.items() if info}
+        return snapshot
+    
+    def _nova_tabela(self, chave: str) -> Dict:
+        info = self.tabelas.get(chave)
+        if info is None:
+            info = self.tabelas[chave] = {'colunas': [], 'chaves_primarias': [], 'restricoes': [], 'indices': []}
+        return info
+    
+    def _carregar_postgres(self, cursor):
+        selecionadas = list(self.tabelas)
+        
+        cursor.execute("""
+            SELECT n.nspname || '.' || c.relname, a.attname,
+                   format_type(a.atttypid, a.atttypmod), NOT a.attnotnull,
+                   pg_get_expr(d.adbin, d.adrelid)
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+            LEFT JOIN pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+            WHERE c.relkind IN ('r', 'p', 'v', 'f')
+            AND n.nspname || '.' || c.relname = ANY(%s)
+            ORDER BY 1, a.attnum
+        """, (selecionadas,))
+        for chave, nome, tipo, nullable, default_value in cursor.fetchall():
+            self._nova_tabela(chave)['colunas'].append({
+                'nome': nome, 'tipo': tipo, 'nullable': nullable, 'default': default_value,
+                'tamanho': None, 'precisao': None, 'escala': None
+            })
+        
+        cursor.execute("""
+            SELECT n.nspname || '.' || c.relname, con.conname, con.contype,
+                   ARRAY(SELECT a.attname::text
+                         FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+                         JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+                         ORDER BY k.ord),
+                   rn.nspname, rc.relname,
+                   ARRAY(SELECT a.attname::text
+                         FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+                         JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+                         ORDER BY k.ord),
+                   pg_get_constraintdef(con.oid)
+            FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_class rc ON rc.oid = con.confrelid
+            LEFT JOIN pg_namespace rn ON rn.oid = rc.relnamespace
+            WHERE con.contype IN ('p', 'u', 'f', 'c')
+            AND n.nspname || '.' || c.relname = ANY(%s)
+            ORDER BY 1, con.conname
+        """, (selecionadas,))
+        for chave, nome, tipo, colunas, ref_schema, ref_tabela, ref_colunas, definicao in cursor.fetchall():
+            info = self.tabelas.get(chave)
+            if not info:
+                continue
+            if tipo == 'p':
+                info['chaves_primarias'] = list(colunas)
+            info['restricoes'].append({
+                'nome': nome, 'tipo': tipo, 'colunas': list(colunas),
+                'tabela_referenciada': (ref_schema, ref_tabela) if ref_tabela else None,
+                'colunas_referenciadas': list(ref_colunas or []), 'definicao': definicao
+            })
+        
+        # Índices secundários; os que sustentam PK/UNIQUE vêm com a própria restrição
+        cursor.execute("""
+            SELECT schemaname || '.' || tablename, indexname, indexdef
+            FROM pg_indexes
+            WHERE schemaname || '.' || tablename = ANY(%s)
+            ORDER BY 1, indexname
+        """, (selecionadas,))
+        for chave, nome, definicao in cursor.fetchall():
+            info = self.tabelas.get(chave)
+            if not info or any(restricao['nome'] == nome for restricao in info['restricoes']):
+                continue
+            info['indices'].append({
+                'nome': nome, 'unico': definicao.startswith('CREATE UNIQUE'), 'colunas': [], 'definicao': definicao
+            })
+    
+    def _carregar_oracle(self, cursor):
+        owners = sorted({chave.split('.', 1)[0] for chave in self.tabelas})
+        binds = ', '.join(f":o{i}" for i in range(len(owners)))
+        parametros = {f"o{i}": owner for i, owner in enumerate(owners)}
+        
+        cursor.execute(f"""
+            SELECT owner, table_name, column_name, data_type, data_length,
+                   data_precision, data_scale, nullable, data_default
+            FROM all_tab_columns
+            WHERE owner IN ({binds})
+            ORDER BY owner, table_name, column_id
+        """, parametros)
+        for owner, tabela, nome, tipo, tamanho, precisao, escala, nullable, default_value in cursor:
+            chave = f"{owner}.{tabela}"
+            if chave not in self.tabelas:
+                continue
+            self._nova_tabela(chave)['colunas'].append({
+                'nome': nome, 'tipo': tipo, 'nullable': nullable == 'Y', 'default': default_value,
+                'tamanho': tamanho, 'precisao': precisao, 'escala': escala
+            })
+        
+        cursor.execute(f"""
+            SELECT c.owner, c.table_name, c.constraint_name, c.constraint_type,
+                   c.r_owner, c.r_constraint_name, c.search_condition, c.index_name, cc.column_name
+            FROM all_constraints c
+            LEFT JOIN all_cons_columns cc
+                   ON cc.owner = c.owner AND cc.constraint_name = c.constraint_name
+                  AND cc.table_name = c.table_name
+            WHERE c.owner IN ({binds})
+            AND c.constraint_type IN ('P', 'U', 'R', 'C')
+            ORDER BY c.owner, c.table_name, c.constraint_name, cc.position
+        """, parametros)
+        
+        restricoes = {}
+        indices_de_restricao = set()
+        for owner, tabela, nome, tipo, r_owner, r_nome, condicao, indice, coluna in cursor:
+            if indice:
+                indices_de_restricao.add((owner, indice))
+            restricao = restricoes.get((owner, nome))
+            if restricao is None:
+                restricao = restricoes[(owner, nome)] = {
+                    'chave': f"{owner}.{tabela}", 'tabela': (owner, tabela), 'nome': nome,
+                    'tipo': {'P': 'p', 'U': 'u', 'R': 'f', 'C': 'c'}[tipo], 'colunas': [],
+                    'referencia': (r_owner, r_nome) if r_nome else None, 'definicao': condicao
+                }
+            if coluna and coluna not in restricao['colunas']:
+                restricao['colunas'].append(coluna)
+        
+        for restricao in restricoes.values():
+            info = self.tabelas.get(restricao['chave'])
+            if not info:
+                continue
+            if restricao['tipo'] == 'c' and self._CHECK_NOT_NULL.match(restricao['definicao'] or ''):
+                continue
+            
+            # FK: a restrição referenciada (PK/UNIQUE) veio na mesma consulta se o owner foi carregado
+            referenciada = restricoes.get(restricao['referencia']) if restricao['referencia'] else None
+            if restricao['tipo'] == 'p':
+                info['chaves_primarias'] = [coluna.lower() for coluna in restricao['colunas']]
+            info['restricoes'].append({
+                'nome': restricao['nome'], 'tipo': restricao['tipo'], 'colunas': restricao['colunas'],
+                'tabela_referenciada': referenciada['tabela'] if referenciada else None,
+                'colunas_referenciadas': referenciada['colunas'] if referenciada else [],
+                'definicao': restricao['definicao']
+            })
+        
+        # Índices secundários (exceto os de PK/UNIQUE e os baseados em expressão, SYS_NC...)
+        cursor.execute(f"""
+            SELECT i.table_owner, i.table_name, i.owner, i.index_name, i.uniqueness, ic.column_name
+            FROM all_indexes i
+            JOIN all_ind_columns ic ON ic.index_owner = i.owner AND ic.index_name = i.index_name
+            WHERE i.table_owner IN ({binds})
+            AND i.index_type IN ('NORMAL', 'FUNCTION-BASED NORMAL')
+            ORDER BY i.table_owner, i.table_name, i.index_name, ic.column_position
+        """, parametros)
+        indices = {}
+        for owner, tabela, indice_owner, nome, unicidade, coluna in cursor:
+            info = self.tabelas.get(f"{owner}.{tabela}")
+            if not info or (indice_owner, nome) in indices_de_restricao:
+                continue
+            indice = indices.get((indice_owner, nome))
+            if indice is None:
+                indice = indices[(indice_owner, nome)] = {
+                    'nome': nome, 'unico': unicidade == 'UNIQUE', 'colunas': [], 'definicao': None
+                }
+                info['indices'].append(indice)
+            indice['colunas'].append(coluna)
+        for info in self.tabelas.values():
+            if info:
+                info['indices'] = [
+                    indice for indice in info['indices']
+                    if not any(coluna.startswith('SYS_NC') for coluna in indice['colunas'])
+                ]
+
 def criar_sequencias_necessarias(tabela: str, schema_origem: str, schema_destino: str, 
-                               source_conn, dest_conn, migration_type: str) -> bool:
+                               source_conn, dest_conn, migration_type: str,
+                               snapshot: SnapshotEsquema = None) -> bool:
     """Cria sequências necessárias para a tabela no schema de destino"""
     try:
         if migration_type == 'postgres_to_postgres':
-            source_cursor = source_conn.cursor()
-            dest_cursor = dest_conn.cursor()
+            if snapshot is None:
+                snapshot = SnapshotEsquema.carregar([f"{schema_origem}.{tabela}"], source_conn, migration_type)
             
-            # Buscar colunas com valores padrão que usam sequências
-            source_cursor.execute("""
-                SELECT column_name, column_default, data_type
-                FROM information_schema.columns 
-                WHERE table_schema = %s AND table_name = %s 
-                AND column_default LIKE 'nextval(%'
-            """, (schema_origem, tabela))
+            # Colunas com valores padrão que usam sequências (lidas do snapshot)
+            sequencias = snapshot.sequencias(schema_origem, tabela)
+            if not sequencias:
+                return True
             
-            sequencias = source_cursor.fetchall()
+            dest_cursor = dest_conn.cursor()
             
-            for coluna, default_value, data_type in sequencias:
-                match = re.search(r"nextval\('([^']+)'::regclass\)", str(default_value))
-                if match:
-                    sequencia_nome = match.group(1)
-                    sequencia_nome_sem_schema = sequencia_nome.split('.')[-1]
-                    
-                    add_log(f"    🔍 Detectada sequência: {sequencia_nome}")
-                    
-                    # Verificar se a sequência já existe no destino
-                    dest_cursor.execute("""
-                        SELECT COUNT(*) 
-                        FROM pg_sequences 
-                        WHERE schemaname = %s AND sequencename = %s
-                    """, (schema_destino, sequencia_nome_sem_schema))
-                    
-                    if dest_cursor.fetchone()[0] == 0:
-                        add_log(f"    ⚙️  Criando sequência: {schema_destino}.{sequencia_nome_sem_schema}")
-                        
-                        try:
-                            source_cursor.execute("SELECT * FROM {} LIMIT 1".format(sequencia_nome))
-                            seq_info = source_cursor.fetchone()
-                            
-                            if seq_info:
-                                create_seq_sql = sql.SQL("CREATE SEQUENCE {}.{}").format(
-                                    sql.Identifier(schema_destino),
-                                    sql.Identifier(sequencia_nome_sem_schema)
-                                )
-                                dest_cursor.execute(create_seq_sql)
-                                dest_conn.commit()
-                                add_log(f"    ✅ Sequência criada com sucesso")
-                                
-                        except Exception as seq_error:
-                            add_log(f"    ⚠️  Criando sequência com valores padrão: {seq_error}")
-                            try:
-                                create_seq_sql = sql.SQL("CREATE SEQUENCE IF NOT EXISTS {}.{}").format(
-                                    sql.Identifier(schema_destino),
-                                    sql.Identifier(sequencia_nome_sem_schema)
-                                )
-                                dest_cursor.execute(create_seq_sql)
-                                dest_conn.commit()
-                                add_log(f"    ✅ Sequência criada com IF NOT EXISTS")
-                            except Exception as create_error:
-                                add_log(f"    ❌ Erro ao criar sequência: {create_error}", 'error')
-                    else:
-                        add_log(f"    ✅ Sequência {schema_destino}.{sequencia_nome_sem_schema} já existe")
+            # Uma única consulta para saber quais já existem no destino
+            nomes = [sequencia_nome.split('.')[-1].strip('"') for _, sequencia_nome in sequencias]
+            dest_cursor.execute("""
+                SELECT sequencename
+                FROM pg_sequences 
+                WHERE schemaname = %s AND sequencename = ANY(%s)
+            """, (schema_destino, nomes))
+            existentes = {row[0] for row in dest_cursor.fetchall()}
+            
+            for (coluna, sequencia_nome), sequencia_nome_sem_schema in zip(sequencias, nomes):
+                add_log(f"    🔍 Detectada sequência: {sequencia_nome}")
+                
+                if sequencia_nome_sem_schema in existentes:
+                    add_log(f"    ✅ Sequência {schema_destino}.{sequencia_nome_sem_schema} já existe")
+                    continue
+                
+                add_log(f"    ⚙️  Criando sequência: {schema_destino}.{sequencia_nome_sem_schema}")
+                try:
+                    create_seq_sql = sql.SQL("CREATE SEQUENCE IF NOT EXISTS {}.{}").format(
+                        sql.Identifier(schema_destino),
+                        sql.Identifier(sequencia_nome_sem_schema)
+                    )
+                    dest_cursor.execute(create_seq_sql)
+                    dest_conn.commit()
+                    existentes.add(sequencia_nome_sem_schema)
+                    add_log(f"    ✅ Sequência {schema_destino}.{sequencia_nome_sem_schema} criada com sucesso")
+                except Exception as create_error:
+                    dest_conn.rollback()
+                    add_log(f"    ❌ Erro ao criar sequência: {create_error}", 'error')
             
-            source_cursor.close()
             dest_cursor.close()
         
         return True
@@ -659,8 +1773,12 @@ def criar_sequencias_necessarias(tabela: str, schema_origem: str, schema_destino
         add_log(f"❌ Erro ao criar sequências para {tabela}: {e}", 'error')
         return False
 
-def obter_chaves_primarias(tabela: str, schema_origem: str, source_conn, migration_type: str) -> List[str]:
+def obter_chaves_primarias(tabela: str, schema_origem: str, source_conn, migration_type: str,
+                           snapshot: SnapshotEsquema = None) -> List[str]:
     """Obtém as chaves primárias da tabela"""
+    if snapshot and snapshot.tabela(schema_origem, tabela):
+        return snapshot.chaves_primarias(schema_origem, tabela)
+    
     try:
         if migration_type == 'postgres_to_postgres':
             cursor = source_conn.cursor()
@@ -694,11 +1812,797 @@ def obter_chaves_primarias(tabela: str, schema_origem: str, source_conn, migrati
         add_log(f"⚠️  Erro ao obter chaves primárias: {e}", 'error')
         return []
 
-def migrar_dados_postgres_para_postgres(tabela: str, schema_origem: str, schema_destino: str, 
-                                      source_conn, dest_conn) -> bool:
-    """Migra dados de PostgreSQL para PostgreSQL de forma transacional"""
-    source_cursor = None
-    dest_cursor = None
+def contar_registros(tabela: str, schema_origem: str, source_conn, migration_type: str, opcoes: Dict) -> int:
+    """Total de registros para o progresso: estimativa do catálogo ou COUNT(*) exato sob demanda"""
+    if opcoes['contagem_exata']:
+        cursor = source_conn.cursor()
+        try:
+            cursor.execute(f"SELECT COUNT(*) FROM {schema_origem}.{tabela}")
+            total = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+        add_log(f"    📊 Total de registros: {total}")
+        return total
+    
+    table_full_name = f"{schema_origem}.{tabela}"
+    total = estimar_tamanho_tabelas([table_full_name], source_conn, migration_type).get(table_full_name, 0)
+    add_log(f"    📊 Total estimado pelo catálogo: ~{total} registros")
+    return total
+
+def formatar_progresso(registros: int, total_registros: Optional[int]) -> str:
+    """Formata o progresso a partir das linhas efetivamente transferidas"""
+    if total_registros:
+        # Estimativas do catálogo podem ficar abaixo do real
+        percentual = min(99, registros * 100 // total_registros)
+        return f"{registros}/~{total_registros} registros migrados ({percentual}%)"
+    return f"{registros} registros migrados"
+
+class CopyPipe:
+    """Buffer limitado que liga o COPY TO STDOUT da origem ao COPY FROM STDIN do destino"""
+
+    def __init__(self, bloco_bytes: int = COPY_BLOCO_BYTES, max_blocos: int = COPY_MAX_BLOCOS,
+                 contar_linhas: bool = False, ao_progresso=None):
+        self._fila = queue.Queue(maxsize=max_blocos)
+        self._bloco_bytes = bloco_bytes
+        self._acumulado = bytearray()
+        self._pendente = b''
+        self._fim = False
+        self._cancelado = threading.Event()
+        self._contar_linhas = contar_linhas
+        self._ao_progresso = ao_progresso
+        self._proximo_progresso = COPY_PROGRESSO_BYTES
+        self.bytes_transferidos = 0
+        self.linhas_transferidas = 0
+
+    def _enfileirar(self, item):
+        """Coloca um item na fila respeitando o limite e o cancelamento"""
+        while True:
+            if self._cancelado.is_set():
+                raise IOError("COPY cancelado pelo destino")
+            try:
+                self._fila.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def write(self, data):
+        """Chamado pelo copy_expert da origem para cada linha exportada"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self._acumulado += data
+        if len(self._acumulado) >= self._bloco_bytes:
+            self._enfileirar(bytes(self._acumulado))
+            self._acumulado.clear()
+        return len(data)
+
+    def fechar(self, erro: Exception = None):
+        """Sinaliza o fim da exportação (ou o erro que a interrompeu)"""
+        if erro is None and self._acumulado:
+            self._enfileirar(bytes(self._acumulado))
+            self._acumulado.clear()
+        self._enfileirar(erro)
+
+    def cancelar(self):
+        """Interrompe o produtor quando o destino falha"""
+        self._cancelado.set()
+
+    def read(self, size: int = -1):
+        """Chamado pelo copy_expert do destino para obter o próximo bloco"""
+        while not self._pendente and not self._fim:
+            item = self._fila.get()
+            if item is None:
+                self._fim = True
+            elif isinstance(item, Exception):
+                self._fim = True
+                raise item
+            else:
+                self._pendente = item
+
+        if size is None or size < 0 or size >= len(self._pendente):
+            data, self._pendente = self._pendente, b''
+        else:
+            data, self._pendente = self._pendente[:size], self._pendente[size:]
+
+        self.bytes_transferidos += len(data)
+        if self._contar_linhas:
+            # No formato texto cada linha termina em \n (quebras internas são escapadas)
+            self.linhas_transferidas += data.count(b'\n')
+        if self._ao_progresso and self.bytes_transferidos >= self._proximo_progresso:
+            self._ao_progresso(self)
+            self._proximo_progresso += COPY_PROGRESSO_BYTES
+        return data
+
+def copiar_dados_via_copy(source_conn, dest_conn, select_sql: str, tabela_destino: str,
+                          colunas_str: str, formato: str = 'binary', total_registros: int = None) -> int:
+    """Copia dados com COPY TO STDOUT/FROM STDIN sem materializar a tabela em memória"""
+    opcoes_copy = "(FORMAT binary)" if formato == 'binary' else "(FORMAT text)"
+    copy_out_sql = f"COPY ({select_sql}) TO STDOUT WITH {opcoes_copy}"
+    copy_in_sql = f"COPY {tabela_destino} ({colunas_str}) FROM STDIN WITH {opcoes_copy}"
+
+    def ao_progresso(pipe_copy):
+        megabytes = pipe_copy.bytes_transferidos / (1024 * 1024)
+        if formato == 'text':
+            add_log(f"    📡 {formatar_progresso(pipe_copy.linhas_transferidas, total_registros)} ({megabytes:.0f} MB)")
+        else:
+            add_log(f"    📡 {megabytes:.0f} MB transferidos via COPY")
+    
+    pipe = CopyPipe(contar_linhas=formato == 'text', ao_progresso=ao_progresso)
+
+    def produtor():
+        cursor = source_conn.cursor()
+        try:
+            cursor.copy_expert(copy_out_sql, pipe)
+            pipe.fechar()
+        except Exception as e:
+            try:
+                pipe.fechar(e)
+            except IOError:
+                pass
+        finally:
+            cursor.close()
+
+    thread_origem = nova_thread(produtor, daemon=True)
+    thread_origem.start()
+
+    dest_cursor = dest_conn.cursor()
+    inicio = time.perf_counter()
+    try:
+        dest_cursor.copy_expert(copy_in_sql, pipe, size=COPY_BLOCO_BYTES)
+        registros = dest_cursor.rowcount
+        # Leitura e escrita correm juntas no COPY: o tempo total conta como escrita
+        registrar_metrica('escrita', time.perf_counter() - inicio, max(registros, 0), pipe.bytes_transferidos)
+    except Exception:
+        pipe.cancelar()
+        raise
+    finally:
+        dest_cursor.close()
+        thread_origem.join()
+
+    add_log(f"    📡 COPY {formato}: {pipe.bytes_transferidos / (1024 * 1024):.1f} MB transferidos")
+    return registros
+
+def estimar_bytes_registro(registros: List[tuple]) -> float:
+    """Estima o tamanho médio de uma linha a partir de uma amostra do lote"""
+    passo = max(1, len(registros) // LOTE_AMOSTRA_LINHAS)
+    amostra = registros[::passo]
+    total = 0
+    for registro in amostra:
+        for valor in registro:
+            if isinstance(valor, (str, bytes, bytearray, memoryview)):
+                total += len(valor) + 8
+            elif valor is None:
+                total += 1
+            else:
+                total += 16  # números, datas e afins
+    return total / len(amostra)
+
+class LoteAdaptativo:
+    """Dimensiona os lotes do caminho INSERT por bytes e pela vazão observada na escrita"""
+
+    def __init__(self, lote_min: int, lote_max: int, alvo_bytes: int):
+        self.lote_min = lote_min
+        self.lote_max = lote_max
+        self.alvo_bytes = alvo_bytes
+        self.tamanho = max(lote_min, min(LOTE_INICIAL, lote_max))
+        self.bytes_por_linha = None
+        self._teto = lote_max
+        self._melhor_taxa = 0.0
+        self._melhor_tamanho = self.tamanho
+        self._lock = threading.Lock()
+
+    def _limitar(self, tamanho: int) -> int:
+        return max(self.lote_min, min(int(tamanho), self._teto))
+
+    def observar_leitura(self, registros: List[tuple]):
+        """Thread leitora: atualiza o tamanho médio das linhas e o teto imposto pela memória"""
+        if not registros:
+            return
+        amostra = estimar_bytes_registro(registros)
+        with self._lock:
+            # Média móvel; um salto para cima (linhas com LOB) vale imediatamente
+            if self.bytes_por_linha is None or amostra > self.bytes_por_linha:
+                self.bytes_por_linha = amostra
+            else:
+                self.bytes_por_linha = 0.8 * self.bytes_por_linha + 0.2 * amostra
+            self._teto = max(self.lote_min, min(self.lote_max, int(self.alvo_bytes / max(self.bytes_por_linha, 1))))
+            self.tamanho = self._limitar(self.tamanho)
+
+    def observar_escrita(self, linhas: int, segundos: float):
+        """Thread escritora: cresce enquanto a vazão melhora e recua quando ela cai"""
+        if linhas < self.tamanho or segundos <= 0:
+            return  # último lote (parcial) não diz nada sobre o tamanho atual
+        taxa = linhas / segundos
+        with self._lock:
+            if taxa >= self._melhor_taxa:
+                self._melhor_taxa = taxa
+                self._melhor_tamanho = self.tamanho
+                self.tamanho = self._limitar(self.tamanho * 2)
+            elif taxa < 0.7 * self._melhor_taxa and self.tamanho > self._melhor_tamanho:
+                self.tamanho = self._limitar(self._melhor_tamanho)
+
+    def resumo(self) -> str:
+        bytes_linha = f"~{self.bytes_por_linha:.0f} bytes/linha" if self.bytes_por_linha else "sem amostra"
+        return (f"lote de {self.tamanho} linhas ({bytes_linha}, "
+                f"faixa {self.lote_min}-{self._teto}, {self._melhor_taxa:.0f} linhas/s)")
+
+def transferir_em_pipeline(ler_lote, gravar_lote, controle_lote: LoteAdaptativo,
+                           total_registros: int = None, max_lotes: int = PIPELINE_MAX_LOTES) -> int:
+    """Sobrepõe leitura da origem e escrita no destino: uma thread leitora alimenta
+    uma fila limitada (backpressure) consumida pela thread chamadora, dona da conexão de destino"""
+    fila = queue.Queue(maxsize=max_lotes)
+    cancelado = threading.Event()
+    
+    def enfileirar(item) -> bool:
+        while not cancelado.is_set():
+            try:
+                fila.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def leitor():
+        try:
+            while not cancelado.is_set():
+                lote = ler_lote(controle_lote.tamanho)
+                if not lote:
+                    break
+                controle_lote.observar_leitura(lote)
+                if not enfileirar(lote):
+                    return
+            enfileirar(None)
+        except Exception as e:
+            enfileirar(e)
+    
+    thread_leitora = nova_thread(leitor, daemon=True)
+    thread_leitora.start()
+    
+    registros_migrados = 0
+    proximo_log = INTERVALO_LOG_REGISTROS
+    try:
+        while True:
+            lote = fila.get()
+            if lote is None:
+                break
+            if isinstance(lote, Exception):
+                raise lote
+            
+            try:
+                inicio = time.perf_counter()
+                gravar_lote(lote)
+                duracao = time.perf_counter() - inicio
+                controle_lote.observar_escrita(len(lote), duracao)
+                # Bytes estimados pela amostra do lote (o INSERT não informa o volume enviado)
+                registrar_metrica('escrita', duracao, len(lote), len(lote) * (controle_lote.bytes_por_linha or 0))
+            except Exception as insert_error:
+                add_log(f"    ❌ Erro ao inserir lote: {insert_error}", 'error')
+                raise
+            
+            registros_migrados += len(lote)
+            
+            if registros_migrados >= proximo_log:
+                add_log(f"    ✅ {formatar_progresso(registros_migrados, total_registros)}")
+                proximo_log += INTERVALO_LOG_REGISTROS
+    finally:
+        cancelado.set()
+        thread_leitora.join()
+    
+    add_log(f"    📐 Lote adaptativo: {controle_lote.resumo()}")
+    return registros_migrados
+
+def coluna_chave_inteira(tabela: str, schema_origem: str, coluna: str, source_conn, migration_type: str) -> bool:
+    """Verifica se a coluna da chave primária é inteira (adequada para divisão por faixas)"""
+    cursor = source_conn.cursor()
+    try:
+        if migration_type == 'postgres_to_postgres':
+            cursor.execute("""
+                SELECT data_type
+                FROM information_schema.columns 
+                WHERE table_schema = %s AND table_name = %s AND column_name = %s
+            """, (schema_origem, tabela, coluna))
+            row = cursor.fetchone()
+            return bool(row) and row[0] in ('smallint', 'integer', 'bigint')
+        else:
+            cursor.execute("""
+                SELECT data_type, data_scale
+                FROM all_tab_columns 
+                WHERE owner = UPPER(:owner) AND table_name = UPPER(:table_name) 
+                AND column_name = UPPER(:column_name)
+            """, owner=schema_origem, table_name=tabela, column_name=coluna)
+            row = cursor.fetchone()
+            return bool(row) and row[0] in ('NUMBER', 'INTEGER') and row[1] == 0
+    finally:
+        cursor.close()
+
+def chunks_por_chave(tabela: str, schema_origem: str, coluna: str, source_conn,
+                     migration_type: str, num_chunks: int) -> List[Dict]:
+    """Divide a tabela em faixas da chave primária inteira"""
+    coluna_sql = f'"{coluna}"' if migration_type == 'postgres_to_postgres' else coluna
+    cursor = source_conn.cursor()
+    try:
+        cursor.execute(f"SELECT MIN({coluna_sql}), MAX({coluna_sql}) FROM {schema_origem}.{tabela}")
+        minimo, maximo = cursor.fetchone()
+    finally:
+        cursor.close()
+    
+    if minimo is None:
+        return []
+    
+    minimo, maximo = int(minimo), int(maximo)
+    passo = max(1, -(-(maximo - minimo + 1) // num_chunks))
+    chunks = []
+    
+    for inicio in range(minimo, maximo + 1, passo):
+        fim = inicio + passo
+        chunks.append({
+            'descricao': f"{coluna} [{inicio}, {min(fim, maximo + 1)})",
+            'filtro': f"{coluna_sql} >= {inicio} AND {coluna_sql} < {fim}"
+        })
+    
+    return chunks
+
+def chunks_por_ctid(tabela: str, schema_origem: str, source_conn, num_chunks: int) -> List[Dict]:
+    """Divide uma tabela PostgreSQL em faixas de blocos físicos (ctid). Só a partir do PostgreSQL 14
+    a faixa de ctid vira TID Range Scan; antes cada chunk seria uma varredura completa da tabela,
+    então em servidores antigos a cópia fica em fluxo único"""
+    if source_conn.server_version < 140000:
+        add_log(f"    ℹ️  PostgreSQL {source_conn.server_version} na origem: sem TID Range Scan (requer 14+), "
+                f"{schema_origem}.{tabela} sem PK inteira será copiada em fluxo único")
+        return []
+    
+    cursor = source_conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT pg_relation_size(%s::regclass) / current_setting('block_size')::int
+        """, (f"{schema_origem}.{tabela}",))
+        total_blocos = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+    
+    if total_blocos < num_chunks:
+        return []
+    
+    passo = -(-total_blocos // num_chunks)
+    chunks = []
+    
+    for inicio in range(0, total_blocos, passo):
+        fim = inicio + passo
+        condicoes = []
+        if inicio > 0:
+            condicoes.append(f"ctid >= '({inicio},0)'::tid")
+        # O último chunk fica aberto para pegar blocos criados após a medição
+        if fim < total_blocos:
+            condicoes.append(f"ctid < '({fim},0)'::tid")
+        chunks.append({
+            'descricao': f"blocos [{inicio}, {fim if fim < total_blocos else '∞'})",
+            'filtro': ' AND '.join(condicoes)
+        })
+    
+    return chunks
+
+def chunks_por_rowid(tabela: str, schema_origem: str, source_conn, num_chunks: int) -> List[Dict]:
+    """Divide uma tabela Oracle em faixas de ROWID a partir dos extents (como DBMS_PARALLEL_EXECUTE)"""
+    cursor = source_conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT ROWIDTOCHAR(DBMS_ROWID.ROWID_CREATE(1, o.data_object_id, e.relative_fno, e.block_id, 0)),
+                   ROWIDTOCHAR(DBMS_ROWID.ROWID_CREATE(1, o.data_object_id, e.relative_fno,
+                                                       e.block_id + e.blocks - 1, 32767)),
+                   e.blocks
+            FROM dba_extents e
+            JOIN all_objects o ON o.owner = e.owner AND o.object_name = e.segment_name
+                 AND NVL(o.subobject_name, '-') = NVL(e.partition_name, '-')
+            WHERE e.owner = UPPER(:owner) AND e.segment_name = UPPER(:table_name)
+            AND o.object_type LIKE 'TABLE%'
+            ORDER BY o.data_object_id, e.relative_fno, e.block_id
+        """, owner=schema_origem, table_name=tabela)
+        extents = cursor.fetchall()
+    except Exception as e:
+        # Sem acesso a dba_extents: dividir por hash do ROWID
+        add_log(f"    ⚠️  Sem acesso aos extents ({e}), dividindo por ORA_HASH(ROWID)")
+        return [
+            {'descricao': f"hash {i}", 'filtro': f"ORA_HASH(ROWID, {num_chunks - 1}) = {i}"}
+            for i in range(num_chunks)
+        ]
+    finally:
+        cursor.close()
+    
+    if len(extents) < 2:
+        return []
+    
+    total_blocos = sum(blocos for _, _, blocos in extents)
+    alvo = total_blocos / num_chunks
+    grupos = [[]]
+    blocos_grupo = 0
+    
+    for inicio, fim, blocos in extents:
+        if blocos_grupo >= alvo and len(grupos) < num_chunks:
+            grupos.append([])
+            blocos_grupo = 0
+        grupos[-1].append((inicio, fim))
+        blocos_grupo += blocos
+    
+    return [
+        {
+            'descricao': f"{len(faixas)} extent(s)",
+            'filtro': '(' + ' OR '.join(
+                f"ROWID BETWEEN CHARTOROWID('{inicio}') AND CHARTOROWID('{fim}')" for inicio, fim in faixas
+            ) + ')'
+        }
+        for faixas in grupos
+    ]
+
+def planejar_chunks(tabela: str, schema_origem: str, source_conn, migration_type: str, opcoes: Dict) -> List[Dict]:
+    """Decide se a tabela deve ser copiada em chunks paralelos e define as faixas"""
+    if opcoes['chunks_paralelos'] < 2 or not opcoes.get('pool_origem') or not opcoes.get('pool_destino'):
+        return []
+    
+    table_full_name = f"{schema_origem}.{tabela}"
+    estimativa = estimar_tamanho_tabelas([table_full_name], source_conn, migration_type).get(table_full_name, 0)
+    if estimativa <= opcoes['linhas_por_chunk']:
+        return []
+    
+    num_chunks = opcoes['num_chunks'] or -(-estimativa // opcoes['linhas_por_chunk'])
+    num_chunks = min(num_chunks, MAX_CHUNKS)
+    
+    try:
+        chaves = obter_chaves_primarias(tabela, schema_origem, source_conn, migration_type)
+        if len(chaves) == 1 and coluna_chave_inteira(tabela, schema_origem, chaves[0], source_conn, migration_type):
+            chunks = chunks_por_chave(tabela, schema_origem, chaves[0], source_conn, migration_type, num_chunks)
+        elif migration_type == 'postgres_to_postgres':
+            chunks = chunks_por_ctid(tabela, schema_origem, source_conn, num_chunks)
+        else:
+            chunks = chunks_por_rowid(tabela, schema_origem, source_conn, num_chunks)
+    except Exception as e:
+        add_log(f"    ⚠️  Não foi possível dividir a tabela em chunks: {e}")
+        try:
+            source_conn.rollback()
+        except Exception:
+            pass
+        return []
+    
+    if len(chunks) > 1:
+        add_log(f"    🧩 Tabela dividida em {len(chunks)} chunks (~{estimativa} registros estimados)")
+        return chunks
+    return []
+
+def executar_chunks(chunks: List[Dict], migration_type: str, opcoes: Dict, copiar_chunk,
+                    tabela_key: str = None, concluidos: Dict[int, int] = None) -> Optional[int]:
+    """Copia os chunks em paralelo, cada um com seu par de conexões e commit próprio"""
+    checkpoint_journal = journal_atual()
+    concluidos = concluidos or {}
+    fila_chunks = queue.Queue()
+    for indice, chunk in enumerate(chunks, 1):
+        if indice not in concluidos:
+            fila_chunks.put((indice, chunk))
+    
+    if concluidos:
+        add_log(f"    ♻️  {len(concluidos)}/{len(chunks)} chunk(s) já concluídos no checkpoint")
+    
+    progresso = {'registros': sum(concluidos.values()), 'concluidos': len(concluidos), 'falhas': 0}
+    progresso_lock = threading.Lock()
+    
+    def worker_chunk():
+        par = obter_par_conexoes(opcoes)
+        if par is None:
+            return
+        source_conn, dest_conn = par
+        
+        try:
+            while True:
+                try:
+                    indice, chunk = fila_chunks.get_nowait()
+                except queue.Empty:
+                    return
+                
+                try:
+                    dest_conn.autocommit = False
+                    registros = copiar_chunk(source_conn, dest_conn, chunk['filtro'])
+                    with medir_fase('commit'):
+                        dest_conn.commit()
+                    source_conn.rollback()
+                    
+                    if checkpoint_journal and tabela_key:
+                        checkpoint_journal.concluir_chunk(tabela_key, indice, registros)
+                    
+                    with progresso_lock:
+                        progresso['registros'] += registros
+                        progresso['concluidos'] += 1
+                        add_log(f"    🧩 Chunk {indice}/{len(chunks)} ({chunk['descricao']}): {registros} registros "
+                                f"- {progresso['concluidos']}/{len(chunks)} concluídos")
+                except Exception as e:
+                    for conn in (source_conn, dest_conn):
+                        try:
+                            conn.rollback()
+                        except Exception:
+                            pass
+                    with progresso_lock:
+                        progresso['falhas'] += 1
+                    add_log(f"    ❌ Erro no chunk {indice}/{len(chunks)} ({chunk['descricao']}): {e}", 'error')
+        finally:
+            liberar_par_conexoes(source_conn, dest_conn)
+    
+    threads = [
+        nova_thread(worker_chunk, daemon=True)
+        for _ in range(min(opcoes['chunks_paralelos'], fila_chunks.qsize()))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    if progresso['falhas'] or progresso['concluidos'] < len(chunks):
+        add_log(f"    ❌ {len(chunks) - progresso['concluidos']} chunk(s) não foram migrados", 'error')
+        return None
+    
+    return progresso['registros']
+
+def chave_segmentacao(tabela: str, schema_origem: str, source_conn, migration_type: str) -> Optional[str]:
+    """Retorna a coluna da PK inteira usada para carga segmentada com checkpoint"""
+    try:
+        chaves = obter_chaves_primarias(tabela, schema_origem, source_conn, migration_type)
+        if len(chaves) == 1 and coluna_chave_inteira(tabela, schema_origem, chaves[0], source_conn, migration_type):
+            return chaves[0]
+    except Exception as e:
+        add_log(f"    ⚠️  Não foi possível verificar a chave primária para checkpoint: {e}")
+        source_conn.rollback()
+    return None
+
+def proxima_chave_segmento(tabela_origem: str, coluna_sql: str, ultima_chave: Optional[int], tamanho: int,
+                           source_conn, migration_type: str) -> Optional[int]:
+    """Encontra a chave que fecha o próximo segmento (None quando resta menos que um segmento)"""
+    filtro = f"WHERE {coluna_sql} > {ultima_chave}" if ultima_chave is not None else ""
+    if migration_type == 'postgres_to_postgres':
+        consulta = f"SELECT {coluna_sql} FROM {tabela_origem} {filtro} ORDER BY {coluna_sql} OFFSET {tamanho - 1} LIMIT 1"
+    else:
+        consulta = (f"SELECT {coluna_sql} FROM {tabela_origem} {filtro} ORDER BY {coluna_sql} "
+                    f"OFFSET {tamanho - 1} ROWS FETCH NEXT 1 ROWS ONLY")
+    
+    cursor = source_conn.cursor()
+    try:
+        cursor.execute(consulta)
+        row = cursor.fetchone()
+        return int(row[0]) if row else None
+    finally:
+        cursor.close()
+
+def copiar_por_segmentos(tabela_key: str, tabela_origem: str, tabela_destino: str, coluna: str, source_conn,
+                         dest_conn, migration_type: str, ultima_chave: Optional[int], registros_iniciais: int,
+                         opcoes: Dict, copiar_filtro) -> int:
+    """Copia a tabela em segmentos ordenados pela PK, com commit e checkpoint ao fim de cada um"""
+    checkpoint_journal = journal_atual()
+    coluna_sql = f'"{coluna}"' if migration_type == 'postgres_to_postgres' else coluna
+    registros_migrados = registros_iniciais
+    
+    if ultima_chave is not None:
+        # O commit do segmento vem antes do checkpoint: um crash entre os dois deixa no destino linhas
+        # além da última chave registrada. Apagá-las (na transação do primeiro segmento) evita duplicar
+        dest_cursor = dest_conn.cursor()
+        try:
+            dest_cursor.execute(f"DELETE FROM {tabela_destino} WHERE {coluna_sql} > {ultima_chave}")
+            if dest_cursor.rowcount:
+                add_log(f"    🧹 {dest_cursor.rowcount} registro(s) após o checkpoint removidos antes de retomar")
+        finally:
+            dest_cursor.close()
+    
+    while True:
+        limite = proxima_chave_segmento(
+            tabela_origem, coluna_sql, ultima_chave, opcoes['linhas_por_checkpoint'], source_conn, migration_type
+        )
+        
+        condicoes = []
+        if ultima_chave is not None:
+            condicoes.append(f"{coluna_sql} > {ultima_chave}")
+        if limite is not None:
+            condicoes.append(f"{coluna_sql} <= {limite}")
+        
+        registros_migrados += copiar_filtro(source_conn, dest_conn, ' AND '.join(condicoes) or None)
+        with medir_fase('commit'):
+            dest_conn.commit()
+        source_conn.rollback()
+        
+        if limite is None:
+            return registros_migrados
+        
+        ultima_chave = limite
+        if checkpoint_journal:
+            checkpoint_journal.registrar_progresso(tabela_key, ultima_chave, registros_migrados)
+        add_log(f"    💾 Checkpoint: {coluna} até {ultima_chave} ({registros_migrados} registros)")
+
+def carregar_tabela(tabela: str, schema_origem: str, tabela_destino: str, source_conn, dest_conn,
+                    migration_type: str, opcoes: Dict, copiar_filtro) -> Optional[int]:
+    """Escolhe a estratégia de carga (chunks, segmentos com checkpoint ou fluxo único) e retoma do diário"""
+    checkpoint_journal = journal_atual()
+    tabela_key = f"{schema_origem}.{tabela}"
+    # Staging é UNLOGGED: um crash a esvazia, então a carga sempre recomeça do zero
+    pode_retomar = opcoes['retomar'] and not usar_staging(tabela_key, opcoes)
+    estado = checkpoint_journal.obter_tabela(tabela_key) if checkpoint_journal and pode_retomar else None
+    retomando = bool(estado) and (bool(estado['plano_chunks']) or estado['ultima_chave'] is not None)
+    
+    dest_cursor = dest_conn.cursor()
+    try:
+        if retomando:
+            add_log(f"    ♻️  Retomando carga do checkpoint ({estado['registros']} registros já confirmados)")
+        else:
+            # Limpar tabela de destino
+            dest_cursor.execute(f"TRUNCATE TABLE {tabela_destino}")
+    finally:
+        dest_cursor.close()
+    
+    if retomando:
+        chunks = estado['plano_chunks'] or []
+    else:
+        chunks = planejar_chunks(tabela, schema_origem, source_conn, migration_type, opcoes)
+        if checkpoint_journal:
+            checkpoint_journal.iniciar_tabela(tabela_key, chunks)
+    
+    if chunks:
+        # TRUNCATE confirmado antes; cada chunk faz commit próprio
+        dest_conn.commit()
+        concluidos = checkpoint_journal.chunks_concluidos(tabela_key) if retomando else {}
+        return executar_chunks(chunks, migration_type, opcoes, copiar_filtro, tabela_key, concluidos)
+    
+    coluna = None
+    if checkpoint_journal and opcoes['linhas_por_checkpoint'] > 0:
+        coluna = chave_segmentacao(tabela, schema_origem, source_conn, migration_type)
+    
+    if coluna:
+        return copiar_por_segmentos(
+            tabela_key, tabela_key, tabela_destino, coluna, source_conn, dest_conn, migration_type,
+            estado['ultima_chave'] if retomando else None,
+            estado['registros'] if retomando else 0,
+            opcoes, copiar_filtro
+        )
+    
+    return copiar_filtro(source_conn, dest_conn, None)
+
+def carregar_via_staging(schema_destino: str, tabela_destino: str, dest_conn, opcoes: Dict, carregar) -> Optional[int]:
+    """Carrega em uma tabela UNLOGGED de staging, faz SET LOGGED e troca pela tabela viva por rename.
+    Leitores da tabela antiga só ficam bloqueados durante a troca. O SET LOGGED não é gratuito: reescreve
+    a staging inteira no WAL (tempo e volume são logados), mas sem bloquear a tabela viva.
+    Tabelas referenciadas por FKs de outras tabelas ou por views não usam staging (o DROP da antiga
+    falharia): são carregadas direto na tabela viva"""
+    tabela_viva = f"{schema_destino}.{tabela_destino}"
+    nome_staging = f"{tabela_destino[:58]}__stg"
+    nome_antiga = f"{tabela_destino[:58]}__old"
+    tabela_staging = f"{schema_destino}.{nome_staging}"
+    
+    # Com índices pós-carga a staging nasce sem índices; senão herda tudo da tabela viva
+    inclusao = "INCLUDING DEFAULTS INCLUDING CONSTRAINTS" if opcoes['indices_pos_carga'] else "INCLUDING ALL"
+    dest_cursor = dest_conn.cursor()
+    try:
+        dependentes = dependentes_tabela(tabela_viva, dest_cursor)
+        if dependentes:
+            dest_conn.commit()
+            add_log(f"    ⚠️  Staging recusada: {tabela_viva} é referenciada por {', '.join(dependentes)}; "
+                    "carregando direto na tabela")
+            return carregar(tabela_viva)
+        
+        # Sobra de execução anterior pode estar incompleta ou com estrutura antiga
+        dest_cursor.execute(f"DROP TABLE IF EXISTS {tabela_staging}")
+        dest_cursor.execute(f"CREATE UNLOGGED TABLE {tabela_staging} (LIKE {tabela_viva} {inclusao})")
+        dest_conn.commit()
+    finally:
+        dest_cursor.close()
+    add_log(f"    🧪 Carregando na staging UNLOGGED {tabela_staging}")
+    
+    registros = carregar(tabela_staging)
+    if registros is None:
+        return None
+    dest_conn.commit()
+    
+    dest_cursor = dest_conn.cursor()
+    try:
+        inicio = time.perf_counter()
+        dest_cursor.execute("SELECT pg_size_pretty(pg_total_relation_size(%s::regclass))", (tabela_staging,))
+        tamanho_staging = dest_cursor.fetchone()[0]
+        dest_cursor.execute(f"ALTER TABLE {tabela_staging} SET LOGGED")
+        dest_conn.commit()
+        add_log(f"    📝 SET LOGGED ({tamanho_staging} reescritos no WAL) em {time.perf_counter() - inicio:.1f}s")
+        
+        # Troca atômica: o bloqueio exclusivo dura só os renames
+        inicio = time.perf_counter()
+        dest_cursor.execute(f"LOCK TABLE {tabela_viva} IN ACCESS EXCLUSIVE MODE")
+        dest_cursor.execute("""
+            SELECT s.oid::regclass::text, a.attname
+            FROM pg_depend d
+            JOIN pg_class s ON s.oid = d.objid AND s.relkind = 'S'
+            JOIN pg_attribute a ON a.attrelid = d.refobjid AND a.attnum = d.refobjsubid
+            WHERE d.refobjid = %s::regclass AND d.deptype = 'a'
+        """, (tabela_viva,))
+        sequencias_proprias = dest_cursor.fetchall()
+        
+        dest_cursor.execute(f'ALTER TABLE {tabela_viva} RENAME TO "{nome_antiga}"')
+        dest_cursor.execute(f'ALTER TABLE {tabela_staging} RENAME TO "{tabela_destino}"')
+        # Sequências SERIAL pertencem à tabela antiga; sem isso o DROP as levaria junto
+        for sequencia, coluna in sequencias_proprias:
+            dest_cursor.execute(f'ALTER SEQUENCE {sequencia} OWNED BY {tabela_viva}."{coluna}"')
+        dest_cursor.execute(f'DROP TABLE {schema_destino}."{nome_antiga}"')
+        dest_conn.commit()
+        add_log(f"    🔀 Staging trocada pela tabela {tabela_viva} em {time.perf_counter() - inicio:.2f}s")
+        return registros
+    except Exception as e:
+        dest_conn.rollback()
+        add_log(f"    ❌ Erro ao trocar a staging pela tabela viva (dados mantidos em {tabela_staging}): {e}", 'error')
+        return None
+    finally:
+        dest_cursor.close()
+
+def dependentes_tabela(tabela: str, dest_cursor) -> List[str]:
+    """FKs de outras tabelas e views que dependem da tabela (impedem o DROP da tabela antiga na troca)"""
+    dest_cursor.execute("""
+        SELECT 'FK ' || conname || ' de ' || conrelid::regclass::text
+        FROM pg_constraint
+        WHERE contype = 'f' AND confrelid = %s::regclass AND conrelid <> confrelid
+        UNION
+        SELECT 'view ' || v.oid::regclass::text
+        FROM pg_depend d
+        JOIN pg_rewrite r ON r.oid = d.objid
+        JOIN pg_class v ON v.oid = r.ev_class
+        WHERE d.classid = 'pg_rewrite'::regclass AND d.refobjid = %s::regclass AND v.oid <> d.refobjid
+    """, (tabela, tabela))
+    return sorted(row[0] for row in dest_cursor.fetchall())
+
+def usar_staging(table_full_name: str, opcoes: Dict) -> bool:
+    """Staging UNLOGGED só na carga completa (o incremental faz upsert na tabela viva)"""
+    return opcoes['modo_sincronizacao'] == 'completa' and table_full_name in opcoes['tabelas_staging']
+
+def copiar_intervalo_postgres(source_conn, dest_conn, tabela_origem: str, tabela_destino: str,
+                              colunas_str: str, num_colunas: int, filtro: Optional[str],
+                              opcoes: Dict, total_registros=None) -> int:
+    """Copia as linhas da origem (opcionalmente filtradas) para o destino, sem fazer commit"""
+    select_sql = f"SELECT {colunas_str} FROM {tabela_origem}"
+    if filtro:
+        select_sql += f" WHERE {filtro}"
+    
+    source_cursor = None
+    dest_cursor = dest_conn.cursor()
+    
+    try:
+        # Caminho rápido: COPY direto entre os bancos
+        if opcoes['modo_carga'] == 'copy':
+            dest_cursor.execute("SAVEPOINT antes_copy")
+            try:
+                registros = copiar_dados_via_copy(
+                    source_conn, dest_conn, select_sql, tabela_destino, colunas_str,
+                    opcoes['formato_copy'], total_registros
+                )
+                dest_cursor.execute("RELEASE SAVEPOINT antes_copy")
+                return registros
+            except Exception as copy_error:
+                add_log(f"    ⚠️  COPY falhou, usando INSERT em lotes: {copy_error}")
+                dest_cursor.execute("ROLLBACK TO SAVEPOINT antes_copy")
+                source_conn.rollback()
+        
+        # Migrar dados em lotes
+        placeholders = ', '.join(['%s'] * num_colunas)
+        insert_query = f"INSERT INTO {tabela_destino} ({colunas_str}) VALUES %s"
+        
+        # Cursor nomeado (server-side): a origem envia itersize linhas por vez
+        source_cursor = source_conn.cursor(name=f"migracao_{uuid.uuid4().hex}")
+        source_cursor.itersize = opcoes['itersize']
+        source_cursor.execute(select_sql)
+        
+        return transferir_em_pipeline(
+            medido('leitura', lambda tamanho: list(islice(source_cursor, tamanho))),
+            # Um INSERT multi-VALUES por lote: o tamanho ajustado pelo LoteAdaptativo vira um único round-trip
+            lambda registros: execute_values(dest_cursor, insert_query, registros,
+                                             template=f"({placeholders})", page_size=len(registros)),
+            LoteAdaptativo(opcoes['lote_min'], opcoes['lote_max'], opcoes['lote_bytes']),
+            total_registros
+        )
+        
+    finally:
+        if source_cursor:
+            source_cursor.close()
+        dest_cursor.close()
+
+def migrar_dados_postgres_para_postgres(tabela: str, schema_origem: str, schema_destino: str,
+                                      source_conn, dest_conn, opcoes: Dict = None) -> bool:
+    """Migra dados de PostgreSQL para PostgreSQL de forma transacional"""
+    opcoes = {**OPCOES_MIGRACAO_PADRAO, **(opcoes or {})}
+    source_cursor = None
+    dest_cursor = None
     
     try:
         add_log(f"    📦 Migrando dados da tabela: {schema_origem}.{tabela}")
@@ -721,6 +2625,7 @@ def migrar_dados_postgres_para_postgres(tabela: str, schema_origem: str, schema_
             return False
         
         # Obter colunas
+        inicio_catalogo = time.perf_counter()
         source_cursor.execute("""
             SELECT column_name 
             FROM information_schema.columns 
@@ -731,45 +2636,36 @@ def migrar_dados_postgres_para_postgres(tabela: str, schema_origem: str, schema_
         colunas = [row[0] for row in source_cursor.fetchall()]
         colunas_str = ', '.join([f'"{col}"' for col in colunas])
         
-        # Contar registros
-        source_cursor.execute(f"SELECT COUNT(*) FROM {schema_origem}.{tabela}")
-        total_registros = source_cursor.fetchone()[0]
+        # Total pelo catálogo; COUNT(*) (varredura completa) apenas quando pedido
+        total_registros = contar_registros(tabela, schema_origem, source_conn, 'postgres_to_postgres', opcoes)
+        registrar_metrica('catalogo', time.perf_counter() - inicio_catalogo)
         
-        if total_registros == 0:
+        if total_registros == 0 and opcoes['contagem_exata']:
             add_log(f"    ℹ️  Nenhum registro para migrar")
             dest_conn.commit()
             return True
         
-        add_log(f"    📊 Total de registros: {total_registros}")
+        tabela_origem = f"{schema_origem}.{tabela}"
+        tabela_destino = f"{schema_destino}.{tabela}"
         
-        # Limpar tabela de destino
-        dest_cursor.execute(f"TRUNCATE TABLE {schema_destino}.{tabela}")
-        
-        # Migrar dados em lotes
-        placeholders = ', '.join(['%s'] * len(colunas))
-        insert_query = f"INSERT INTO {schema_destino}.{tabela} ({colunas_str}) VALUES ({placeholders})"
-        
-        source_cursor.execute(f"SELECT {colunas_str} FROM {schema_origem}.{tabela}")
-        
-        lote_size = 1000
-        registros_migrados = 0
-        registros = source_cursor.fetchmany(lote_size)
+        def carregar(destino: str) -> Optional[int]:
+            return carregar_tabela(
+                tabela, schema_origem, destino, source_conn, dest_conn, 'postgres_to_postgres', opcoes,
+                lambda conn_origem, conn_destino, filtro: copiar_intervalo_postgres(
+                    conn_origem, conn_destino, tabela_origem, destino,
+                    colunas_str, len(colunas), filtro, opcoes, total_registros
+                )
+            )
         
-        while registros:
-            try:
-                dest_cursor.executemany(insert_query, registros)
-                registros_migrados += len(registros)
-                
-                if registros_migrados % 5000 == 0:
-                    add_log(f"    ✅ {registros_migrados}/{total_registros} registros migrados")
-                
-                registros = source_cursor.fetchmany(lote_size)
-            except Exception as insert_error:
-                add_log(f"    ❌ Erro ao inserir lote: {insert_error}", 'error')
-                dest_conn.rollback()
-                return False
+        if usar_staging(tabela_origem, opcoes):
+            registros_migrados = carregar_via_staging(schema_destino, tabela, dest_conn, opcoes, carregar)
+        else:
+            registros_migrados = carregar(tabela_destino)
+        if registros_migrados is None:
+            return False
         
-        dest_conn.commit()
+        with medir_fase('commit'):
+            dest_conn.commit()
         add_log(f"    ✅ Todos os {registros_migrados} registros migrados com sucesso", 'success')
         return True
         
@@ -784,397 +2680,1322 @@ def migrar_dados_postgres_para_postgres(tabela: str, schema_origem: str, schema_
         if dest_cursor:
             dest_cursor.close()
 
-def migrar_dados_oracle_para_postgres(tabela: str, schema_origem: str, schema_destino: str, 
-                                    source_conn, dest_conn) -> bool:
+# Tipos LOB buscados inline e o tipo equivalente sem localizador
+TIPOS_LOB_INLINE = {
+    oracledb.DB_TYPE_CLOB: oracledb.DB_TYPE_LONG,
+    oracledb.DB_TYPE_NCLOB: oracledb.DB_TYPE_LONG_NVARCHAR,
+    oracledb.DB_TYPE_BLOB: oracledb.DB_TYPE_LONG_RAW,
+}
+
+def buscar_lobs_inline(cursor, name, default_type, size, precision, scale):
+    """Output type handler: busca CLOB/NCLOB/BLOB como str/bytes junto com a linha"""
+    tipo_inline = TIPOS_LOB_INLINE.get(default_type)
+    if tipo_inline is not None:
+        return cursor.var(tipo_inline, arraysize=cursor.arraysize)
+    return None
+
+def ler_lob(valor):
+    """Lê um LOB restante (ex.: BFILE); falhas de leitura viram NULL"""
+    if valor is None:
+        return None
+    try:
+        return valor.read()
+    except Exception:
+        return None
+
+def plano_conversao_oracle(descricao) -> List[Tuple[int, any]]:
+    """Monta, uma vez por consulta, a lista (índice, conversor) das colunas que precisam de conversão"""
+    conversores = []
+    for indice, coluna in enumerate(descricao):
+        # CLOB/NCLOB/BLOB já vêm inline (buscar_lobs_inline); BFILE continua como localizador
+        if coluna[1] == oracledb.DB_TYPE_BFILE:
+            conversores.append((indice, ler_lob))
+    return conversores
+
+def converter_lote(registros: List[tuple], conversores: List[Tuple[int, any]]) -> List[tuple]:
+    """Aplica o plano de conversão a um lote; sem conversores o lote segue intacto"""
+    if not conversores:
+        return registros
+    
+    convertidos = []
+    for registro in registros:
+        registro = list(registro)
+        for indice, conversor in conversores:
+            registro[indice] = conversor(registro[indice])
+        convertidos.append(tuple(registro))
+    return convertidos
+
+def copiar_intervalo_oracle(source_conn, dest_conn, tabela_origem: str, tabela_destino: str,
+                            colunas_str: str, colunas_oracle_str: str, num_colunas: int,
+                            filtro: Optional[str], opcoes: Dict, total_registros=None) -> int:
+    """Copia as linhas do Oracle (opcionalmente filtradas) para o PostgreSQL, sem fazer commit"""
+    select_sql = f"SELECT {colunas_oracle_str} FROM {tabela_origem}"
+    if filtro:
+        select_sql += f" WHERE {filtro}"
+    
+    source_cursor = source_conn.cursor()
+    # Buscar em blocos grandes para manter a memória estável em tabelas grandes
+    source_cursor.arraysize = opcoes['oracle_arraysize']
+    source_cursor.prefetchrows = opcoes['oracle_arraysize'] + 1
+    dest_cursor = dest_conn.cursor()
+    
+    try:
+        placeholders = ', '.join(['%s'] * num_colunas)
+        insert_query = f"INSERT INTO {tabela_destino} ({colunas_str}) VALUES %s"
+        
+        # CLOB/BLOB chegam como str/bytes, sem um round-trip por célula
+        source_cursor.outputtypehandler = buscar_lobs_inline
+        source_cursor.execute(select_sql)
+        conversores = plano_conversao_oracle(source_cursor.description)
+        
+        # A conversão roda na thread leitora, em paralelo com a escrita no destino
+        ler_origem = medido('leitura', source_cursor.fetchmany)
+        converter = medido('conversao', converter_lote)
+        return transferir_em_pipeline(
+            lambda tamanho: converter(ler_origem(tamanho), conversores),
+            # Um INSERT multi-VALUES por lote: o tamanho ajustado pelo LoteAdaptativo vira um único round-trip
+            lambda registros: execute_values(dest_cursor, insert_query, registros,
+                                             template=f"({placeholders})", page_size=len(registros)),
+            LoteAdaptativo(opcoes['lote_min'], opcoes['lote_max'], opcoes['lote_bytes']),
+            total_registros
+        )
+        
+    finally:
+        source_cursor.close()
+        dest_cursor.close()
+
+def migrar_dados_oracle_para_postgres(tabela: str, schema_origem: str, schema_destino: str,
+                                    source_conn, dest_conn, opcoes: Dict = None) -> bool:
     """Migra dados de Oracle para PostgreSQL de forma transacional"""
+    opcoes = {**OPCOES_MIGRACAO_PADRAO, **(opcoes or {})}
     source_cursor = None
     dest_cursor = None
     
     try:
-        add_log(f"    📦 Migrando dados da tabela Oracle: {schema_origem}.{tabela}")
-        
-        # Iniciar transação
+        add_log(f"    📦 Migrando dados da tabela Oracle: {schema_origem}.{tabela}")
+        
+        # Iniciar transação
+        dest_conn.autocommit = False
+        source_cursor = source_conn.cursor()
+        dest_cursor = dest_conn.cursor()
+        
+        # Verificar se a tabela existe no destino
+        dest_cursor.execute("""
+            SELECT EXISTS (
+                SELECT 1 FROM information_schema.tables 
+                WHERE table_schema = %s AND table_name = %s
+            )
+        """, (schema_destino, tabela.lower()))
+        
+        if not dest_cursor.fetchone()[0]:
+            add_log(f"    ⏭️  Tabela {schema_destino}.{tabela} não existe no destino", 'error')
+            return False
+        
+        # Obter colunas
+        inicio_catalogo = time.perf_counter()
+        source_cursor.execute("""
+            SELECT column_name 
+            FROM all_tab_columns 
+            WHERE owner = UPPER(:owner) AND table_name = UPPER(:table_name) 
+            ORDER BY column_id
+        """, owner=schema_origem, table_name=tabela)
+        
+        colunas = [row[0] for row in source_cursor.fetchall()]
+        colunas_str = ', '.join([f'"{col.lower()}"' for col in colunas])
+        colunas_oracle_str = ', '.join([f'"{col}"' for col in colunas])
+        
+        # Total pelo catálogo; COUNT(*) (varredura completa) apenas quando pedido
+        total_registros = contar_registros(tabela, schema_origem, source_conn, 'oracle_to_postgres', opcoes)
+        registrar_metrica('catalogo', time.perf_counter() - inicio_catalogo)
+        
+        if total_registros == 0 and opcoes['contagem_exata']:
+            add_log(f"    ℹ️  Nenhum registro para migrar")
+            dest_conn.commit()
+            return True
+        
+        tabela_origem = f"{schema_origem}.{tabela}"
+        tabela_destino = f"{schema_destino}.{tabela.lower()}"
+        
+        def carregar(destino: str) -> Optional[int]:
+            return carregar_tabela(
+                tabela, schema_origem, destino, source_conn, dest_conn, 'oracle_to_postgres', opcoes,
+                lambda conn_origem, conn_destino, filtro: copiar_intervalo_oracle(
+                    conn_origem, conn_destino, tabela_origem, destino,
+                    colunas_str, colunas_oracle_str, len(colunas), filtro, opcoes, total_registros
+                )
+            )
+        
+        if usar_staging(tabela_origem, opcoes):
+            registros_migrados = carregar_via_staging(schema_destino, tabela.lower(), dest_conn, opcoes, carregar)
+        else:
+            registros_migrados = carregar(tabela_destino)
+        if registros_migrados is None:
+            return False
+        
+        with medir_fase('commit'):
+            dest_conn.commit()
+        add_log(f"    ✅ Todos os {registros_migrados} registros migrados com sucesso", 'success')
+        return True
+        
+    except Exception as e:
+        add_log(f"❌ Erro ao migrar dados da tabela Oracle {tabela}: {str(e)}", 'error')
+        if dest_conn:
+            dest_conn.rollback()
+        return False
+    finally:
+        if source_cursor:
+            source_cursor.close()
+        if dest_cursor:
+            dest_cursor.close()
+
+def gerar_create_table_postgres(info: Dict, schema_destino: str, tabela: str) -> str:
+    """Gera o CREATE TABLE de uma tabela PostgreSQL a partir do snapshot"""
+    colunas_def = []
+    
+    for coluna in info['colunas']:
+        # format_type já traz tamanho/precisão (VARCHAR(n), NUMERIC(p, s), arrays...)
+        col_def = f'"{coluna["nome"]}" {coluna["tipo"]}'
+        
+        if not coluna['nullable']:
+            col_def += ' NOT NULL'
+        
+        sequencia = sequencia_do_default(coluna['default'], 'postgres_to_postgres')
+        if sequencia:
+            # A sequência é criada no schema de destino (gerar_comandos_sequencias)
+            destino = sequencia_destino(sequencia, schema_destino, 'postgres_to_postgres')
+            col_def += f" DEFAULT nextval('{destino}'::regclass)"
+        elif coluna['default']:
+            col_def += f' DEFAULT {coluna["default"]}'
+        
+        colunas_def.append(col_def)
+    
+    return f'CREATE TABLE IF NOT EXISTS {schema_destino}.{tabela} ({", ".join(colunas_def)})'
+
+def gerar_create_table_oracle(info: Dict, schema_destino: str, tabela_destino: str) -> str:
+    """Gera o CREATE TABLE PostgreSQL de uma tabela Oracle a partir do snapshot"""
+    colunas_def = []
+    
+    for coluna in info['colunas']:
+        nome = coluna['nome'].lower()
+        tipo_oracle = coluna['tipo']
+        data_length, data_precision, data_scale = coluna['tamanho'], coluna['precisao'], coluna['escala']
+        
+        tipo_base = tipo_oracle.split('(')[0] if '(' in tipo_oracle else tipo_oracle
+        pg_tipo = COMPREHENSIVE_TYPE_MAPPING.get(tipo_base.upper(), 'TEXT')
+        
+        # Ajustar tipo com precisão
+        if pg_tipo in ['VARCHAR', 'CHAR'] and data_length:
+            pg_tipo = f"{pg_tipo}({data_length})"
+        elif pg_tipo == 'NUMERIC' and data_precision is not None:
+            if data_scale is not None and data_scale > 0:
+                pg_tipo = f"NUMERIC({data_precision}, {data_scale})"
+            elif data_precision is not None:
+                pg_tipo = f"NUMERIC({data_precision})"
+        
+        col_def = f'"{nome}" {pg_tipo}'
+        
+        if not coluna['nullable']:
+            col_def += ' NOT NULL'
+        
+        sequencia = sequencia_do_default(coluna['default'], 'oracle_to_postgres')
+        if sequencia:
+            destino = sequencia_destino(sequencia, schema_destino, 'oracle_to_postgres')
+            col_def += f" DEFAULT nextval('{destino}'::regclass)"
+        elif coluna['default'] is not None:
+            default_value = str(coluna['default']).strip()
+            if default_value.upper() not in ['NULL', '']:
+                col_def += f' DEFAULT {default_value}'
+        
+        colunas_def.append(col_def)
+    
+    return f'CREATE TABLE IF NOT EXISTS {schema_destino}.{tabela_destino} ({", ".join(colunas_def)})'
+
+def gerar_comandos_sequencias(snapshot: SnapshotEsquema, schema_origem: str, tabela: str,
+                              schema_destino: str, migration_type: str) -> List[str]:
+    """CREATE SEQUENCE das sequências usadas nos DEFAULTs da tabela (valores acertados após a carga)"""
+    return [
+        f"CREATE SEQUENCE IF NOT EXISTS {sequencia_destino(sequencia, schema_destino, migration_type)}"
+        for _, sequencia in snapshot.sequencias(schema_origem, tabela)
+    ]
+
+def criar_tabela_postgres_para_postgres(tabela: str, schema_origem: str, schema_destino: str, 
+                                      source_conn, dest_conn, snapshot: SnapshotEsquema = None) -> bool:
+    """Cria tabela PostgreSQL para PostgreSQL"""
+    dest_cursor = None
+    
+    try:
+        add_log(f"\n🔄 Processando tabela: {schema_origem}.{tabela}")
+        
+        if snapshot is None:
+            snapshot = SnapshotEsquema.carregar([f"{schema_origem}.{tabela}"], source_conn, 'postgres_to_postgres')
+        
+        # Verificar se a tabela existe na origem
+        info = snapshot.tabela(schema_origem, tabela)
+        if not info:
+            add_log(f"⏭️  Tabela {schema_origem}.{tabela} não existe na origem")
+            return False
+        
+        # Criar sequências dos DEFAULTs e a tabela
+        create_sql = ';\n'.join(
+            gerar_comandos_sequencias(snapshot, schema_origem, tabela, schema_destino, 'postgres_to_postgres')
+            + [gerar_create_table_postgres(info, schema_destino, tabela)]
+        )
+        dest_cursor = dest_conn.cursor()
+        
+        try:
+            dest_cursor.execute(create_sql)
+            dest_conn.commit()
+            add_log(f"✅ Tabela {schema_destino}.{tabela} criada com sucesso!", 'success')
+            return True
+        except Exception as create_error:
+            add_log(f"❌ Erro ao criar tabela: {create_error}", 'error')
+            return False
+        
+    except Exception as e:
+        add_log(f"❌ Erro ao processar tabela {tabela}: {e}", 'error')
+        return False
+    finally:
+        if dest_cursor:
+            dest_cursor.close()
+
+def criar_tabela_oracle_para_postgres(tabela: str, schema_origem: str, schema_destino: str, 
+                                    source_conn, dest_conn, snapshot: SnapshotEsquema = None) -> bool:
+    """Cria tabela Oracle para PostgreSQL"""
+    dest_cursor = None
+    
+    try:
+        add_log(f"\n🔄 Processando tabela Oracle: {schema_origem}.{tabela}")
+        
+        if snapshot is None:
+            snapshot = SnapshotEsquema.carregar([f"{schema_origem}.{tabela}"], source_conn, 'oracle_to_postgres')
+        
+        info = snapshot.tabela(schema_origem, tabela)
+        if not info:
+            add_log(f"❌ Nenhuma coluna encontrada para {tabela}", 'error')
+            return False
+        
+        # Criar tabela
+        tabela_destino = tabela.lower()
+        create_sql = ';\n'.join(
+            gerar_comandos_sequencias(snapshot, schema_origem, tabela, schema_destino, 'oracle_to_postgres')
+            + [gerar_create_table_oracle(info, schema_destino, tabela_destino)]
+        )
+        dest_cursor = dest_conn.cursor()
+        
+        try:
+            dest_cursor.execute(create_sql)
+            dest_conn.commit()
+            add_log(f"✅ Tabela {schema_destino}.{tabela_destino} criada com sucesso!", 'success')
+            return True
+        except Exception as create_error:
+            add_log(f"❌ Erro ao criar tabela: {create_error}", 'error')
+            return False
+        
+    except Exception as e:
+        add_log(f"❌ Erro ao processar tabela Oracle {tabela}: {str(e)}", 'error')
+        return False
+    finally:
+        if dest_cursor:
+            dest_cursor.close()
+
+def gerar_script_esquema(selected_tables: List[str], snapshot: SnapshotEsquema, schema_destino: str,
+                         migration_type: str) -> List[Tuple[str, List[str]]]:
+    """Gera antecipadamente o DDL (sequências + CREATE TABLE) de todas as tabelas selecionadas"""
+    script = []
+    
+    for table_full_name in selected_tables:
+        schema_origem, tabela = table_full_name.split('.', 1)
+        info = snapshot.tabela(schema_origem, tabela)
+        if not info:
+            script.append((table_full_name, []))
+            continue
+        
+        # Sequência compartilhada vai em todas as tabelas que a usam (CREATE SEQUENCE IF NOT EXISTS):
+        # se a primeira tabela falhar, o rollback do savepoint dela não leva a sequência das demais
+        comandos = gerar_comandos_sequencias(snapshot, schema_origem, tabela, schema_destino, migration_type)
+        if migration_type == 'postgres_to_postgres':
+            comandos.append(gerar_create_table_postgres(info, schema_destino, tabela))
+        else:
+            comandos.append(gerar_create_table_oracle(info, schema_destino, tabela.lower()))
+        
+        script.append((table_full_name, comandos))
+    
+    return script
+
+def formatar_script_esquema(script: List[Tuple[str, List[str]]]) -> str:
+    """Monta o script SQL do modo dry-run (o que seria aplicado em uma única transação)"""
+    linhas = ["BEGIN;", ""]
+    for table_full_name, comandos in script:
+        linhas.append(f"-- {table_full_name}")
+        if not comandos:
+            linhas.append("-- (tabela não encontrada na origem)")
+        linhas.extend(f"{comando};" for comando in comandos)
+        linhas.append("")
+    linhas.append("COMMIT;")
+    return '\n'.join(linhas) + '\n'
+
+def aplicar_script_esquema(script: List[Tuple[str, List[str]]], dest_conn) -> Dict[str, Optional[str]]:
+    """Aplica o DDL em uma transação só: lotes sob savepoint e, se um lote falhar,
+    tabela a tabela para isolar a que falhou. Retorna tabela → erro (None = criada)"""
+    resultados = {}
+    dest_conn.autocommit = False
+    cursor = dest_conn.cursor()
+    
+    try:
+        for inicio in range(0, len(script), DDL_TABELAS_POR_LOTE):
+            lote = script[inicio:inicio + DDL_TABELAS_POR_LOTE]
+            for table_full_name, comandos in lote:
+                if not comandos:
+                    resultados[table_full_name] = "tabela não encontrada na origem"
+            lote = [(nome, comandos) for nome, comandos in lote if comandos]
+            if not lote:
+                continue
+            
+            # Um único round-trip para o lote inteiro
+            cursor.execute("SAVEPOINT ddl_lote")
+            try:
+                cursor.execute(';\n'.join(comando for _, comandos in lote for comando in comandos))
+                cursor.execute("RELEASE SAVEPOINT ddl_lote")
+                resultados.update({nome: None for nome, _ in lote})
+                continue
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT ddl_lote")
+            
+            for table_full_name, comandos in lote:
+                cursor.execute("SAVEPOINT ddl_tabela")
+                try:
+                    cursor.execute(';\n'.join(comandos))
+                    cursor.execute("RELEASE SAVEPOINT ddl_tabela")
+                    resultados[table_full_name] = None
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT ddl_tabela")
+                    resultados[table_full_name] = str(e).strip()
+        
+        dest_conn.commit()
+        return resultados
+    except Exception:
+        dest_conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def criar_esquema_em_lote(selected_tables: List[str], snapshot: SnapshotEsquema, schema_destino: str,
+                          dest_conn, migration_type: str) -> Dict[str, Optional[str]]:
+    """Cria todas as tabelas selecionadas antes da carga, com um único commit no schema de destino"""
+    inicio = time.perf_counter()
+    script = gerar_script_esquema(selected_tables, snapshot, schema_destino, migration_type)
+    resultados = aplicar_script_esquema(script, dest_conn)
+    
+    criadas = sum(1 for erro in resultados.values() if erro is None)
+    add_log(f"🏗️  DDL em lote: {criadas}/{len(script)} tabela(s) criadas em {time.perf_counter() - inicio:.1f}s (1 commit)")
+    for table_full_name, erro in resultados.items():
+        if erro:
+            add_log(f"❌ Erro ao criar tabela {table_full_name}: {erro}", 'error')
+    return resultados
+
+def gerar_script_esquema_dry_run(migration_type: str, source_params: Dict, dest_params: Dict,
+                                 selected_tables: List[str]) -> str:
+    """Lê o catálogo da origem e devolve o script DDL sem tocar no destino"""
+    chave = obter_pool(tipo_origem(migration_type), source_params)
+    source_conn = obter_conexao(chave) if chave else None
+    if source_conn is None:
+        raise RuntimeError("Não foi possível conectar à origem")
+    try:
+        snapshot = SnapshotEsquema.carregar(selected_tables, source_conn, migration_type)
+        source_conn.rollback()
+    finally:
+        liberar_conexao(source_conn)
+    return formatar_script_esquema(
+        gerar_script_esquema(selected_tables, snapshot, dest_params['schema'], migration_type)
+    )
+
+def gerar_ddl_pos_carga(info: Dict, tabela_destino: str, schema_destino: str,
+                        migration_type: str, tabelas_destino: set) -> Tuple[List[Tuple], List[Tuple]]:
+    """Gera (tabela, nome, SQL) das restrições/índices da tabela: primeiro PK/UNIQUE/CHECK/índices, depois as FKs"""
+    # Mesma forma (sem aspas) usada no CREATE TABLE; no catálogo o nome fica em minúsculas
+    tabela_sql = f'{schema_destino}.{tabela_destino}'
+    tabela_pg = tabela_destino.lower()
+    oracle = migration_type == 'oracle_to_postgres'
+    
+    def nome_pg(nome: str) -> str:
+        return nome.lower() if oracle else nome
+    
+    def lista_colunas(colunas: List[str]) -> str:
+        return ', '.join(f'"{nome_pg(coluna)}"' for coluna in colunas)
+    
+    estrutura, chaves_estrangeiras = [], []
+    
+    for restricao in info['restricoes']:
+        nome = nome_pg(restricao['nome'])
+        prefixo = f'ALTER TABLE {tabela_sql} ADD CONSTRAINT "{nome}" '
+        
+        if restricao['tipo'] in ('p', 'u'):
+            tipo = 'PRIMARY KEY' if restricao['tipo'] == 'p' else 'UNIQUE'
+            definicao = restricao['definicao'] if not oracle else f"{tipo} ({lista_colunas(restricao['colunas'])})"
+            estrutura.append((tabela_pg, nome, prefixo + definicao))
+        
+        elif restricao['tipo'] == 'c':
+            definicao = restricao['definicao']
+            if oracle:
+                # Identificadores entre aspas do Oracle (maiúsculos) viram os nomes em minúsculas do destino
+                definicao = 'CHECK (' + re.sub(r'"([A-Z0-9_$#]+)"', lambda m: f'"{m.group(1).lower()}"', definicao) + ')'
+            estrutura.append((tabela_pg, nome, prefixo + definicao))
+        
+        elif restricao['tipo'] == 'f':
+            referenciada = restricao['tabela_referenciada']
+            tabela_referenciada = nome_pg(referenciada[1]) if referenciada else None
+            if not referenciada or tabela_referenciada not in tabelas_destino:
+                add_log(f"    ⏭️  FK {nome} ignorada: tabela referenciada fora da migração")
+                continue
+            referencia = f'REFERENCES {schema_destino}.{tabela_referenciada}'
+            if oracle:
+                definicao = (f"FOREIGN KEY ({lista_colunas(restricao['colunas'])}) "
+                             f"{referencia} ({lista_colunas(restricao['colunas_referenciadas'])})")
+            else:
+                # Mantém ON DELETE/ON UPDATE e troca apenas a tabela referenciada
+                definicao = re.sub(r'REFERENCES [^(]+\(', f'{referencia}(', restricao['definicao'], count=1)
+            chaves_estrangeiras.append((tabela_pg, nome, prefixo + definicao))
+    
+    for indice in info['indices']:
+        nome = nome_pg(indice['nome'])
+        if oracle:
+            unico = 'UNIQUE ' if indice['unico'] else ''
+            estrutura.append((tabela_pg, nome, f'CREATE {unico}INDEX IF NOT EXISTS "{nome}" ON {tabela_sql} '
+                                               f'({lista_colunas(indice["colunas"])})'))
+        else:
+            definicao = re.sub(r' ON (ONLY )?\S+ USING ', f' ON {tabela_sql} USING ', indice['definicao'], count=1)
+            estrutura.append((tabela_pg, nome, definicao.replace(' INDEX ', ' INDEX IF NOT EXISTS ', 1)))
+    
+    return estrutura, chaves_estrangeiras
+
+def existentes_pos_carga(cursor, schema_destino: str, indices: bool = True) -> set:
+    """(tabela, nome) das restrições (e índices) já presentes no schema de destino. Nomes de restrição
+    podem se repetir entre tabelas, então a comparação é sempre com a tabela alvo"""
+    consulta = """
+        SELECT c.relname, con.conname
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        WHERE con.connamespace = %s::regnamespace
+    """
+    parametros = (schema_destino,)
+    if indices:
+        consulta += " UNION ALL SELECT tablename, indexname FROM pg_indexes WHERE schemaname = %s"
+        parametros += (schema_destino,)
+    cursor.execute(consulta, parametros)
+    return {(tabela, nome) for tabela, nome in cursor.fetchall()}
+
+def executar_ddl_pos_carga(comandos: List[Tuple[str, str, str]], dest_conn, existentes: set) -> Tuple[int, int]:
+    """Executa cada comando em autocommit (uma falha não desfaz os demais)"""
+    criados = falhas = 0
+    cursor = dest_conn.cursor()
+    try:
+        for tabela, nome, comando in comandos:
+            if (tabela, nome) in existentes:
+                continue
+            inicio = time.perf_counter()
+            try:
+                cursor.execute(comando)
+                criados += 1
+                add_log(f"    🔑 {nome} criado em {time.perf_counter() - inicio:.1f}s")
+            except Exception as e:
+                falhas += 1
+                add_log(f"    ❌ Erro ao criar {nome}: {str(e).strip()}", 'error')
+    finally:
+        cursor.close()
+    return criados, falhas
+
+def construir_indices_pos_carga(tabelas: List[str], snapshot: SnapshotEsquema, schema_destino: str,
+                                migration_type: str, opcoes: Dict):
+    """Cria PKs, UNIQUE, CHECK e índices depois da carga, em paralelo entre tabelas; as FKs por último"""
+    if not tabelas or snapshot is None:
+        return
+    
+    add_log(f"🔑 Criando chaves, índices e restrições de {len(tabelas)} tabela(s) após a carga")
+    inicio = time.perf_counter()
+    
+    tabelas_destino = {
+        (t.split('.', 1)[1].lower() if migration_type == 'oracle_to_postgres' else t.split('.', 1)[1])
+        for t in tabelas
+    }
+    trabalhos, chaves_estrangeiras = [], []
+    for table_full_name in tabelas:
+        schema_origem, tabela = table_full_name.split('.', 1)
+        info = snapshot.tabela(schema_origem, tabela)
+        if not info:
+            continue
+        tabela_destino = tabela.lower() if migration_type == 'oracle_to_postgres' else tabela
+        estrutura, fks = gerar_ddl_pos_carga(info, tabela_destino, schema_destino, migration_type, tabelas_destino)
+        if estrutura:
+            trabalhos.append(estrutura)
+        chaves_estrangeiras.extend(fks)
+    
+    fila = queue.Queue()
+    for estrutura in trabalhos:
+        fila.put(estrutura)
+    totais = {'criados': 0, 'falhas': 0}
+    totais_lock = threading.Lock()
+    
+    def worker_indices():
+        dest_conn = obter_conexao(opcoes['pool_destino'])
+        if dest_conn is None:
+            return
+        try:
+            dest_conn.autocommit = True
+            cursor = dest_conn.cursor()
+            # Ordenação de índices usa maintenance_work_mem; vale só para esta sessão
+            cursor.execute("SET maintenance_work_mem = %s", (opcoes['maintenance_work_mem'],))
+            existentes = existentes_pos_carga(cursor, schema_destino)
+            
+            while True:
+                try:
+                    comandos = fila.get_nowait()
+                except queue.Empty:
+                    break
+                criados, falhas = executar_ddl_pos_carga(comandos, dest_conn, existentes)
+                with totais_lock:
+                    totais['criados'] += criados
+                    totais['falhas'] += falhas
+            
+            cursor.execute("RESET maintenance_work_mem")
+            cursor.close()
+        except Exception as e:
+            add_log(f"❌ Erro na criação de índices: {e}", 'error')
+        finally:
+            liberar_conexao(dest_conn)
+    
+    num_workers = max(1, min(opcoes['workers'], len(trabalhos)))
+    threads = [nova_thread(worker_indices, daemon=True, name=f"indices-{i + 1}") for i in range(num_workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # FKs em série: ADD FOREIGN KEY bloqueia também a tabela referenciada
+    if chaves_estrangeiras:
+        dest_conn = obter_conexao(opcoes['pool_destino'])
+        if dest_conn is not None:
+            try:
+                dest_conn.autocommit = True
+                cursor = dest_conn.cursor()
+                existentes = existentes_pos_carga(cursor, schema_destino, indices=False)
+                cursor.close()
+                criados, falhas = executar_ddl_pos_carga(chaves_estrangeiras, dest_conn, existentes)
+                totais['criados'] += criados
+                totais['falhas'] += falhas
+            finally:
+                liberar_conexao(dest_conn)
+    
+    add_log(f"🔑 {totais['criados']} chave(s)/índice(s) criados, {totais['falhas']} falha(s) "
+            f"em {time.perf_counter() - inicio:.1f}s", 'success' if not totais['falhas'] else 'error')
+
+def mapear_sequencias_oracle(tabelas: List[str], snapshot: SnapshotEsquema, cursor) -> List[Dict]:
+    """Associa sequências Oracle (all_sequences) às colunas: IDENTITY, DEFAULT seq.NEXTVAL
+    ou convenção de nome (<TABELA>_SEQ, SEQ_<TABELA>...) para PKs de uma coluna"""
+    owners = sorted({t.split('.', 1)[0].upper() for t in tabelas})
+    binds = ', '.join(f":o{i}" for i in range(len(owners)))
+    parametros = {f"o{i}": owner for i, owner in enumerate(owners)}
+    
+    cursor.execute(f"""
+        SELECT sequence_owner, sequence_name, last_number
+        FROM all_sequences
+        WHERE sequence_owner IN ({binds})
+    """, parametros)
+    ultimos = {(owner, nome): ultimo for owner, nome, ultimo in cursor.fetchall()}
+    
+    identidades = {}
+    try:
+        cursor.execute(f"""
+            SELECT owner, table_name, column_name, sequence_name
+            FROM all_tab_identity_cols
+            WHERE owner IN ({binds})
+        """, parametros)
+        identidades = {(owner, tabela): (coluna, sequencia) for owner, tabela, coluna, sequencia in cursor.fetchall()}
+    except Exception:
+        pass  # Oracle anterior ao 12c: sem colunas IDENTITY
+    
+    alvos = []
+    for table_full_name in tabelas:
+        owner, tabela = (parte.upper() for parte in table_full_name.split('.', 1))
+        mapeadas = set()
+        
+        if (owner, tabela) in identidades:
+            coluna, sequencia = identidades[(owner, tabela)]
+            alvos.append({'tabela': table_full_name, 'coluna': coluna.lower(), 'sequencia': sequencia,
+                          'ultimo': ultimos.get((owner, sequencia)), 'definir_default': True})
+            mapeadas.add(coluna.lower())
+        
+        for coluna, sequencia in snapshot.sequencias(owner, tabela):
+            if coluna.lower() in mapeadas:
+                continue  # IDENTITY já mapeada (o DEFAULT aponta para a mesma ISEQ$$)
+            seq_owner, _, seq_nome = sequencia.rpartition('.')
+            alvos.append({'tabela': table_full_name, 'coluna': coluna.lower(), 'sequencia': seq_nome,
+                          'ultimo': ultimos.get((seq_owner.upper() or owner, seq_nome.upper())),
+                          'definir_default': False})
+            mapeadas.add(coluna.lower())
+        
+        chaves = [chave.lower() for chave in snapshot.chaves_primarias(owner, tabela)]
+        if len(chaves) == 1 and chaves[0] not in mapeadas:
+            for candidata in (f"{tabela}_SEQ", f"SEQ_{tabela}", f"S_{tabela}", f"SQ_{tabela}", f"{tabela}_{chaves[0].upper()}_SEQ"):
+                if (owner, candidata) in ultimos:
+                    alvos.append({'tabela': table_full_name, 'coluna': chaves[0], 'sequencia': candidata,
+                                  'ultimo': ultimos[(owner, candidata)], 'definir_default': True})
+                    break
+    
+    for alvo in alvos:
+        # LAST_NUMBER é o próximo valor a ser entregue (já considerando o cache)
+        alvo['ultimo'] = alvo['ultimo'] - 1 if alvo['ultimo'] else 0
+    return alvos
+
+def sincronizar_sequencias(tabelas: List[str], snapshot: SnapshotEsquema, source_conn, dest_conn,
+                           schema_destino: str, migration_type: str) -> int:
+    """Após a carga, acerta as sequências do destino para max(coluna) ou o último valor da origem
+    (o maior dos dois), com um setval em lote para centenas de sequências por round-trip"""
+    if not tabelas or snapshot is None:
+        return 0
+    
+    inicio = time.perf_counter()
+    source_cursor = source_conn.cursor()
+    try:
+        if migration_type == 'postgres_to_postgres':
+            alvos = [
+                {'tabela': t, 'coluna': coluna,
+                 'sequencia': sequencia if '.' in sequencia else f"{t.split('.', 1)[0]}.{sequencia}",
+                 'definir_default': False}
+                for t in tabelas
+                for coluna, sequencia in snapshot.sequencias(*t.split('.', 1))
+            ]
+            if alvos:
+                source_cursor.execute("""
+                    SELECT schemaname || '.' || sequencename, last_value
+                    FROM pg_sequences
+                    WHERE schemaname || '.' || sequencename = ANY(%s)
+                """, ([alvo['sequencia'].replace('"', '') for alvo in alvos],))
+                ultimos = dict(source_cursor.fetchall())
+                for alvo in alvos:
+                    alvo['ultimo'] = ultimos.get(alvo['sequencia'].replace('"', '')) or 0
+            source_conn.rollback()
+        else:
+            alvos = mapear_sequencias_oracle(tabelas, snapshot, source_cursor)
+    finally:
+        source_cursor.close()
+    
+    if not alvos:
+        return 0
+    
+    comandos = []
+    for alvo in alvos:
+        schema_origem, tabela = alvo['tabela'].split('.', 1)
+        tabela_destino = f"{schema_destino}.{tabela.lower() if migration_type == 'oracle_to_postgres' else tabela}"
+        sequencia = sequencia_destino(alvo['sequencia'], schema_destino, migration_type)
+        preparo = []
+        if alvo['definir_default']:
+            preparo = [
+                f"CREATE SEQUENCE IF NOT EXISTS {sequencia}",
+                f"""ALTER TABLE {tabela_destino} ALTER COLUMN "{alvo['coluna']}" SET DEFAULT nextval('{sequencia}'::regclass)"""
+            ]
+        # is_called = false quando não há valores: o próximo nextval devolve 1
+        setval = (f"SELECT setval('{sequencia}'::regclass, GREATEST(m, 1), m >= 1) "
+                  f"""FROM (SELECT GREATEST(COALESCE(max("{alvo['coluna']}"), 0), {int(alvo['ultimo'])}) AS m """
+                  f"FROM {tabela_destino}) x")
+        comandos.append((sequencia, preparo, setval))
+    
+    sincronizadas = 0
+    dest_conn.autocommit = False
+    dest_cursor = dest_conn.cursor()
+    try:
+        for inicio_lote in range(0, len(comandos), SEQUENCIAS_POR_LOTE):
+            lote = comandos[inicio_lote:inicio_lote + SEQUENCIAS_POR_LOTE]
+            dest_cursor.execute("SAVEPOINT sequencias")
+            try:
+                preparo = [comando for _, preparos, _ in lote for comando in preparos]
+                if preparo:
+                    dest_cursor.execute(';\n'.join(preparo))
+                dest_cursor.execute('\nUNION ALL\n'.join(f"({setval})" for _, _, setval in lote))
+                dest_cursor.execute("RELEASE SAVEPOINT sequencias")
+                sincronizadas += len(lote)
+                continue
+            except Exception:
+                dest_cursor.execute("ROLLBACK TO SAVEPOINT sequencias")
+            
+            # Lote falhou: isolar a sequência com problema
+            for sequencia, preparos, setval in lote:
+                dest_cursor.execute("SAVEPOINT sequencia")
+                try:
+                    for comando in preparos + [setval]:
+                        dest_cursor.execute(comando)
+                    dest_cursor.execute("RELEASE SAVEPOINT sequencia")
+                    sincronizadas += 1
+                except Exception as e:
+                    dest_cursor.execute("ROLLBACK TO SAVEPOINT sequencia")
+                    add_log(f"    ❌ Erro ao sincronizar a sequência {sequencia}: {str(e).strip()}", 'error')
+        dest_conn.commit()
+    except Exception:
+        dest_conn.rollback()
+        raise
+    finally:
+        dest_cursor.close()
+    
+    add_log(f"🔢 {sincronizadas}/{len(comandos)} sequência(s) sincronizadas em {time.perf_counter() - inicio:.1f}s")
+    return sincronizadas
+
+def obter_colunas_origem(tabela: str, schema_origem: str, source_conn, migration_type: str) -> List[str]:
+    """Lista as colunas da tabela de origem na ordem de definição"""
+    cursor = source_conn.cursor()
+    try:
+        if migration_type == 'postgres_to_postgres':
+            cursor.execute("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_schema = %s AND table_name = %s 
+                ORDER BY ordinal_position
+            """, (schema_origem, tabela))
+        else:
+            cursor.execute("""
+                SELECT column_name 
+                FROM all_tab_columns 
+                WHERE owner = UPPER(:owner) AND table_name = UPPER(:table_name) 
+                ORDER BY column_id
+            """, owner=schema_origem, table_name=tabela)
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+def coluna_watermark_sql(coluna: str, migration_type: str) -> str:
+    """Formata a coluna de watermark para a consulta na origem"""
+    if migration_type == 'postgres_to_postgres':
+        return f'"{coluna}"'
+    if coluna.upper() == 'ORA_ROWSCN':
+        return 'ORA_ROWSCN'
+    return f'"{coluna.upper()}"'
+
+def literal_watermark(valor, migration_type: str, dest_conn) -> str:
+    """Converte o valor do watermark em literal SQL seguro para a origem"""
+    if migration_type == 'postgres_to_postgres':
+        cursor = dest_conn.cursor()
+        try:
+            return cursor.mogrify("%s", (valor,)).decode('utf-8')
+        finally:
+            cursor.close()
+    
+    if isinstance(valor, (int, Decimal)):
+        return str(valor)
+    if isinstance(valor, datetime):
+        return f"TO_TIMESTAMP('{valor:%Y-%m-%d %H:%M:%S.%f}', 'YYYY-MM-DD HH24:MI:SS.FF6')"
+    return "'" + str(valor).replace("'", "''") + "'"
+
+def resolver_coluna_watermark(tabela: str, schema_origem: str, source_conn, migration_type: str,
+                              opcoes: Dict) -> Optional[str]:
+    """Coluna de watermark configurada ou, na falta dela, a PK inteira crescente"""
+    coluna = opcoes['coluna_watermark'].strip()
+    if coluna:
+        if not re.match(r'^[A-Za-z_][A-Za-z0-9_$]*$', coluna):
+            raise ValueError(f"Coluna de watermark inválida: {coluna}")
+        return coluna
+    return chave_segmentacao(tabela, schema_origem, source_conn, migration_type)
+
+def capturar_watermark(tabela: str, schema_origem: str, coluna: str, source_conn, migration_type: str,
+                       filtro: str = None):
+    """Lê o valor máximo atual do watermark na origem"""
+    coluna_sql = coluna_watermark_sql(coluna, migration_type)
+    consulta = f"SELECT MAX({coluna_sql}) FROM {schema_origem}.{tabela}"
+    if filtro:
+        consulta += f" WHERE {filtro}"
+    
+    cursor = source_conn.cursor()
+    try:
+        cursor.execute(consulta)
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+def garantir_indice_unico(tabela_destino: str, schema_destino: str, chaves: List[str], dest_conn):
+    """Garante um índice único nas chaves para o INSERT ... ON CONFLICT"""
+    dest_cursor = dest_conn.cursor()
+    try:
+        dest_cursor.execute("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_index i
+                WHERE i.indrelid = %s::regclass AND i.indisunique
+                AND (
+                    SELECT array_agg(a.attname::text ORDER BY a.attname::text)
+                    FROM pg_attribute a
+                    WHERE a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+                ) = %s::text[]
+            )
+        """, (f"{schema_destino}.{tabela_destino}", sorted(chaves)))
+        
+        if not dest_cursor.fetchone()[0]:
+            nome_indice = f"{tabela_destino[:50]}_delta_uk"
+            chaves_str = ', '.join([f'"{col}"' for col in chaves])
+            add_log(f"    ⚙️  Criando índice único {nome_indice} para upsert")
+            dest_cursor.execute(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS "{nome_indice}" ON {schema_destino}.{tabela_destino} ({chaves_str})'
+            )
+    finally:
+        dest_cursor.close()
+
+def sincronizar_delta(tabela: str, schema_origem: str, schema_destino: str, source_conn, dest_conn,
+                      migration_type: str, opcoes: Dict) -> bool:
+    """Copia apenas as linhas alteradas desde o último watermark e aplica com upsert"""
+    checkpoint_journal = journal_atual()
+    tabela_key = f"{schema_origem}.{tabela}"
+    tabela_destino_nome = tabela if migration_type == 'postgres_to_postgres' else tabela.lower()
+    tabela_destino = f"{schema_destino}.{tabela_destino_nome}"
+    dest_cursor = None
+    
+    try:
+        add_log(f"    🔁 Sincronização incremental: {tabela_key}")
         dest_conn.autocommit = False
-        source_cursor = source_conn.cursor()
-        dest_cursor = dest_conn.cursor()
         
-        # Verificar se a tabela existe no destino
-        dest_cursor.execute("""
-            SELECT EXISTS (
-                SELECT 1 FROM information_schema.tables 
-                WHERE table_schema = %s AND table_name = %s
-            )
-        """, (schema_destino, tabela.lower()))
+        chaves = obter_chaves_primarias(tabela, schema_origem, source_conn, migration_type)
+        if not chaves:
+            add_log(f"    ❌ Tabela {tabela_key} sem chave primária: upsert incremental impossível", 'error')
+            return False
         
-        if not dest_cursor.fetchone()[0]:
-            add_log(f"    ⏭️  Tabela {schema_destino}.{tabela} não existe no destino", 'error')
+        coluna = resolver_coluna_watermark(tabela, schema_origem, source_conn, migration_type, opcoes)
+        if not coluna:
+            add_log(f"    ❌ Informe a coluna de watermark para {tabela_key} (não há PK inteira)", 'error')
             return False
         
-        # Obter colunas
-        source_cursor.execute("""
-            SELECT column_name 
-            FROM all_tab_columns 
-            WHERE owner = UPPER(:owner) AND table_name = UPPER(:table_name) 
-            ORDER BY column_id
-        """, owner=schema_origem, table_name=tabela)
+        colunas = obter_colunas_origem(tabela, schema_origem, source_conn, migration_type)
+        if migration_type == 'postgres_to_postgres':
+            colunas_destino = colunas
+        else:
+            colunas_destino = [col.lower() for col in colunas]
+        colunas_str = ', '.join([f'"{col}"' for col in colunas_destino])
         
-        colunas = [row[0] for row in source_cursor.fetchall()]
-        colunas_str = ', '.join([f'"{col.lower()}"' for col in colunas])
-        colunas_oracle_str = ', '.join([f'"{col}"' for col in colunas])
+        # Janela (anterior, atual]: linhas alteradas depois de fechada ficam para a próxima execução
+        anterior = checkpoint_journal.obter_watermark(tabela_key) if checkpoint_journal else None
+        if anterior and anterior[0] != coluna:
+            add_log(f"    ⚠️  Coluna de watermark mudou ({anterior[0]} → {coluna}), sincronizando tudo")
+            anterior = None
         
-        # Contar registros
-        source_cursor.execute(f"SELECT COUNT(*) FROM {schema_origem}.{tabela}")
-        total_registros = source_cursor.fetchone()[0]
+        coluna_sql = coluna_watermark_sql(coluna, migration_type)
+        filtro_inicio = None
+        if anterior:
+            filtro_inicio = f"{coluna_sql} >= {literal_watermark(anterior[1], migration_type, dest_conn)}"
+            add_log(f"    🔖 Watermark anterior: {coluna} = {anterior[1]}")
+        else:
+            add_log(f"    ℹ️  Sem watermark anterior em {coluna}: todas as linhas serão sincronizadas")
         
-        if total_registros == 0:
-            add_log(f"    ℹ️  Nenhum registro para migrar")
-            dest_conn.commit()
+        atual = capturar_watermark(tabela, schema_origem, coluna, source_conn, migration_type, filtro_inicio)
+        if atual is None:
+            if anterior:
+                add_log(f"    ℹ️  Nenhuma alteração desde a última sincronização ({coluna} = {anterior[1]})")
+            else:
+                add_log("    ℹ️  Nenhuma linha na origem para sincronizar")
+            source_conn.rollback()
             return True
         
-        add_log(f"    📊 Total de registros: {total_registros}")
+        filtro = ' AND '.join(f for f in (
+            filtro_inicio, f"{coluna_sql} <= {literal_watermark(atual, migration_type, dest_conn)}"
+        ) if f)
         
-        # Limpar tabela de destino
-        dest_cursor.execute(f"TRUNCATE TABLE {schema_destino}.{tabela.lower()}")
+        garantir_indice_unico(tabela_destino_nome, schema_destino, chaves, dest_conn)
         
-        # Migrar dados em lotes
-        placeholders = ', '.join(['%s'] * len(colunas))
-        insert_query = f"INSERT INTO {schema_destino}.{tabela.lower()} ({colunas_str}) VALUES ({placeholders})"
+        # Carregar o delta numa tabela temporária e aplicar de uma vez
+        tabela_delta = f"delta_{uuid.uuid4().hex[:12]}"
+        dest_cursor = dest_conn.cursor()
+        dest_cursor.execute(f"CREATE TEMP TABLE {tabela_delta} (LIKE {tabela_destino}) ON COMMIT DROP")
         
-        source_cursor.execute(f"SELECT {colunas_oracle_str} FROM {schema_origem}.{tabela}")
+        if migration_type == 'postgres_to_postgres':
+            registros = copiar_intervalo_postgres(
+                source_conn, dest_conn, tabela_key, tabela_delta, colunas_str, len(colunas), filtro, opcoes
+            )
+        else:
+            colunas_oracle_str = ', '.join([f'"{col}"' for col in colunas])
+            registros = copiar_intervalo_oracle(
+                source_conn, dest_conn, tabela_key, tabela_delta, colunas_str, colunas_oracle_str,
+                len(colunas), filtro, opcoes
+            )
         
-        lote_size = 1000
-        registros_migrados = 0
-        registros = source_cursor.fetchmany(lote_size)
+        chaves_str = ', '.join([f'"{col}"' for col in chaves])
+        atualizacoes = ', '.join([f'"{col}" = EXCLUDED."{col}"' for col in colunas_destino if col not in chaves])
+        conflito = f"DO UPDATE SET {atualizacoes}" if atualizacoes else "DO NOTHING"
         
-        while registros:
-            try:
-                # Converter tipos Oracle
-                registros_convertidos = []
-                for registro in registros:
-                    registro_convertido = []
-                    for valor in registro:
-                        if isinstance(valor, oracledb.LOB):
-                            try:
-                                registro_convertido.append(valor.read())
-                            except:
-                                registro_convertido.append(None)
-                        elif valor is None:
-                            registro_convertido.append(None)
-                        else:
-                            registro_convertido.append(valor)
-                    registros_convertidos.append(tuple(registro_convertido))
-                
-                dest_cursor.executemany(insert_query, registros_convertidos)
-                registros_migrados += len(registros_convertidos)
-                
-                if registros_migrados % 5000 == 0:
-                    add_log(f"    ✅ {registros_migrados}/{total_registros} registros migrados")
-                
-                registros = source_cursor.fetchmany(lote_size)
-            except Exception as insert_error:
-                add_log(f"    ❌ Erro ao inserir lote: {insert_error}", 'error')
-                dest_conn.rollback()
-                return False
+        dest_cursor.execute(f"""
+            INSERT INTO {tabela_destino} ({colunas_str})
+            SELECT {colunas_str} FROM {tabela_delta}
+            ON CONFLICT ({chaves_str}) {conflito}
+        """)
+        aplicados = dest_cursor.rowcount
         
         dest_conn.commit()
-        add_log(f"    ✅ Todos os {registros_migrados} registros migrados com sucesso", 'success')
+        source_conn.rollback()
+        
+        if checkpoint_journal:
+            checkpoint_journal.salvar_watermark(tabela_key, coluna, atual)
+        
+        add_log(f"    ✅ {registros} registros alterados, {aplicados} aplicados (watermark {coluna} = {atual})", 'success')
         return True
         
     except Exception as e:
-        add_log(f"❌ Erro ao migrar dados da tabela Oracle {tabela}: {str(e)}", 'error')
+        add_log(f"❌ Erro na sincronização incremental de {tabela_key}: {e}", 'error')
         if dest_conn:
             dest_conn.rollback()
         return False
     finally:
-        if source_cursor:
-            source_cursor.close()
         if dest_cursor:
             dest_cursor.close()
 
-def criar_tabela_postgres_para_postgres(tabela: str, schema_origem: str, schema_destino: str, 
-                                      source_conn, dest_conn) -> bool:
-    """Cria tabela PostgreSQL para PostgreSQL"""
-    source_cursor = None
-    dest_cursor = None
-    
+def migrar_tabela_segura(tabela: str, schema_origem: str, schema_destino: str,
+                        source_conn, dest_conn, migration_type: str, opcoes: Dict = None,
+                        snapshot: SnapshotEsquema = None, ddl_aplicado: bool = False) -> bool:
+    """Migra uma tabela de forma segura com transação"""
+    checkpoint_journal = journal_atual()
+    # Métricas (e as threads de chunks/leitura criadas daqui) vão para esta tabela
+    job_atual.tabela = f"{schema_origem}.{tabela}"
+    registrar_metrica()
     try:
-        add_log(f"\n🔄 Processando tabela: {schema_origem}.{tabela}")
-        
-        source_cursor = source_conn.cursor()
-        dest_cursor = dest_conn.cursor()
-        
-        # Verificar se a tabela existe na origem
-        source_cursor.execute("""
-            SELECT EXISTS (
-                SELECT 1 FROM information_schema.tables 
-                WHERE table_schema = %s AND table_name = %s
-            )
-        """, (schema_origem, tabela))
+        # 1. Criar tabela (já criada quando o DDL foi aplicado em lote)
+        if ddl_aplicado:
+            add_log(f"\n🔄 Processando tabela: {schema_origem}.{tabela}")
+            sucesso_criacao = True
+        elif migration_type == 'postgres_to_postgres':
+            with medir_fase('ddl'):
+                sucesso_criacao = criar_tabela_postgres_para_postgres(tabela, schema_origem, schema_destino, source_conn, dest_conn, snapshot)
+        else:
+            with medir_fase('ddl'):
+                sucesso_criacao = criar_tabela_oracle_para_postgres(tabela, schema_origem, schema_destino, source_conn, dest_conn, snapshot)
         
-        if not source_cursor.fetchone()[0]:
-            add_log(f"⏭️  Tabela {schema_origem}.{tabela} não existe na origem")
+        if not sucesso_criacao:
             return False
         
-        # Obter informações das colunas
-        source_cursor.execute("""
-            SELECT column_name, data_type, is_nullable, column_default,
-                   character_maximum_length, numeric_precision, numeric_scale
-            FROM information_schema.columns 
-            WHERE table_schema = %s AND table_name = %s 
-            ORDER BY ordinal_position
-        """, (schema_origem, tabela))
+        # 2. Migrar dados
+        opcoes = {**OPCOES_MIGRACAO_PADRAO, **(opcoes or {})}
+        if opcoes['modo_sincronizacao'] == 'incremental':
+            return sincronizar_delta(tabela, schema_origem, schema_destino, source_conn, dest_conn, migration_type, opcoes)
         
-        colunas_info = source_cursor.fetchall()
-        colunas_def = []
+        # Watermark lido antes da carga completa serve de ponto de partida para o modo incremental
+        watermark = None
+        if checkpoint_journal:
+            try:
+                coluna = resolver_coluna_watermark(tabela, schema_origem, source_conn, migration_type, opcoes)
+                if coluna:
+                    watermark = (coluna, capturar_watermark(tabela, schema_origem, coluna, source_conn, migration_type))
+            except Exception as e:
+                add_log(f"    ⚠️  Não foi possível registrar o watermark inicial: {e}")
+                source_conn.rollback()
         
-        for coluna in colunas_info:
-            nome, tipo, nullable, default_value, char_max_length, num_precision, num_scale = coluna
-            
-            # Construir tipo PostgreSQL
-            if tipo == 'character varying':
-                pg_tipo = f'VARCHAR({char_max_length})' if char_max_length else 'VARCHAR'
-            elif tipo == 'character':
-                pg_tipo = f'CHAR({char_max_length})' if char_max_length else 'CHAR'
-            elif tipo == 'numeric':
-                if num_precision and num_scale:
-                    pg_tipo = f'NUMERIC({num_precision}, {num_scale})'
-                elif num_precision:
-                    pg_tipo = f'NUMERIC({num_precision})'
-                else:
-                    pg_tipo = 'NUMERIC'
-            else:
-                pg_tipo = tipo.upper()
-            
-            col_def = f'"{nome}" {pg_tipo}'
-            
-            if nullable == 'NO':
-                col_def += ' NOT NULL'
-            
-            if default_value:
-                col_def += f' DEFAULT {default_value}'
-            
-            colunas_def.append(col_def)
+        if migration_type == 'postgres_to_postgres':
+            sucesso_dados = migrar_dados_postgres_para_postgres(tabela, schema_origem, schema_destino, source_conn, dest_conn, opcoes)
+        else:
+            sucesso_dados = migrar_dados_oracle_para_postgres(tabela, schema_origem, schema_destino, source_conn, dest_conn, opcoes)
         
-        # Criar tabela
-        create_sql = f'CREATE TABLE IF NOT EXISTS {schema_destino}.{tabela} ({", ".join(colunas_def)})'
+        if sucesso_dados and watermark and watermark[1] is not None:
+            checkpoint_journal.salvar_watermark(f"{schema_origem}.{tabela}", *watermark)
         
-        try:
-            dest_cursor.execute(create_sql)
-            dest_conn.commit()
-            add_log(f"✅ Tabela {schema_destino}.{tabela} criada com sucesso!", 'success')
-            return True
-        except Exception as create_error:
-            add_log(f"❌ Erro ao criar tabela: {create_error}", 'error')
-            return False
+        return sucesso_dados
         
     except Exception as e:
-        add_log(f"❌ Erro ao processar tabela {tabela}: {e}", 'error')
+        add_log(f"💥 Erro crítico na migração de {tabela}: {e}", 'error')
         return False
     finally:
-        if source_cursor:
-            source_cursor.close()
-        if dest_cursor:
-            dest_cursor.close()
+        encerrar_metrica(job_atual.tabela)
+        job_atual.tabela = None
 
-def criar_tabela_oracle_para_postgres(tabela: str, schema_origem: str, schema_destino: str, 
-                                    source_conn, dest_conn) -> bool:
-    """Cria tabela Oracle para PostgreSQL"""
-    source_cursor = None
-    dest_cursor = None
+def estimar_tamanho_tabelas(selected_tables: List[str], source_conn, migration_type: str) -> Dict[str, int]:
+    """Estima o número de linhas das tabelas pelas estatísticas do catálogo"""
+    tamanhos = {}
+    cursor = None
     
     try:
-        add_log(f"\n🔄 Processando tabela Oracle: {schema_origem}.{tabela}")
-        
-        source_cursor = source_conn.cursor()
-        dest_cursor = dest_conn.cursor()
-        
-        # Obter informações das colunas
-        source_cursor.execute("""
-            SELECT column_name, data_type, data_length, data_precision,
-                   data_scale, nullable, data_default
-            FROM all_tab_columns 
-            WHERE owner = UPPER(:owner) AND table_name = UPPER(:table_name) 
-            ORDER BY column_id
-        """, owner=schema_origem, table_name=tabela)
-        
-        colunas_info = source_cursor.fetchall()
-        
-        if not colunas_info:
-            add_log(f"❌ Nenhuma coluna encontrada para {tabela}", 'error')
-            return False
-        
-        colunas_def = []
-        
-        for coluna in colunas_info:
-            nome, tipo_oracle, data_length, data_precision, data_scale, nullable, data_default = coluna
-            
-            nome = nome.lower()
-            tipo_base = tipo_oracle.split('(')[0] if '(' in tipo_oracle else tipo_oracle
-            pg_tipo = COMPREHENSIVE_TYPE_MAPPING.get(tipo_base.upper(), 'TEXT')
-            
-            # Ajustar tipo com precisão
-            if pg_tipo in ['VARCHAR', 'CHAR'] and data_length:
-                pg_tipo = f"{pg_tipo}({data_length})"
-            elif pg_tipo == 'NUMERIC' and data_precision is not None:
-                if data_scale is not None and data_scale > 0:
-                    pg_tipo = f"NUMERIC({data_precision}, {data_scale})"
-                elif data_precision is not None:
-                    pg_tipo = f"NUMERIC({data_precision})"
-            
-            col_def = f'"{nome}" {pg_tipo}'
-            
-            if nullable == 'N':
-                col_def += ' NOT NULL'
-            
-            if data_default is not None:
-                default_value = str(data_default).strip()
-                if default_value.upper() not in ['NULL', '']:
-                    col_def += f' DEFAULT {default_value}'
-            
-            colunas_def.append(col_def)
+        cursor = source_conn.cursor()
         
-        # Criar tabela
-        tabela_destino = tabela.lower()
-        colunas_sql = ', '.join(colunas_def)
-        create_sql = f'CREATE TABLE IF NOT EXISTS {schema_destino}.{tabela_destino} ({colunas_sql})'
-        
-        try:
-            dest_cursor.execute(create_sql)
-            dest_conn.commit()
-            add_log(f"✅ Tabela {schema_destino}.{tabela_destino} criada com sucesso!", 'success')
-            return True
-        except Exception as create_error:
-            add_log(f"❌ Erro ao criar tabela: {create_error}", 'error')
-            return False
+        if migration_type == 'postgres_to_postgres':
+            cursor.execute("""
+                SELECT n.nspname || '.' || c.relname,
+                       CASE WHEN c.reltuples >= 0 THEN c.reltuples::bigint
+                            ELSE COALESCE(s.n_live_tup, 0) END
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+                WHERE c.relkind IN ('r', 'p')
+                AND n.nspname || '.' || c.relname = ANY(%s)
+            """, (list(selected_tables),))
+            tamanhos = dict(cursor.fetchall())
+        else:
+            owners = sorted({t.split('.', 1)[0].upper() for t in selected_tables})
+            binds = ', '.join(f":o{i}" for i in range(len(owners)))
+            cursor.execute(f"""
+                SELECT owner, table_name, NVL(num_rows, 0)
+                FROM all_tables
+                WHERE owner IN ({binds})
+            """, {f"o{i}": owner for i, owner in enumerate(owners)})
+            por_nome = {f"{owner}.{tabela}".upper(): linhas for owner, tabela, linhas in cursor.fetchall()}
+            tamanhos = {t: por_nome.get(t.upper(), 0) for t in selected_tables}
         
     except Exception as e:
-        add_log(f"❌ Erro ao processar tabela Oracle {tabela}: {str(e)}", 'error')
-        return False
+        add_log(f"⚠️  Não foi possível estimar o tamanho das tabelas: {e}")
+        try:
+            source_conn.rollback()
+        except Exception:
+            pass
     finally:
-        if source_cursor:
-            source_cursor.close()
-        if dest_cursor:
-            dest_cursor.close()
+        if cursor:
+            cursor.close()
+    
+    return tamanhos
 
-def migrar_tabela_segura(tabela: str, schema_origem: str, schema_destino: str,
-                        source_conn, dest_conn, migration_type: str) -> bool:
-    """Migra uma tabela de forma segura com transação"""
-    try:
-        # 1. Criar tabela
-        if migration_type == 'postgres_to_postgres':
-            sucesso_criacao = criar_tabela_postgres_para_postgres(tabela, schema_origem, schema_destino, source_conn, dest_conn)
-        else:
-            sucesso_criacao = criar_tabela_oracle_para_postgres(tabela, schema_origem, schema_destino, source_conn, dest_conn)
+def worker_migracao(fila_tabelas: queue.Queue, source_conn, dest_conn, schema_destino: str,
+                    migration_type: str, opcoes: Dict, snapshot: SnapshotEsquema = None,
+                    ddl_aplicado: bool = False, tabelas_concluidas: List[str] = None):
+    """Consome tabelas da fila usando um par de conexões exclusivo"""
+    checkpoint_journal = journal_atual()
+    while True:
+        try:
+            table_full_name = fila_tabelas.get_nowait()
+        except queue.Empty:
+            return
         
-        if not sucesso_criacao:
-            return False
+        schema_origem, tabela = table_full_name.split('.', 1)
         
-        # 2. Migrar dados
-        if migration_type == 'postgres_to_postgres':
-            sucesso_dados = migrar_dados_postgres_para_postgres(tabela, schema_origem, schema_destino, source_conn, dest_conn)
-        else:
-            sucesso_dados = migrar_dados_oracle_para_postgres(tabela, schema_origem, schema_destino, source_conn, dest_conn)
+        if checkpoint_journal and opcoes['retomar']:
+            estado = checkpoint_journal.obter_tabela(table_full_name)
+            if estado and estado['status'] == 'concluida':
+                add_log(f"⏭️  {table_full_name} já foi migrada (checkpoint), pulando")
+                incrementar_status('tables_created', 'tables_data_migrated')
+                # A execução interrompida pode não ter chegado aos índices/sequências (ambos idempotentes)
+                if tabelas_concluidas is not None:
+                    tabelas_concluidas.append(table_full_name)
+                continue
         
-        return sucesso_dados
+        with perfilar(table_full_name):
+            sucesso = migrar_tabela_segura(
+                tabela, schema_origem, schema_destino,
+                source_conn, dest_conn, migration_type, opcoes, snapshot, ddl_aplicado
+            )
         
-    except Exception as e:
-        add_log(f"💥 Erro crítico na migração de {tabela}: {e}", 'error')
-        return False
+        if sucesso:
+            incrementar_status('tables_created', 'tables_data_migrated')
+            if checkpoint_journal:
+                checkpoint_journal.concluir_tabela(table_full_name)
+            if tabelas_concluidas is not None:
+                tabelas_concluidas.append(table_full_name)
+        else:
+            incrementar_status('tables_failed', 'tables_data_failed')
+            # Deixar as conexões limpas para a próxima tabela
+            for conn in (source_conn, dest_conn):
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+        
+        add_log("─" * 40)
 
-def run_migration(migration_type: str, source_params: Dict, dest_params: Dict, selected_tables: List[str]):
+def registrar_resumo_perfil(coletor: ColetorPerfil, status: Dict):
+    """Salva os .prof do job, guarda o resumo em status['perfil'] e loga os hotspots"""
+    try:
+        diretorio = coletor.salvar()
+    except OSError as e:
+        add_log(f"⚠️  Não foi possível salvar os perfis: {e}")
+        diretorio = None
+    status['perfil'] = coletor.resumo()
+    if not status['perfil']:
+        return
+    
+    add_log(f"🔬 Hotspots (tempo próprio){f' — perfis em {diretorio}' if diretorio else ''}:")
+    for item in status['perfil']['top']:
+        add_log(f"    {item['tempo_proprio']:>9.3f}s  {item['chamadas']:>10}x  {item['funcao']}")
+
+def run_migration(migration_type: str, source_params: Dict, dest_params: Dict, selected_tables: List[str],
+                  opcoes: Dict = None):
     """Executa a migração em uma thread separada"""
-    global migration_status
+    opcoes = {**OPCOES_MIGRACAO_PADRAO, **(opcoes or {})}
+    status = status_atual()
     
-    migration_status['in_progress'] = True
-    migration_status['completed'] = False
-    migration_status['logs'] = []
-    migration_status['tables_created'] = 0
-    migration_status['tables_failed'] = 0
-    migration_status['tables_data_migrated'] = 0
-    migration_status['tables_data_failed'] = 0
-    migration_status['total_tables'] = len(selected_tables)
+    status['in_progress'] = True
+    status['completed'] = False
+    status['execucao'] += 1
+    # Na primeira execução fica o que foi logado antes dela (ex.: a espera do job por uma vaga)
+    status['logs'].reiniciar(status['execucao'], limpar=status['execucao'] > 1)
+    status['tables_created'] = 0
+    status['tables_failed'] = 0
+    status['tables_data_migrated'] = 0
+    status['tables_data_failed'] = 0
+    status['total_tables'] = len(selected_tables)
+    status['metricas'] = {}
+    status['perfil'] = {}
+    job_atual.perfil = None
+    if opcoes['perfil']:
+        job_atual.perfil = ColetorPerfil(
+            os.path.join(PERFIL_DIR, status.get('id', time.strftime('cli-%Y%m%d-%H%M%S'))), opcoes['perfil_top']
+        )
     
     add_log("🚀 Iniciando processo de migração")
     add_log(f"📋 Tipo: {'PostgreSQL → PostgreSQL' if migration_type == 'postgres_to_postgres' else 'Oracle → PostgreSQL'}")
+    if migration_type == 'postgres_to_postgres':
+        modo = f"COPY {opcoes['formato_copy']}" if opcoes['modo_carga'] == 'copy' else 'INSERT em lotes'
+        add_log(f"⚙️  Modo de carga: {modo}")
+    if opcoes['modo_sincronizacao'] == 'incremental':
+        add_log(f"🔁 Sincronização incremental (watermark: {opcoes['coluna_watermark'] or 'PK inteira'})")
     
     # Testar conexões antes de iniciar
     if not testar_conexoes(source_params, dest_params, migration_type):
         add_log("❌ Teste de conexões falhou. Migração cancelada.", 'error')
-        migration_status['in_progress'] = False
+        status['in_progress'] = False
         return
     
-    source_conn = None
-    dest_conn = None
+    pares_conexoes = []
     
     try:
-        # Estabelecer conexões
-        if migration_type == 'postgres_to_postgres':
-            source_conn = psycopg2.connect(
-                host=source_params['host'], database=source_params['dbname'],
-                user=source_params['user'], password=source_params['password'],
-                port=5432, connect_timeout=10
-            )
+        # Diário de checkpoints: retomar ou começar do zero
+        checkpoint_journal = status['journal'] = CheckpointJournal(
+            CHECKPOINT_DB, CheckpointJournal.gerar_id(migration_type, source_params, dest_params),
+            # O modo entra no escopo: o delta agendado (sempre sem retomar) não apaga os checkpoints da carga completa
+            escopo=(opcoes['modo_sincronizacao'], *sorted(selected_tables))
+        )
+        if opcoes['retomar']:
+            add_log(f"♻️  Retomando migração a partir do checkpoint ({CHECKPOINT_DB})")
         else:
-            dsn = source_params['tns']
-            if ':' not in dsn and '/' in dsn:
-                parts = dsn.split('/')
-                dsn = f"{parts[0]}:1521/{parts[1]}"
-            
-            if source_params.get('lib_dir') and os.path.exists(source_params['lib_dir']):
-                try:
-                    oracledb.init_oracle_client(lib_dir=source_params['lib_dir'])
-                except:
-                    pass
-            
-            source_conn = oracledb.connect(
-                user=source_params['user'], password=source_params['password'], dsn=dsn
-            )
+            checkpoint_journal.reiniciar()
         
-        dest_conn = psycopg2.connect(
-            host=dest_params['host'], database=dest_params['dbname'],
-            user=dest_params['user'], password=dest_params['password'],
-            port=5432, connect_timeout=10
-        )
+        # Estabelecer pools e um par de conexões por worker
+        num_workers = max(1, min(opcoes['workers'], len(selected_tables)))
+        # Cada worker usa um par fixo e pode abrir mais pares para os chunks de tabelas grandes
+        tamanho_pools = num_workers * (1 + max(0, opcoes['chunks_paralelos']))
+        if not criar_pools_migracao(migration_type, source_params, dest_params, tamanho_pools, opcoes):
+            add_log("❌ Não foi possível criar os pools de conexão. Migração cancelada.", 'error')
+            return
         
-        add_log("✅ Conexões estabelecidas com sucesso")
+        for _ in range(num_workers):
+            par = obter_par_conexoes(opcoes)
+            if par is None:
+                break
+            pares_conexoes.append(par)
         
-        # Processar tabelas
-        for table_full_name in selected_tables:
-            schema_origem, tabela = table_full_name.split('.', 1)
-            
-            sucesso = migrar_tabela_segura(
-                tabela, schema_origem, dest_params['schema'],
-                source_conn, dest_conn, migration_type
+        if not pares_conexoes:
+            add_log("❌ Nenhuma conexão disponível nos pools. Migração cancelada.", 'error')
+            return
+        
+        add_log(f"✅ Conexões estabelecidas com sucesso ({len(pares_conexoes)} worker(s))")
+        
+        # Maiores tabelas primeiro para não deixar uma tabela grande sozinha no final
+        tamanhos = estimar_tamanho_tabelas(selected_tables, pares_conexoes[0][0], migration_type)
+        tabelas_ordenadas = sorted(selected_tables, key=lambda t: tamanhos.get(t, 0), reverse=True)
+        
+        # Catálogo de todas as tabelas em poucas consultas, compartilhado pelos workers
+        snapshot = None
+        try:
+            inicio = time.perf_counter()
+            with medir_fase('catalogo'):
+                snapshot = SnapshotEsquema.carregar(selected_tables, pares_conexoes[0][0], migration_type)
+            add_log(f"🗂️  Catálogo de {len(snapshot.tabelas)} tabela(s) carregado em {time.perf_counter() - inicio:.1f}s")
+        except Exception as e:
+            add_log(f"⚠️  Não foi possível carregar o catálogo em lote, lendo por tabela: {e}")
+            try:
+                pares_conexoes[0][0].rollback()
+            except Exception:
+                pass
+        
+        # DDL de todas as tabelas antes da carga, em uma transação
+        ddl_aplicado = False
+        if opcoes['ddl_em_lote'] and snapshot is not None:
+            try:
+                with medir_fase('ddl'):
+                    resultados_ddl = criar_esquema_em_lote(
+                        selected_tables, snapshot, dest_params['schema'], pares_conexoes[0][1], migration_type
+                    )
+                ddl_aplicado = True
+                falhas_ddl = [t for t, erro in resultados_ddl.items() if erro]
+                for _ in falhas_ddl:
+                    incrementar_status('tables_failed', 'tables_data_failed')
+                tabelas_ordenadas = [t for t in tabelas_ordenadas if t not in falhas_ddl]
+            except Exception as e:
+                add_log(f"⚠️  DDL em lote falhou, criando tabela a tabela: {e}")
+        
+        fila_tabelas = queue.Queue()
+        for table_full_name in tabelas_ordenadas:
+            fila_tabelas.put(table_full_name)
+        tabelas_concluidas = []
+        
+        workers = [
+            nova_thread(
+                worker_migracao,
+                perfilado=False,
+                args=(fila_tabelas, source_conn, dest_conn, dest_params['schema'], migration_type, opcoes,
+                      snapshot, ddl_aplicado, tabelas_concluidas),
+                name=f"migracao-worker-{indice + 1}",
+                daemon=True
             )
-            
-            if sucesso:
-                migration_status['tables_created'] += 1
-                migration_status['tables_data_migrated'] += 1
-            else:
-                migration_status['tables_failed'] += 1
-                migration_status['tables_data_failed'] += 1
-            
-            add_log("─" * 40)
+            for indice, (source_conn, dest_conn) in enumerate(pares_conexoes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        
+        # Chaves e índices construídos uma vez, depois da carga, em vez de mantidos linha a linha
+        if opcoes['indices_pos_carga']:
+            construir_indices_pos_carga(tabelas_concluidas, snapshot, dest_params['schema'], migration_type, opcoes)
+        
+        if opcoes['sincronizar_sequencias']:
+            try:
+                sincronizar_sequencias(tabelas_concluidas, snapshot, pares_conexoes[0][0], pares_conexoes[0][1],
+                                       dest_params['schema'], migration_type)
+            except Exception as e:
+                add_log(f"❌ Erro ao sincronizar sequências: {e}", 'error')
         
     except Exception as e:
         add_log(f"💥 Erro crítico durante a migração: {e}", 'error')
     finally:
-        # Fechar conexões
-        if source_conn:
-            try:
-                source_conn.close()
-            except:
-                pass
-        if dest_conn:
-            try:
-                dest_conn.close()
-            except:
-                pass
+        # Devolver conexões; os pools continuam abertos para as próximas requisições
+        for source_conn, dest_conn in pares_conexoes:
+            liberar_par_conexoes(source_conn, dest_conn)
+        liberar_pools_migracao(opcoes)
+        
+        if status['journal']:
+            status['journal'].fechar()
+            status['journal'] = None
+        
+        if job_atual.perfil:
+            registrar_resumo_perfil(job_atual.perfil, status)
+            job_atual.perfil = None
         
-        migration_status['in_progress'] = False
-        migration_status['completed'] = True
+        status['in_progress'] = False
+        status['completed'] = True
         add_log("🎉 Processo de migração concluído!", 'success')
 
+def obter_opcoes_migracao(form) -> Dict:
+    """Extrai as opções do motor de migração do formulário"""
+    opcoes = dict(OPCOES_MIGRACAO_PADRAO)
+
+    copy_format = form.get('copy_format', opcoes['formato_copy'])
+    if copy_format == 'insert':
+        opcoes['modo_carga'] = 'insert'
+    elif copy_format in ('binary', 'text'):
+        opcoes['modo_carga'] = 'copy'
+        opcoes['formato_copy'] = copy_format
+
+    opcoes['retomar'] = form.get('retomar') == 'on'
+    if form.get('modo_sincronizacao') in ('completa', 'incremental'):
+        opcoes['modo_sincronizacao'] = form['modo_sincronizacao']
+    opcoes['coluna_watermark'] = form.get('coluna_watermark', '').strip()
+    opcoes['contagem_exata'] = form.get('contagem_exata') == 'on'
+    opcoes['ddl_em_lote'] = form.get('ddl_em_lote') == 'on'
+    opcoes['ddl_dry_run'] = form.get('ddl_dry_run') == 'on'
+    opcoes['indices_pos_carga'] = form.get('indices_pos_carga') == 'on'
+    opcoes['tabelas_staging'] = form.getlist('tabelas_staging')
+    opcoes['sincronizar_sequencias'] = form.get('sincronizar_sequencias') == 'on'
+    opcoes['perfil'] = form.get('perfil') == 'on'
+    maintenance_work_mem = form.get('maintenance_work_mem', '').strip()
+    if re.fullmatch(r'\d+\s*(kB|MB|GB)?', maintenance_work_mem):
+        opcoes['maintenance_work_mem'] = maintenance_work_mem
+
+    try:
+        opcoes['workers'] = max(1, min(int(form.get('workers', opcoes['workers'])), MAX_WORKERS))
+        opcoes['chunks_paralelos'] = max(1, min(int(form.get('chunks_paralelos', opcoes['chunks_paralelos'])), MAX_WORKERS))
+        opcoes['linhas_por_chunk'] = max(1, int(form.get('linhas_por_chunk', opcoes['linhas_por_chunk'])))
+        opcoes['num_chunks'] = max(0, min(int(form.get('num_chunks', opcoes['num_chunks'])), MAX_CHUNKS))
+        opcoes['linhas_por_checkpoint'] = max(0, int(form.get('linhas_por_checkpoint', opcoes['linhas_por_checkpoint'])))
+        opcoes['lote_min'] = max(1, int(form.get('lote_min', opcoes['lote_min'])))
+        opcoes['lote_max'] = max(opcoes['lote_min'], int(form.get('lote_max', opcoes['lote_max'])))
+        opcoes['perfil_top'] = max(1, int(form.get('perfil_top', '').strip() or opcoes['perfil_top']))
+    except ValueError:
+        pass
+
+    return opcoes
+
 # Rotas Flask (mantidas intactas)
 @app.route('/')
 def index():
@@ -1241,8 +4062,8 @@ def migrate():
         'user': request.form['source_user'],
         'password': request.form['source_password'],
         'schema': request.form['source_schema'],
-        'oracle_tns': request.form.get('oracle_tns', ''),
-        'oracle_lib_dir': request.form.get('oracle_lib_dir', '')
+        'tns': request.form.get('oracle_tns', ''),
+        'lib_dir': request.form.get('oracle_lib_dir', '')
     }
     
     dest_params = {
@@ -1254,32 +4075,187 @@ def migrate():
     }
     
     selected_tables = request.form.getlist('selected_tables')
+    opcoes = obter_opcoes_migracao(request.form)
     
     if not selected_tables:
         add_log("❌ Nenhuma tabela selecionada!", 'error')
         return redirect('/')
     
+    if opcoes['ddl_dry_run']:
+        try:
+            script = gerar_script_esquema_dry_run(migration_type, source_params, dest_params, selected_tables)
+        except Exception as e:
+            add_log(f"❌ Erro ao gerar o script DDL: {e}", 'error')
+            return redirect('/')
+        return script, 200, {'Content-Type': 'text/plain; charset=utf-8'}
+    
+    job = criar_job(migration_type, selected_tables, dest_params['schema'])
     thread = threading.Thread(
-        target=run_migration, 
-        args=(migration_type, source_params, dest_params, selected_tables)
+        target=executar_job, 
+        args=(job, migration_type, source_params, dest_params, selected_tables, opcoes)
     )
     thread.daemon = True
     thread.start()
     
-    return render_template_string(RESULTS_HTML, logs=migration_status['logs'])
+    return render_template_string(RESULTS_HTML, job_id=job['id'], logs=[], proximo_log=0, execucao=0)
+
+def job_mais_recente() -> Dict:
+    """Job criado por último (ou o migration_status global se ainda não houve nenhum)"""
+    with jobs_lock:
+        return next(reversed(jobs.values()), migration_status)
+
+def resposta_logs(status: Dict) -> Dict:
+    """Logs a partir do cursor ?since=N (só as entradas novas) e os contadores atuais;
+    sem cursor, ou se a execução mudou desde a última consulta, devolve tudo com reset=True"""
+    since = request.args.get('since', type=int)
+    reset = (
+        since is None or since < 0 or since > status['logs'].total
+        or request.args.get('execucao', type=int) != status['execucao']
+    )
+    logs, proximo, truncado = status['logs'].desde(0 if reset else since)
+    
+    return {
+        'logs': logs,
+        'next': proximo,
+        'reset': reset,
+        'truncated': truncado and not reset,
+        'execucao': status['execucao'],
+        'in_progress': status['in_progress'] or status.get('estado') == 'aguardando',
+        'completed': status['completed'],
+        'tables_created': status['tables_created'],
+        'tables_failed': status['tables_failed'],
+        'tables_data_migrated': status['tables_data_migrated'],
+        'tables_data_failed': status['tables_data_failed'],
+        'total_tables': status['total_tables']
+    }
+
+def resposta_pagina_logs(status: Dict) -> Dict:
+    """Página de logs da execução (?page=N&size=M), incluindo as entradas já gravadas em disco"""
+    pagina = max(request.args.get('page', 0, type=int), 0)
+    tamanho = min(max(request.args.get('size', 500, type=int), 1), 5000)
+    return {
+        'logs': status['logs'].pagina(pagina, tamanho),
+        'page': pagina,
+        'size': tamanho,
+        'total': status['logs'].total,
+        'execucao': status['execucao']
+    }
 
 @app.route('/migration_logs')
 def migration_logs():
+    return resposta_logs(job_mais_recente())
+
+@app.route('/migration_logs/page')
+def migration_logs_page():
+    return resposta_pagina_logs(job_mais_recente())
+
+@app.route('/jobs')
+def listar_jobs():
+    with jobs_lock:
+        lista = [resumo_job(job) for job in jobs.values()]
     return {
-        'logs': migration_status['logs'],
-        'in_progress': migration_status['in_progress'],
-        'completed': migration_status['completed'],
-        'tables_created': migration_status['tables_created'],
-        'tables_failed': migration_status['tables_failed'],
-        'tables_data_migrated': migration_status['tables_data_migrated'],
-        'tables_data_failed': migration_status['tables_data_failed'],
-        'total_tables': migration_status['total_tables']
+        'jobs': lista,
+        'executando': sum(1 for job in lista if job['estado'] == 'executando'),
+        'max_simultaneos': MAX_JOBS_SIMULTANEOS
     }
 
+@app.route('/jobs/<job_id>')
+def detalhar_job(job_id: str):
+    job = jobs.get(job_id)
+    if not job:
+        return {'erro': f"Job {job_id} não encontrado"}, 404
+    return resumo_job(job)
+
+@app.route('/jobs/<job_id>/logs')
+def logs_job(job_id: str):
+    job = jobs.get(job_id)
+    if not job:
+        return {'erro': f"Job {job_id} não encontrado"}, 404
+    return resposta_logs(job)
+
+@app.route('/jobs/<job_id>/logs/page')
+def pagina_logs_job(job_id: str):
+    job = jobs.get(job_id)
+    if not job:
+        return {'erro': f"Job {job_id} não encontrado"}, 404
+    return resposta_pagina_logs(job)
+
+def rotulos_prometheus(**rotulos) -> str:
+    valores = []
+    for nome, valor in rotulos.items():
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        valores.append(f'{nome}="{valor}"')
+    return '{' + ','.join(valores) + '}'
+
+@app.route('/metrics')
+def metricas_prometheus():
+    """Contadores dos jobs e métricas por tabela no formato de exposição de texto do Prometheus"""
+    with jobs_lock:
+        estados = [('cli', migration_status)] + [(job['id'], job) for job in jobs.values()]
+    
+    linhas = []
+    def metrica(nome: str, tipo: str, ajuda: str, amostras):
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        for rotulos, valor in amostras:
+            linhas.append(f"{nome}{rotulos_prometheus(**rotulos)} {valor}")
+    
+    metrica('migrador_jobs', 'gauge', 'Jobs de migração por estado', [
+        ({'estado': estado}, sum(1 for _, job in estados[1:] if job['estado'] == estado))
+        for estado in ('aguardando', 'executando', 'concluido')
+    ])
+    contadores = {'criadas': 'tables_created', 'falha_criacao': 'tables_failed',
+                  'migradas': 'tables_data_migrated', 'falha_dados': 'tables_data_failed'}
+    metrica('migrador_tabelas_total', 'counter', 'Tabelas processadas por resultado', [
+        ({'job': job_id, 'resultado': resultado}, status[chave])
+        for job_id, status in estados for resultado, chave in contadores.items()
+    ])
+    
+    agora = time.time()
+    por_tabela = []
+    with status_lock:
+        for job_id, status in estados:
+            for tabela, m in status['metricas'].items():
+                por_tabela.append((job_id, tabela, dict(m, fases=dict(m['fases']))))
+    
+    metrica('migrador_fase_segundos_total', 'counter', 'Tempo acumulado por fase (somado entre threads)', [
+        ({'job': job_id, 'tabela': tabela, 'fase': fase}, f"{segundos:.6f}")
+        for job_id, tabela, m in por_tabela for fase, segundos in m['fases'].items()
+    ])
+    metrica('migrador_linhas_total', 'counter', 'Linhas gravadas no destino', [
+        ({'job': job_id, 'tabela': tabela}, m['linhas']) for job_id, tabela, m in por_tabela
+    ])
+    metrica('migrador_bytes_total', 'counter', 'Bytes gravados no destino (estimados no caminho INSERT)', [
+        ({'job': job_id, 'tabela': tabela}, int(m['bytes'])) for job_id, tabela, m in por_tabela
+    ])
+    taxas = [
+        (job_id, tabela, m, max((m['fim'] or agora) - m['inicio'], 1e-6))
+        for job_id, tabela, m in por_tabela if tabela != '*'
+    ]
+    metrica('migrador_linhas_por_segundo', 'gauge', 'Vazão média da tabela em linhas/s', [
+        ({'job': job_id, 'tabela': tabela}, f"{m['linhas'] / duracao:.2f}") for job_id, tabela, m, duracao in taxas
+    ])
+    metrica('migrador_bytes_por_segundo', 'gauge', 'Vazão média da tabela em bytes/s', [
+        ({'job': job_id, 'tabela': tabela}, f"{m['bytes'] / duracao:.2f}") for job_id, tabela, m, duracao in taxas
+    ])
+    
+    return '\n'.join(linhas) + '\n', 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+def executar_delta_cli(caminho_config: str) -> int:
+    """Executa a sincronização incremental descrita em um arquivo JSON (para uso em cron)"""
+    with open(caminho_config, encoding='utf-8') as f:
+        config = json.load(f)
+    
+    opcoes = {**config.get('opcoes', {}), 'modo_sincronizacao': 'incremental', 'retomar': False}
+    if config.get('coluna_watermark'):
+        opcoes['coluna_watermark'] = config['coluna_watermark']
+    
+    run_migration(config['migration_type'], config['source'], config['dest'], config['tables'], opcoes)
+    return 1 if migration_status['tables_failed'] else 0
+
 if __name__ == "__main__":
+    # python migrador_geral.py --delta delta.json  →  sincronização incremental sem interface web
+    if len(sys.argv) == 3 and sys.argv[1] == '--delta':
+        sys.exit(executar_delta_cli(sys.argv[2]))
+    
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
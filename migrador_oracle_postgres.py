@@ -3,6 +3,7 @@ import psycopg2
 import re
 import os
 import csv
+from perfil_cli import executar_com_perfil, opcao_perfil
 
 oracledb.init_oracle_client(lib_dir=os.environ.get('ORACLE_CLIENT_LIB', 'C:\\instantclient_23_8'))
 
@@ -238,7 +239,11 @@ if __name__ == "__main__":
     if not TABELAS:
         print("ℹ️  Nenhuma tabela definida para migração.")
     else:
+        perfil_top = opcao_perfil()
         for tabela in TABELAS:
-            migrar_tabela(tabela, '     ', ' ', export_csv=True)
+            if perfil_top:
+                executar_com_perfil(tabela, perfil_top, migrar_tabela, tabela, '     ', ' ', export_csv=True)
+            else:
+                migrar_tabela(tabela, '     ', ' ', export_csv=True)
     print("─" * 50)
     print("🎉 Migração concluída!")
\ No newline at end of file
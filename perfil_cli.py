@@ -0,0 +1,38 @@
+import os
+import sys
+import cProfile
+import pstats
+
+# Perfis cProfile dos scripts de linha de comando executados com --perfil [N]
+PERFIL_DIR = os.environ.get('MIGRADOR_PERFIL_DIR', 'perfis')
+PERFIL_TOP_PADRAO = 20
+
+def executar_com_perfil(nome, top, funcao, *args, **kwargs):
+    """Executa funcao(*args, **kwargs) sob cProfile, grava perfis/<nome>.prof e imprime as `top` funções mais caras"""
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        return funcao(*args, **kwargs)
+    finally:
+        perfil.disable()
+        os.makedirs(PERFIL_DIR, exist_ok=True)
+        arquivo = os.path.join(PERFIL_DIR, f"{nome.strip() or 'tabela'}.prof")
+        perfil.dump_stats(arquivo)
+        print(f"🔬 Perfil salvo em {arquivo} — top {top} funções por tempo próprio:")
+        pstats.Stats(perfil).sort_stats('tottime').print_stats(top)
+
+def opcao_perfil(argv=None):
+    """--perfil [N] na linha de comando → N (padrão 20); None sem a opção. N precisa ser ≥ 1"""
+    argv = sys.argv if argv is None else argv
+    if '--perfil' not in argv:
+        return None
+    posicao = argv.index('--perfil') + 1
+    if posicao >= len(argv) or argv[posicao].startswith('--'):
+        return PERFIL_TOP_PADRAO
+    try:
+        top = int(argv[posicao])
+    except ValueError:
+        top = 0
+    if top < 1:
+        sys.exit(f"❌ --perfil espera um número de funções ≥ 1 (recebido: {argv[posicao]})")
+    return top
@@ -177,204 +177,190 @@ def criar_tabela_postgres(tabela, origin_params, dest_params, schema_origem='pub
         if 'pg_origem_conn' in locals(): pg_origem_conn.close()
         if 'pg_destino_conn' in locals(): pg_destino_conn.close()
 
-def criar_sequencias_necessarias(tabela, schema_origem, schema_destino, origin_params, dest_params):
-    """Cria sequências necessárias para a tabela no schema de destino"""
+def gerar_sequencias_necessarias(tabela, schema_destino, colunas_info, sequencias_origem):
+    """Gera os CREATE SEQUENCE das colunas da tabela que usam nextval (sem acessar o banco).
+    Sequências compartilhadas entram em todas as tabelas que as usam (IF NOT EXISTS), já que cada
+    tabela roda sob seu próprio savepoint"""
+    comandos = []
+    for coluna in colunas_info:
+        default_value = coluna[3]
+        match = re.search(r"nextval\('([^']+)'::regclass\)", str(default_value or ''))
+        if not match:
+            continue
+        sequencia_nome_sem_schema = match.group(1).split('.')[-1].strip('"')
+        
+        create_seq = f'CREATE SEQUENCE IF NOT EXISTS "{schema_destino}"."{sequencia_nome_sem_schema}"'
+        seq_info = sequencias_origem.get(sequencia_nome_sem_schema)
+        if seq_info:
+            increment, min_val, max_val, start_val, cache = seq_info
+            create_seq += f' INCREMENT {increment} MINVALUE {min_val} MAXVALUE {max_val} START {start_val} CACHE {cache}'
+        comandos.append(create_seq)
+    return comandos
+
+def carregar_catalogo_origem(pg_origem_cursor, schema_origem, tabelas):
+    """Lê colunas, chaves primárias e sequências de todas as tabelas em três consultas"""
+    pg_origem_cursor.execute("""
+        SELECT 
+            table_name,
+            column_name, 
+            data_type, 
+            is_nullable,
+            column_default,
+            character_maximum_length,
+            numeric_precision,
+            numeric_scale
+        FROM information_schema.columns 
+        WHERE table_schema = %s AND table_name = ANY(%s)
+        ORDER BY table_name, ordinal_position
+    """, (schema_origem, list(tabelas)))
+    colunas = {}
+    for row in pg_origem_cursor.fetchall():
+        colunas.setdefault(row[0], []).append(row[1:])
+    
+    pg_origem_cursor.execute("""
+        SELECT c.relname, a.attname
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE n.nspname = %s AND c.relname = ANY(%s) AND i.indisprimary
+    """, (schema_origem, list(tabelas)))
+    chaves = {}
+    for tabela, coluna in pg_origem_cursor.fetchall():
+        chaves.setdefault(tabela, []).append(coluna)
+    
+    pg_origem_cursor.execute("""
+        SELECT sequencename, increment_by, min_value, max_value, start_value, cache_size
+        FROM pg_sequences
+        WHERE schemaname = %s
+    """, (schema_origem,))
+    sequencias = {row[0]: row[1:] for row in pg_origem_cursor.fetchall()}
+    
+    return colunas, chaves, sequencias
+
+def gerar_ddl_tabela_com_serial(tabela, schema_destino, colunas_info, chaves_primarias):
+    """Gera o CREATE TABLE da tabela usando tipos SERIAL quando apropriado"""
+    colunas_def = []
+    for coluna in colunas_info:
+        nome, tipo, nullable, default_value, char_max_length, num_precision, num_scale = coluna
+        is_serial = False
+        serial_type = None
+        if default_value and 'nextval' in str(default_value):
+            if 'int' in tipo.lower() or 'serial' in tipo.lower():
+                if 'big' in tipo.lower():
+                    serial_type = 'BIGSERIAL'
+                elif 'small' in tipo.lower():
+                    serial_type = 'SMALLSERIAL'
+                else:
+                    serial_type = 'SERIAL'
+                is_serial = True
+        if nome in chaves_primarias and nome.lower().endswith(('id', 'key')) and not is_serial:
+            if 'int' in tipo.lower():
+                serial_type = 'SERIAL'
+                is_serial = True
+        if is_serial:
+            pg_tipo = serial_type
+        elif tipo == 'character varying':
+            if char_max_length:
+                pg_tipo = f'VARCHAR({char_max_length})'
+            else:
+                pg_tipo = 'VARCHAR'
+        elif tipo == 'character':
+            if char_max_length:
+                pg_tipo = f'CHAR({char_max_length})'
+            else:
+                pg_tipo = 'CHAR'
+        elif tipo == 'numeric':
+            if num_precision and num_scale:
+                pg_tipo = f'NUMERIC({num_precision}, {num_scale})'
+            elif num_precision:
+                pg_tipo = f'NUMERIC({num_precision})'
+            else:
+                pg_tipo = 'NUMERIC'
+        else:
+            pg_tipo = tipo.upper()
+        col_def = f'"{nome}" {pg_tipo}'
+        if nullable == 'NO' and not is_serial:
+            col_def += ' NOT NULL'
+        if not is_serial and default_value:
+            if 'nextval' in str(default_value):
+                match = re.search(r"nextval\('([^']+)'::regclass\)", str(default_value))
+                if match:
+                    sequencia_nome = match.group(1)
+                    sequencia_nome_sem_schema = sequencia_nome.split('.')[-1]
+                    default_value = f"nextval('{schema_destino}.{sequencia_nome_sem_schema}'::regclass)"
+            col_def += f' DEFAULT {default_value}'
+        colunas_def.append(col_def)
+    if chaves_primarias:
+        # PRIMARY KEY de tabela (suporta chaves compostas)
+        colunas_def.append('PRIMARY KEY ({})'.format(', '.join(f'"{c}"' for c in chaves_primarias)))
+    return f'CREATE TABLE IF NOT EXISTS {schema_destino}.{tabela} ({", ".join(colunas_def)})'
+
+def gerar_script_tabelas(tabelas, schema_origem, schema_destino, origin_params):
+    """Gera todo o DDL das tabelas selecionadas com uma única conexão de origem"""
+    pg_origem_conn = conectar(origin_params)
     try:
-        pg_origem_conn = conectar(origin_params)
-        pg_destino_conn = conectar(dest_params)
         pg_origem_cursor = pg_origem_conn.cursor()
-        pg_destino_cursor = pg_destino_conn.cursor()
-        # Buscar colunas com valores padrão que usam sequências
-        pg_origem_cursor.execute("""
-            SELECT column_name, column_default, data_type
-            FROM information_schema.columns 
-            WHERE table_schema = %s AND table_name = %s 
-            AND column_default LIKE 'nextval(%'
-        """, (schema_origem, tabela))
-        sequencias = pg_origem_cursor.fetchall()
-        for coluna, default_value, data_type in sequencias:
-            match = re.search(r"nextval\('([^']+)'::regclass\)", str(default_value))
-            if match:
-                sequencia_nome = match.group(1)
-                sequencia_nome_sem_schema = sequencia_nome.split('.')[-1]
-                # Verificar se a sequência já existe no destino
-                pg_destino_cursor.execute("""
-                    SELECT COUNT(*) 
-                    FROM pg_sequences 
-                    WHERE schemaname = %s AND sequencename = %s
-                """, (schema_destino, sequencia_nome_sem_schema))
-                if pg_destino_cursor.fetchone()[0] == 0:
-                    try:
-                        pg_origem_cursor.execute(f"""
-                            SELECT 
-                                increment_by,
-                                min_value,
-                                max_value,
-                                start_value,
-                                cache_size
-                            FROM {sequencia_nome}
-                        """)
-                        seq_info = pg_origem_cursor.fetchone()
-                        if seq_info:
-                            increment, min_val, max_val, start_val, cache = seq_info
-                            create_seq_sql = sql.SQL("""
-                                CREATE SEQUENCE {}.{} 
-                                INCREMENT %s 
-                                MINVALUE %s 
-                                MAXVALUE %s 
-                                START %s 
-                                CACHE %s
-                            """).format(
-                                sql.Identifier(schema_destino),
-                                sql.Identifier(sequencia_nome_sem_schema)
-                            )
-                            pg_destino_cursor.execute(create_seq_sql, (increment, min_val, max_val, start_val, cache))
-                            pg_destino_conn.commit()
-                    except Exception:
-                        try:
-                            create_seq_default_sql = sql.SQL("CREATE SEQUENCE {}.{} ").format(
-                                sql.Identifier(schema_destino),
-                                sql.Identifier(sequencia_nome_sem_schema)
-                            )
-                            pg_destino_cursor.execute(create_seq_default_sql)
-                            pg_destino_conn.commit()
-                        except Exception:
-                            try:
-                                create_seq_if_not_exists = sql.SQL("CREATE SEQUENCE IF NOT EXISTS {}.{} ").format(
-                                    sql.Identifier(schema_destino),
-                                    sql.Identifier(sequencia_nome_sem_schema)
-                                )
-                                pg_destino_cursor.execute(create_seq_if_not_exists)
-                                pg_destino_conn.commit()
-                            except Exception:
-                                pass
-        return True
-    except Exception:
-        return False
+        colunas, chaves, sequencias_origem = carregar_catalogo_origem(pg_origem_cursor, schema_origem, tabelas)
+        pg_origem_cursor.close()
     finally:
-        if 'pg_origem_cursor' in locals(): pg_origem_cursor.close()
-        if 'pg_destino_cursor' in locals(): pg_destino_cursor.close()
-        if 'pg_origem_conn' in locals(): pg_origem_conn.close()
-        if 'pg_destino_conn' in locals(): pg_destino_conn.close()
+        pg_origem_conn.close()
+    
+    script = []
+    for tabela in tabelas:
+        colunas_info = colunas.get(tabela)
+        if not colunas_info:
+            script.append((tabela, None))
+            continue
+        chaves_primarias = chaves.get(tabela, [])
+        comandos = gerar_sequencias_necessarias(tabela, schema_destino, colunas_info, sequencias_origem)
+        comandos.append(gerar_ddl_tabela_com_serial(tabela, schema_destino, colunas_info, chaves_primarias))
+        script.append((tabela, comandos))
+    return script
 
-def obter_chaves_primarias(tabela, schema_origem, origin_params):
-    """Obtém as chaves primárias da tabela"""
-    try:
-        conn = conectar(origin_params)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT a.attname
-            FROM pg_index i
-            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
-            WHERE i.indrelid = %s::regclass AND i.indisprimary
-        """, (f"{schema_origem}.{tabela}",))
-        chaves_primarias = [row[0] for row in cursor.fetchall()]
-        cursor.close()
-        conn.close()
-        return chaves_primarias
-    except Exception:
-        return []
+def formatar_script_tabelas(script, schema_destino):
+    """Script SQL completo (dry-run) em uma única transação"""
+    linhas = ['BEGIN;', f'CREATE SCHEMA IF NOT EXISTS "{schema_destino}";', '']
+    for tabela, comandos in script:
+        linhas.append(f'-- {tabela}')
+        if comandos is None:
+            linhas.append('-- (tabela não existe na origem)')
+        else:
+            linhas.extend(f'{comando};' for comando in comandos)
+        linhas.append('')
+    linhas.append('COMMIT;')
+    return '\n'.join(linhas)
 
-def criar_tabela_com_serial(tabela, schema_origem, schema_destino, origin_params, dest_params):
-    """Cria a tabela no PostgreSQL de destino usando tipos SERIAL quando apropriado"""
+def criar_tabelas_em_lote(tabelas, schema_origem, schema_destino, origin_params, dest_params):
+    """Cria as tabelas selecionadas em uma transação e uma conexão de destino (savepoint por tabela)"""
+    script = gerar_script_tabelas(tabelas, schema_origem, schema_destino, origin_params)
+    resultados = []
+    
+    pg_destino_conn = conectar(dest_params)
     try:
-        criar_sequencias_necessarias(tabela, schema_origem, schema_destino, origin_params, dest_params)
-        chaves_primarias = obter_chaves_primarias(tabela, schema_origem, origin_params)
-        pg_origem_conn = conectar(origin_params)
-        pg_destino_conn = conectar(dest_params)
-        pg_origem_cursor = pg_origem_conn.cursor()
         pg_destino_cursor = pg_destino_conn.cursor()
-        pg_origem_cursor.execute("""
-            SELECT EXISTS (
-                SELECT 1 FROM information_schema.tables 
-                WHERE table_schema = %s AND table_name = %s
-            )
-        """, (schema_origem, tabela))
-        if not pg_origem_cursor.fetchone()[0]:
-            return False, f"Tabela {schema_origem}.{tabela} não existe na origem"
-        pg_origem_cursor.execute("""
-            SELECT 
-                column_name, 
-                data_type, 
-                is_nullable,
-                column_default,
-                character_maximum_length,
-                numeric_precision,
-                numeric_scale
-            FROM information_schema.columns 
-            WHERE table_schema = %s AND table_name = %s 
-            ORDER BY ordinal_position
-        """, (schema_origem, tabela))
-        colunas_info = pg_origem_cursor.fetchall()
-        colunas_def = []
-        for coluna in colunas_info:
-            nome, tipo, nullable, default_value, char_max_length, num_precision, num_scale = coluna
-            is_serial = False
-            serial_type = None
-            if default_value and 'nextval' in str(default_value):
-                if 'int' in tipo.lower() or 'serial' in tipo.lower():
-                    if 'big' in tipo.lower():
-                        serial_type = 'BIGSERIAL'
-                    elif 'small' in tipo.lower():
-                        serial_type = 'SMALLSERIAL'
-                    else:
-                        serial_type = 'SERIAL'
-                    is_serial = True
-            if nome in chaves_primarias and nome.lower().endswith(('id', 'key')) and not is_serial:
-                if 'int' in tipo.lower():
-                    serial_type = 'SERIAL'
-                    is_serial = True
-            if is_serial:
-                pg_tipo = serial_type
-            elif tipo == 'character varying':
-                if char_max_length:
-                    pg_tipo = f'VARCHAR({char_max_length})'
-                else:
-                    pg_tipo = 'VARCHAR'
-            elif tipo == 'character':
-                if char_max_length:
-                    pg_tipo = f'CHAR({char_max_length})'
-                else:
-                    pg_tipo = 'CHAR'
-            elif tipo == 'numeric':
-                if num_precision and num_scale:
-                    pg_tipo = f'NUMERIC({num_precision}, {num_scale})'
-                elif num_precision:
-                    pg_tipo = f'NUMERIC({num_precision})'
-                else:
-                    pg_tipo = 'NUMERIC'
-            else:
-                pg_tipo = tipo.upper()
-            col_def = f'"{nome}" {pg_tipo}'
-            if nullable == 'NO' and not is_serial:
-                col_def += ' NOT NULL'
-            if not is_serial and default_value:
-                if 'nextval' in str(default_value):
-                    match = re.search(r"nextval\('([^']+)'::regclass\)", str(default_value))
-                    if match:
-                        sequencia_nome = match.group(1)
-                        sequencia_nome_sem_schema = sequencia_nome.split('.')[-1]
-                        default_value = f"nextval('{schema_destino}.{sequencia_nome_sem_schema}'::regclass)"
-                col_def += f' DEFAULT {default_value}'
-            if nome in chaves_primarias:
-                col_def += ' PRIMARY KEY'
-            colunas_def.append(col_def)
         pg_destino_cursor.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {} ").format(sql.Identifier(schema_destino)))
+        for tabela, comandos in script:
+            if comandos is None:
+                resultados.append((False, f"Tabela {schema_origem}.{tabela} não existe na origem"))
+                continue
+            pg_destino_cursor.execute("SAVEPOINT criar_tabela")
+            try:
+                pg_destino_cursor.execute(';\n'.join(comandos))
+                pg_destino_cursor.execute("RELEASE SAVEPOINT criar_tabela")
+                resultados.append((True, f"Tabela {schema_destino}.{tabela} criada com sucesso!"))
+            except Exception as create_error:
+                pg_destino_cursor.execute("ROLLBACK TO SAVEPOINT criar_tabela")
+                resultados.append((False, f"Erro ao executar CREATE TABLE {tabela}: {create_error}"))
         pg_destino_conn.commit()
-        create_sql = f'CREATE TABLE IF NOT EXISTS {schema_destino}.{tabela} ({", ".join(colunas_def)})'
-        try:
-            pg_destino_cursor.execute(create_sql)
-            pg_destino_conn.commit()
-            return True, f"Tabela {schema_destino}.{tabela} criada com sucesso!"
-        except Exception as create_error:
-            return False, f"Erro ao executar CREATE TABLE: {create_error}"
-    except Exception as e:
-        return False, f"Erro ao processar tabela {tabela}: {e}"
+        pg_destino_cursor.close()
+    except Exception:
+        pg_destino_conn.rollback()
+        raise
     finally:
-        if 'pg_origem_cursor' in locals(): pg_origem_cursor.close()
-        if 'pg_destino_cursor' in locals(): pg_destino_cursor.close()
-        if 'pg_origem_conn' in locals(): pg_origem_conn.close()
-        if 'pg_destino_conn' in locals(): pg_destino_conn.close()
+        pg_destino_conn.close()
+    
+    return resultados
 
 # Templates HTML
 HTML_BASE = """
@@ -898,6 +884,7 @@ HTML_BASE = """
                             
                             <div class="action-buttons">
                                 <button type="submit" name="action" value="criar" class="btn btn-success">🚀 Migrar Tabelas Selecionadas</button>
+                                <button type="submit" name="action" value="script" class="btn">📜 Gerar Script SQL (dry-run)</button>
                             </div>
                             {% endif %}
                         </form>
@@ -912,6 +899,13 @@ HTML_BASE = """
                             {% endfor %}
                         </div>
                         {% endif %}
+                        
+                        {% if script_sql %}
+                        <div class="results">
+                            <h3>📜 Script SQL:</h3>
+                            <pre>{{ script_sql }}</pre>
+                        </div>
+                        {% endif %}
                     </div>
                 </div>
                 
@@ -1160,6 +1154,7 @@ def migrar_tabelas():
     resultados = []
     tabelas_listadas = []
     mensagem = ""
+    script_sql = ""
 
     try:
         if action == 'listar':
@@ -1178,11 +1173,10 @@ def migrar_tabelas():
             else:
                 sucessos = 0
                 falhas = 0
-                for item in tabelas_selecionadas:
-                    schema, tabela = item.split('|')
-                    success, msg = criar_tabela_com_serial(
-                        tabela, schema_origem, schema_destino, origin_params, dest_params
-                    )
+                tabelas = [item.split('|')[1] for item in tabelas_selecionadas]
+                for success, msg in criar_tabelas_em_lote(
+                    tabelas, schema_origem, schema_destino, origin_params, dest_params
+                ):
                     if success:
                         sucessos += 1
                         resultados.append(f"✅ {msg}")
@@ -1191,6 +1185,18 @@ def migrar_tabelas():
                         resultados.append(f"❌ {msg}")
                 mensagem = f"Migração concluída! ✅ {sucessos} sucesso(s), ❌ {falhas} falha(s)"
 
+        elif action == 'script':
+            # Dry-run: apenas gerar o script SQL
+            tabelas_selecionadas = request.form.getlist('tabelas_selecionadas')
+            if not tabelas_selecionadas:
+                mensagem = "Por favor, selecione pelo menos uma tabela"
+            else:
+                tabelas = [item.split('|')[1] for item in tabelas_selecionadas]
+                script_sql = formatar_script_tabelas(
+                    gerar_script_tabelas(tabelas, schema_origem, schema_destino, origin_params), schema_destino
+                )
+                mensagem = f"Script gerado para {len(tabelas)} tabela(s) (nada foi executado)"
+
     except Exception as e:
         mensagem = f"Erro: {str(e)}"
 
@@ -1199,6 +1205,7 @@ def migrar_tabelas():
                                 mensagem=mensagem,
                                 tabelas_listadas=tabelas_listadas,
                                 resultados=resultados,
+                                script_sql=script_sql,
                                 o_schema=schema_origem,
                                 conexoes_salvas=conexoes_salvas)
 